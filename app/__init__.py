@@ -1,3 +1,4 @@
+import threading
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
@@ -5,14 +6,80 @@ from flask_migrate import Migrate
 db = SQLAlchemy()
 migrate = Migrate()
 
-def create_app():
+def create_app(config_object="config.Config"):
     app = Flask(__name__)
-    app.config.from_object("config.Config")
+    app.config.from_object(config_object)
 
-    # baza danych i migracje
+    # baza danych i migracje (zapis danych wymaga SQLite lub PostgreSQL)
+    from app.services.data_service import check_database_support
+    check_database_support(app.config["SQLALCHEMY_DATABASE_URI"])
     db.init_app(app)  # powiązanie db z aplikacją
     migrate.init_app(app, db)
 
+    # współdzielona sesja HTTP (pula połączeń keep-alive do API GIOŚ)
+    from app.services.http_client import configure_session
+    configure_session(
+        pool_size=app.config["GIOS_POOL_SIZE"],
+        timeout=(app.config["GIOS_CONNECT_TIMEOUT"], app.config["GIOS_READ_TIMEOUT"])
+    )
+
+    # stronicowanie list API GIOŚ (kolejne strony pobierane równolegle)
+    from app.services.downloader import configure_paging
+    configure_paging(page_size=app.config["GIOS_PAGE_SIZE"], max_workers=app.config["GIOS_PAGE_WORKERS"])
+
+    # dyskowy cache odpowiedzi API GIOŚ (ETag / Last-Modified), wspólny dla procesów roboczych
+    from app.services.http_cache import configure_http_cache
+    configure_http_cache(
+        app.config["HTTP_CACHE_DIR"],
+        max_bytes=app.config["HTTP_CACHE_MAX_BYTES"],
+        max_age=app.config["HTTP_CACHE_MAX_AGE"]
+    )
+
+    # cache katalogu stacji, rozgrzewany w tle przy pierwszym żądaniu procesu roboczego
+    # (komendy CLI - flask db upgrade, sync, export - nie odpytują przy tym API);
+    # widok potrzebujący katalogu czeka na to samo pobieranie zamiast zlecać drugie
+    from app.services.catalog_service import configure_catalog_cache, warm_catalog
+    configure_catalog_cache(
+        app.config["GIOS_API_URL"],
+        ttl=app.config["CATALOG_CACHE_TTL"],
+        stale_ttl=app.config["CATALOG_CACHE_STALE_TTL"]
+    )
+    if app.config["CATALOG_WARM_ON_STARTUP"]:
+        catalog_warmed = threading.Event()
+
+        @app.before_request
+        def warm_catalog_once():
+            if not catalog_warmed.is_set():
+                catalog_warmed.set()
+                warm_catalog()
+
+    # geokodowanie lokalizacji (/nearby): Nominatim z trwałym cache w bazie,
+    # a gdy nie znajdzie miejsca lub jest niedostępny - gazeter lokalnych tabel
+    from app.services.gazetteer import GazetteerGeocoder, configure_gazetteer
+    from app.services.geocoding import CachedGeocoder, FallbackGeocoder, NominatimGeocoder, configure_geocoder
+    configure_gazetteer(ttl=app.config["GAZETTEER_TTL"])
+    configure_geocoder(FallbackGeocoder(
+        CachedGeocoder(
+            NominatimGeocoder(app.config["GEOCODER_URL"], timeout=app.config["GEOCODER_TIMEOUT"]),
+            ttl=app.config["GEOCODE_CACHE_TTL"],
+            negative_ttl=app.config["GEOCODE_NEGATIVE_TTL"],
+            maxsize=app.config["GEOCODE_CACHE_SIZE"]
+        ),
+        GazetteerGeocoder()
+    ))
+
+    # cache wyrenderowanych map stacji
+    from app.services.maps_service import configure_map_cache
+    configure_map_cache(maxsize=app.config["MAP_CACHE_SIZE"])
+
     from app.routes.station_routes import station_bp
     app.register_blueprint(station_bp)
+
+    from app.routes.api_routes import api_bp
+    app.register_blueprint(api_bp)
+
+    from app.commands import export_command, poll_command, sync_command
+    app.cli.add_command(sync_command)
+    app.cli.add_command(poll_command)
+    app.cli.add_command(export_command)
     return app
@@ -0,0 +1,127 @@
+import sys
+from datetime import datetime
+import click
+import requests
+from flask import current_app
+from app.services.export_service import EXPORT_FORMATS, ExportService
+from app.services.gazetteer import invalidate_gazetteer
+from app.services.rate_limiter import TokenBucket
+from app.services.scheduler import PollingScheduler
+from app.services.sync_service import SyncService
+
+
+@click.command("sync")
+@click.option("--workers", type=int, default=None, help="Liczba wątków pobierających dane.")
+@click.option("--rate", type=float, default=None, help="Maksymalna liczba zapytań do API na sekundę.")
+@click.option("--station", "station_ids", type=int, multiple=True, help="Synchronizuj tylko wskazane stacje.")
+def sync_command(workers, rate, station_ids):
+    """Pobiera wszystkie stacje, czujniki, pomiary i indeksy AQI z API GIOŚ i zapisuje je w bazie."""
+    config = current_app.config
+
+    service = SyncService(
+        config["GIOS_API_URL"],
+        max_workers=workers or config["SYNC_WORKERS"],
+        rate_limiter=TokenBucket(rate=rate or config["GIOS_RATE_LIMIT"], capacity=config["GIOS_RATE_BURST"]),
+        batch_size=config["SYNC_BATCH_SIZE"]
+    )
+
+    try:
+        stations = service.fetch_stations()
+    except requests.exceptions.RequestException as e:
+        raise click.ClickException(f"Nie udało się pobrać katalogu stacji z API GIOŚ: {e}")
+    if station_ids:
+        stations = [s for s in stations if s.id in set(station_ids)]
+    click.echo(f"Synchronizacja {len(stations)} stacji...")
+
+    with click.progressbar(length=len(stations), label="Stacje") as bar:
+        summary = service.run(stations, progress=lambda station: bar.update(1))
+    invalidate_gazetteer()
+
+    click.echo(
+        f"Zapisano: stacje {summary.stations}, czujniki {summary.sensors}, "
+        f"nowe pomiary {summary.measurements}, błędy {summary.errors}"
+    )
+
+
+@click.command("poll")
+@click.option("--sensor", "sensor_ids", type=int, multiple=True,
+              help="Śledzony czujnik (id_stanowiska); domyślnie POLL_SENSORS.")
+@click.option("--station", "station_ids", type=int, multiple=True,
+              help="Śledzona stacja (wszystkie jej czujniki); domyślnie POLL_STATIONS.")
+@click.option("--interval", type=float, default=None, help="Odstęp między cyklami w sekundach.")
+@click.option("--jitter", type=float, default=None, help="Losowe odchylenie odstępu (ułamek, 0-1).")
+@click.option("--workers", type=int, default=None, help="Liczba jednoczesnych zapytań do API.")
+@click.option("--rate", type=float, default=None, help="Maksymalna liczba zapytań do API na sekundę.")
+@click.option("--once", is_flag=True, help="Wykonaj jeden cykl i zakończ.")
+def poll_command(sensor_ids, station_ids, interval, jitter, workers, rate, once):
+    """Cyklicznie pobiera z API GIOŚ nowe pomiary śledzonych czujników i stacji i zapisuje je w bazie."""
+    config = current_app.config
+    sensor_ids = sensor_ids or config["POLL_SENSORS"]
+    station_ids = station_ids or config["POLL_STATIONS"]
+    if not sensor_ids and not station_ids:
+        raise click.UsageError("Podaj --sensor lub --station (albo ustaw POLL_SENSORS / POLL_STATIONS)")
+
+    scheduler = PollingScheduler(
+        config["GIOS_API_URL"],
+        sensor_ids=sensor_ids,
+        station_ids=station_ids,
+        interval=config["POLL_INTERVAL"] if interval is None else interval,
+        jitter=config["POLL_JITTER"] if jitter is None else jitter,
+        max_workers=workers or config["POLL_WORKERS"],
+        rate_limiter=TokenBucket(rate=rate or config["GIOS_RATE_LIMIT"], capacity=config["GIOS_RATE_BURST"])
+    )
+    try:
+        targets = scheduler.resolve_targets()
+    except requests.exceptions.RequestException as e:
+        raise click.ClickException(f"Nie udało się pobrać śledzonych stacji z API GIOŚ: {e}")
+    if station_ids:
+        invalidate_gazetteer()
+    click.echo(f"Śledzone czujniki: {len(targets)}")
+
+    def report(summary):
+        click.echo(
+            f"[{datetime.now():%Y-%m-%d %H:%M:%S}] czujniki z nowymi danymi {summary.updated_sensors}/"
+            f"{summary.sensors}, nowe pomiary {summary.measurements}, "
+            f"indeksy AQI {summary.station_indexes}, błędy {summary.errors}"
+        )
+
+    try:
+        scheduler.run(cycles=1 if once else None, on_cycle=report)
+    except KeyboardInterrupt:
+        click.echo("Zatrzymano")
+
+
+@click.command("export")
+@click.option("--format", "fmt", type=click.Choice(list(EXPORT_FORMATS)), default="csv", help="Format pliku.")
+@click.option("--output", "-o", type=click.Path(dir_okay=False), default=None,
+              help="Plik wynikowy (domyślnie standardowe wyjście; dla parquet wymagany).")
+@click.option("--sensor", "sensor_id", type=int, default=None, help="Identyfikator czujnika.")
+@click.option("--station", "station_id", type=int, default=None, help="Identyfikator stacji.")
+@click.option("--wojewodztwo", default=None, help="Nazwa województwa.")
+@click.option("--powiat", default=None, help="Nazwa powiatu.")
+@click.option("--start", type=click.DateTime(), default=None, help="Początek przedziału (włącznie).")
+@click.option("--end", type=click.DateTime(), default=None, help="Koniec przedziału (wyłącznie).")
+def export_command(fmt, output, sensor_id, station_id, wojewodztwo, powiat, start, end):
+    """Eksportuje zarchiwizowane pomiary do pliku CSV, NDJSON lub Parquet (strumieniowo)."""
+    if fmt == "parquet" and output is None:
+        raise click.UsageError("Eksport do Parquet wymaga opcji --output")
+
+    chunks = ExportService(current_app.config["EXPORT_CHUNK_SIZE"]).export(
+        fmt, sensor_id=sensor_id, station_id=station_id, wojewodztwo=wojewodztwo,
+        powiat=powiat, start=start, end=end
+    )
+
+    try:
+        if output is None:
+            for chunk in chunks:
+                sys.stdout.write(chunk)
+            return
+
+        binary = fmt == "parquet"
+        with open(output, "wb" if binary else "w", encoding=None if binary else "utf-8",
+                  newline=None if binary else "") as file:
+            for chunk in chunks:
+                file.write(chunk)
+    except RuntimeError as e:
+        raise click.ClickException(str(e))
+    click.echo(f"Zapisano eksport do {output}")
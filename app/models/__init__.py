@@ -4,3 +4,7 @@ from app.models.station import Station
 from app.models.sensor import Sensor
 from app.models.measurement import Measurement
 from app.models.station_index import StationIndex
+from app.models.sensor_statistics import SensorStatistics
+from app.models.measurement_rollup import MeasurementRollup
+from app.models.geocode_cache import GeocodeCacheEntry
+from app.models.dto import GminaData, CityData, StationData, SensorData, MeasurementData, StationIndexData
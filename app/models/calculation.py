@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Literal
+from typing import Dict, Literal, Optional
 
 @dataclass
 class Calculation():
@@ -7,3 +7,7 @@ class Calculation():
     max: float
     srednia: float
     trend: Literal["rosnący", "malejący", "stały", "za mało danych do określenia trendu"]
+    odchylenie: Optional[float] = None  # odchylenie standardowe
+    percentyle: Optional[Dict[int, float]] = None  # np. {50: mediana, 95: ...}
+    udzial_brakow: Optional[float] = None  # udział pomiarów bez wartości (0-1)
+    nachylenie: Optional[float] = None  # nachylenie prostej MNK (jednostka / godzinę)
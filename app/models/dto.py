@@ -0,0 +1,102 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+from app import db
+from app.models.gmina import Gmina
+from app.models.city import City
+from app.models.station import Station
+from app.models.sensor import Sensor
+from app.models.measurement import Measurement
+from app.models.station_index import StationIndex
+
+# Lekkie, niemutowalne odpowiedniki modeli zwracane przez Downloader.
+# Mają te same nazwy pól co modele, więc widoki, szablony, katalog stacji
+# i serwisy mogą używać ich zamiennie; na modele SQLAlchemy zamieniane są
+# dopiero przy zapisie w DataService (`to_model`).
+
+
+@dataclass(frozen=True, slots=True)
+class GminaData:
+    """Gmina z katalogu stacji API GIOŚ (zob. model Gmina)."""
+    gminaName: str
+    powiatName: str
+    wojewodztwoName: str
+
+    def to_model(self) -> Gmina:
+        return Gmina(gminaName=self.gminaName, powiatName=self.powiatName, wojewodztwoName=self.wojewodztwoName)
+
+
+@dataclass(frozen=True, slots=True)
+class CityData:
+    """Miasto z katalogu stacji API GIOŚ (zob. model City)."""
+    id: int
+    name: str
+    gmina: GminaData
+
+    def to_model(self) -> City:
+        return City(id=self.id, name=self.name, gmina=self.gmina.to_model())
+
+
+@dataclass(frozen=True, slots=True)
+class StationData:
+    """Stacja pomiarowa z katalogu stacji API GIOŚ (zob. model Station)."""
+    id: int
+    stationCode: str
+    stationName: str
+    gegrLat: str
+    gegrLon: str
+    city: CityData
+    addressStreet: Optional[str] = None
+
+    def to_model(self) -> Station:
+        return Station(id=self.id, stationCode=self.stationCode, stationName=self.stationName,
+                       gegrLat=self.gegrLat, gegrLon=self.gegrLon, addressStreet=self.addressStreet,
+                       city=self.city.to_model())
+
+
+@dataclass(frozen=True, slots=True)
+class SensorData:
+    """Stanowisko pomiarowe (czujnik) stacji z API GIOŚ (zob. model Sensor)."""
+    id_stanowiska: int
+    id_stacji: int
+    wskaznik: str
+    wskaznik_wzor: Optional[str]
+    wskaznik_kod: str
+    id_wskaznika: int
+
+    def to_model(self) -> Sensor:
+        return Sensor(id_stanowiska=self.id_stanowiska, id_stacji=self.id_stacji, wskaznik=self.wskaznik,
+                      wskaznik_wzor=self.wskaznik_wzor, wskaznik_kod=self.wskaznik_kod,
+                      id_wskaznika=self.id_wskaznika)
+
+
+@dataclass(frozen=True, slots=True)
+class MeasurementData:
+    """Pojedynczy pomiar czujnika z API GIOŚ (zob. model Measurement)."""
+    kod_stanowiska: str
+    data: datetime
+    wartosc: Optional[float]
+
+    def to_model(self, sensor_id: int = None) -> Measurement:
+        return Measurement(sensor_id=sensor_id, kod_stanowiska=self.kod_stanowiska, data=self.data,
+                           wartosc=self.wartosc)
+
+
+@dataclass(frozen=True, slots=True)
+class StationIndexData:
+    """Indeks jakości powietrza stacji z API GIOŚ (zob. model StationIndex)."""
+    station_id: int
+    calculation_date: datetime
+    index_value: int
+    index_category: str
+    calculation_date_st: str
+
+    def to_model(self) -> StationIndex:
+        return StationIndex(station_id=self.station_id, calculation_date=self.calculation_date,
+                            index_value=self.index_value, index_category=self.index_category,
+                            calculation_date_st=self.calculation_date_st)
+
+
+def to_model(obj):
+    """Zwraca model SQLAlchemy dla obiektu DTO (modele zwracane są bez zmian)."""
+    return obj if isinstance(obj, db.Model) else obj.to_model()
@@ -0,0 +1,29 @@
+from app import db
+
+
+class GeocodeCacheEntry(db.Model):
+    """
+        Zapamiętany wynik geokodowania zapytania tekstowego (np. adresu z /nearby).
+
+        Wynik negatywny (adres nie został znaleziony) zapisywany jest z pustymi
+        współrzędnymi, aby nie odpytywać geokodera ponownie o ten sam adres.
+
+        Atrybuty:
+            address (str): Znormalizowane zapytanie - adres lub nazwa miejsca (`fold_text`).
+            lat (float | None): Szerokość geograficzna lub None dla wyniku negatywnego.
+            lon (float | None): Długość geograficzna lub None dla wyniku negatywnego.
+            created_at (datetime): Data geokodowania (podstawa wygasania wpisu).
+    """
+    __tablename__ = "geocode_cache"
+
+    address = db.Column(db.String(200), primary_key=True)
+    lat = db.Column(db.Float, nullable=True)
+    lon = db.Column(db.Float, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False)
+
+    @property
+    def coords(self):
+        return None if self.lat is None or self.lon is None else (self.lat, self.lon)
+
+    def __repr__(self):
+        return f"<GeocodeCacheEntry {self.address!r} coords={self.coords}>"
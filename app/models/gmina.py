@@ -12,6 +12,9 @@ class Gmina(db.Model):
         cities (list[City]): Lista miast należących do gminy.
     """
     __tablename__ = "gminy"
+    __table_args__ = (
+        db.UniqueConstraint("gminaName", "powiatName", "wojewodztwoName", name="uq_gminy_natural_key"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     gminaName = db.Column(db.String(120), nullable=False)
@@ -11,11 +11,16 @@ class Measurement(db.Model):
             id (int): Unikalny identyfikator pomiaru.
             sensor_id (int): Identyfikator czujnika, który wykonał pomiar.
             kod_stanowiska (str): Kod stanowiska, z którego pochodzi pomiar.
-            data (str): Data i czas wykonania pomiaru w formacie tekstowym.
+            data (datetime): Data i czas wykonania pomiaru.
             wartosc (float | None): Wartość zmierzonego parametru; może być pusta.
             sensor (Sensor): Relacja do obiektu Sensor, który wykonał pomiar.
     """
     __tablename__ = "measurements"
+    __table_args__ = (
+        # jeden pomiar czujnika na daną chwilę - klucz dla zapisu "insert, ignore duplicates";
+        # indeks (sensor_id, data) obsługuje też zapytania o zakres dat czujnika
+        db.UniqueConstraint("sensor_id", "data", name="uq_measurements_sensor_id_data"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
 
@@ -27,7 +32,7 @@ class Measurement(db.Model):
     )
 
     kod_stanowiska = db.Column(db.String(120), nullable=False)
-    data = db.Column(db.String(50), nullable=False)
+    data = db.Column(db.DateTime, nullable=False)
     wartosc = db.Column(db.Float, nullable=True)
 
     # relacja do obiektu Sensor
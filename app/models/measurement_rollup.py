@@ -0,0 +1,50 @@
+from datetime import datetime
+from app import db
+
+# rozdzielczości od najdrobniejszej do najgrubszej
+RESOLUTIONS = ("hour", "day", "month")
+
+
+def bucket_start(data: datetime, resolution: str) -> datetime:
+    """Zwraca początek przedziału (godziny, dnia lub miesiąca), do którego należy `data`."""
+    if resolution == "hour":
+        return data.replace(minute=0, second=0, microsecond=0)
+    if resolution == "day":
+        return data.replace(hour=0, minute=0, second=0, microsecond=0)
+    if resolution == "month":
+        return data.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    raise ValueError(f"Nieznana rozdzielczość: {resolution}")
+
+
+class MeasurementRollup(db.Model):
+    """
+        Agregat pomiarów czujnika w jednym przedziale czasu (godzina, dzień lub miesiąc),
+        aktualizowany przyrostowo przy zapisie nowych pomiarów.
+
+        Uwzględnia wyłącznie pomiary z wartością.
+
+        Atrybuty:
+            sensor_id (int): Identyfikator czujnika (jak Measurement.sensor_id).
+            resolution (str): Rozdzielczość: "hour", "day" lub "month".
+            bucket (datetime): Początek przedziału.
+            count (int): Liczba pomiarów w przedziale.
+            total (float): Suma wartości.
+            min (float): Najmniejsza wartość.
+            max (float): Największa wartość.
+    """
+    __tablename__ = "measurement_rollups"
+
+    sensor_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    resolution = db.Column(db.String(5), primary_key=True)
+    bucket = db.Column(db.DateTime, primary_key=True)
+    count = db.Column(db.Integer, nullable=False)
+    total = db.Column(db.Float, nullable=False)
+    min = db.Column(db.Float, nullable=False)
+    max = db.Column(db.Float, nullable=False)
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    def __repr__(self):
+        return f"<MeasurementRollup sensor_id={self.sensor_id} {self.resolution} {self.bucket} count={self.count}>"
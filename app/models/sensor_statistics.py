@@ -0,0 +1,86 @@
+from datetime import datetime
+from app import db
+
+
+class SensorStatistics(db.Model):
+    """
+        Zagregowane statystyki wszystkich zapisanych pomiarów czujnika,
+        aktualizowane przyrostowo przy każdym zapisie nowych pomiarów.
+
+        Atrybuty:
+            sensor_id (int): Identyfikator czujnika (jak Measurement.sensor_id).
+            count (int): Liczba pomiarów z wartością.
+            missing_count (int): Liczba pomiarów bez wartości.
+            total (float): Suma wartości.
+            total_sq (float): Suma kwadratów wartości.
+            min (float | None): Najmniejsza wartość.
+            max (float | None): Największa wartość.
+            first_data (datetime | None): Data najstarszego pomiaru.
+            last_data (datetime | None): Data najnowszego pomiaru.
+            last_valid_data (datetime | None): Data najnowszego pomiaru z wartością
+                (pomiary bez wartości API GIOŚ uzupełnia później).
+            time_origin (datetime | None): Punkt odniesienia osi czasu dla sum regresji.
+            sum_t (float): Suma czasów pomiarów (w godzinach od `time_origin`).
+            sum_tt (float): Suma kwadratów czasów.
+            sum_ty (float): Suma iloczynów czasu i wartości.
+    """
+    __tablename__ = "sensor_statistics"
+
+    sensor_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    count = db.Column(db.Integer, nullable=False, default=0)
+    missing_count = db.Column(db.Integer, nullable=False, default=0)
+    total = db.Column(db.Float, nullable=False, default=0.0)
+    total_sq = db.Column(db.Float, nullable=False, default=0.0)
+    min = db.Column(db.Float, nullable=True)
+    max = db.Column(db.Float, nullable=True)
+    first_data = db.Column(db.DateTime, nullable=True)
+    last_data = db.Column(db.DateTime, nullable=True)
+    last_valid_data = db.Column(db.DateTime, nullable=True)
+
+    # akumulatory regresji liniowej (MNK)
+    time_origin = db.Column(db.DateTime, nullable=True)
+    sum_t = db.Column(db.Float, nullable=False, default=0.0)
+    sum_tt = db.Column(db.Float, nullable=False, default=0.0)
+    sum_ty = db.Column(db.Float, nullable=False, default=0.0)
+
+    @classmethod
+    def empty(cls, sensor_id: int) -> "SensorStatistics":
+        """Tworzy pusty rekord statystyk z wyzerowanymi akumulatorami."""
+        return cls(sensor_id=sensor_id, count=0, missing_count=0, total=0.0, total_sq=0.0,
+                   sum_t=0.0, sum_tt=0.0, sum_ty=0.0)
+
+    def add(self, data: datetime, wartosc):
+        """Dolicza jeden pomiar do statystyk."""
+        if self.time_origin is None:
+            self.time_origin = data
+        if self.first_data is None or data < self.first_data:
+            self.first_data = data
+        if self.last_data is None or data > self.last_data:
+            self.last_data = data
+
+        if wartosc is None:
+            self.missing_count += 1
+            return
+        self._add_value(data, wartosc)
+
+    def fill(self, data: datetime, wartosc: float):
+        """Dolicza wartość uzupełnioną w pomiarze zapisanym wcześniej bez wartości."""
+        self.missing_count -= 1
+        self._add_value(data, wartosc)
+
+    def _add_value(self, data: datetime, wartosc: float):
+        if self.last_valid_data is None or data > self.last_valid_data:
+            self.last_valid_data = data
+
+        t = (data - self.time_origin).total_seconds() / 3600.0
+        self.count += 1
+        self.total += wartosc
+        self.total_sq += wartosc * wartosc
+        self.min = wartosc if self.min is None else min(self.min, wartosc)
+        self.max = wartosc if self.max is None else max(self.max, wartosc)
+        self.sum_t += t
+        self.sum_tt += t * t
+        self.sum_ty += t * wartosc
+
+    def __repr__(self):
+        return f"<SensorStatistics sensor_id={self.sensor_id} count={self.count} last_data={self.last_data}>"
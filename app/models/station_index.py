@@ -10,16 +10,19 @@ class StationIndex(db.Model):
         Atrybuty:
             id (int): Unikalny identyfikator rekordu indeksu.
             station_id (int): Identyfikator stacji pomiarowej, której dotyczy indeks.
-            calculation_date (str): Data wykonania obliczeń indeksu.
+            calculation_date (datetime): Data wykonania obliczeń indeksu.
             index_value (int): Wartość wyliczonego indeksu.
             index_category (str): Kategoria lub nazwa indeksu.
             calculation_date_st (str): Data wykonania obliczeń indeksu (alternatywne pole).
     """
     __tablename__ = "station_index"
+    __table_args__ = (
+        db.Index("ix_station_index_station_id_calculation_date", "station_id", "calculation_date"),
+    )
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     station_id = db.Column(db.Integer, nullable=False)  # Identyfikator stacji pomiarowej
-    calculation_date = db.Column(db.String(50), nullable=False)  # Data wykonania obliczeń indeksu
+    calculation_date = db.Column(db.DateTime, nullable=False)  # Data wykonania obliczeń indeksu
     index_value = db.Column(db.Integer, nullable=False)  # Wartość indeksu
     index_category = db.Column(db.String, nullable=False)  # Nazwa kategorii indeksu
     calculation_date_st = db.Column(db.String(50), nullable=False)  # Data wykonania obliczeń indeksu
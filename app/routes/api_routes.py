@@ -0,0 +1,361 @@
+from datetime import datetime
+import hashlib
+import json
+from flask import Blueprint, Response, current_app, request, stream_with_context
+from app.services.catalog_service import get_station_catalog
+from app.services.data_service import DataService
+from app.services.export_service import EXPORT_FORMATS, ExportService
+from app.services.gazetteer import PLACE_KINDS, get_gazetteer
+
+api_bp = Blueprint("api", __name__, url_prefix="/api/v1")
+
+
+class ApiError(Exception):
+    """Błąd zapytania do API zwracany klientowi jako JSON {"error": ...}."""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+@api_bp.errorhandler(ApiError)
+def handle_api_error(error: ApiError):
+    return json_response({"error": error.message}, status=error.status)
+
+
+# -------------------------------
+# Pomocnicze
+# -------------------------------
+def json_response(payload, etag: str = None, status: int = 200) -> Response:
+    """Zwraca zwięzły JSON (bez wcięć); przy podanym `etag` ustawia nagłówek ETag."""
+    response = Response(
+        json.dumps(payload, ensure_ascii=False, separators=(",", ":")),
+        status=status,
+        mimetype="application/json"
+    )
+    if etag is not None:
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = "no-cache"  # zawsze rewalidacja przez If-None-Match
+    return response
+
+
+def make_etag(*parts) -> str:
+    """Tworzy ETag ze składników wersji danych (np. liczby pomiarów i daty ostatniego)."""
+    return hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()
+
+
+def not_modified(etag: str):
+    """Zwraca odpowiedź 304, jeżeli klient ma aktualną wersję danych (If-None-Match), inaczej None."""
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+    return None
+
+
+def parse_datetime_arg(name: str):
+    """Odczytuje parametr zapytania w formacie ISO 8601 (np. 2025-08-27 lub 2025-08-27T12:00:00)."""
+    value = request.args.get(name)
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise ApiError(f"Nieprawidłowa data w parametrze '{name}': {value}")
+
+
+def parse_limit(name: str = "limit", default: int = None) -> int:
+    """Odczytuje rozmiar strony (domyślnie `limit`), ograniczony przez API_MAX_PAGE_SIZE."""
+    if default is None:
+        default = current_app.config["API_PAGE_SIZE"]
+    limit = request.args.get(name, default, type=int)
+    if limit is None or limit < 1:
+        raise ApiError(f"Parametr '{name}' musi być dodatnią liczbą całkowitą")
+    return min(limit, current_app.config["API_MAX_PAGE_SIZE"])
+
+
+def parse_fields(allowed) -> list:
+    """Odczytuje listę pól (`fields=a,b`); None oznacza wszystkie pola."""
+    value = request.args.get("fields")
+    if not value:
+        return None
+    fields = [f.strip() for f in value.split(",") if f.strip()]
+    unknown = [f for f in fields if f not in allowed]
+    if unknown:
+        raise ApiError(f"Nieznane pola: {', '.join(unknown)}. Dostępne: {', '.join(allowed)}")
+    return fields
+
+
+def select_fields(item: dict, fields) -> dict:
+    return item if fields is None else {f: item[f] for f in fields}
+
+
+def page(items: list, limit: int, fields, cursor) -> dict:
+    """
+    Buduje stronę wyników stronicowania kluczem.
+
+    `items` powinno zawierać do `limit + 1` elementów - nadmiarowy element oznacza,
+    że istnieje kolejna strona; `next` to wtedy wartość parametru `after` dla niej.
+    """
+    has_next = len(items) > limit
+    items = items[:limit]
+    return {
+        "data": [select_fields(item, fields) for item in items],
+        "next": cursor(items[-1]) if has_next else None
+    }
+
+
+# -------------------------------
+# Serializacja
+# -------------------------------
+STATION_FIELDS = ("id", "stationCode", "stationName", "gegrLat", "gegrLon", "addressStreet",
+                  "cityName", "gminaName", "powiatName", "wojewodztwoName")
+SENSOR_FIELDS = ("id_stanowiska", "id_stacji", "wskaznik", "wskaznik_wzor", "wskaznik_kod", "id_wskaznika")
+MEASUREMENT_FIELDS = ("data", "wartosc")
+STATION_INDEX_FIELDS = ("calculation_date", "index_value", "index_category")
+
+
+def station_to_dict(station) -> dict:
+    city = station.city
+    gmina = city.gmina if city is not None else None
+    return {
+        "id": station.id,
+        "stationCode": station.stationCode,
+        "stationName": station.stationName,
+        "gegrLat": float(station.gegrLat),
+        "gegrLon": float(station.gegrLon),
+        "addressStreet": station.addressStreet,
+        "cityName": city.name if city is not None else None,
+        "gminaName": gmina.gminaName if gmina is not None else None,
+        "powiatName": gmina.powiatName if gmina is not None else None,
+        "wojewodztwoName": gmina.wojewodztwoName if gmina is not None else None,
+    }
+
+
+def sensor_to_dict(sensor) -> dict:
+    return {field: getattr(sensor, field) for field in SENSOR_FIELDS}
+
+
+def measurement_to_dict(measurement) -> dict:
+    return {"data": measurement.data.isoformat(), "wartosc": measurement.wartosc}
+
+
+def station_index_to_dict(station_index) -> dict:
+    return {
+        "calculation_date": station_index.calculation_date.isoformat(),
+        "index_value": station_index.index_value,
+        "index_category": station_index.index_category,
+    }
+
+
+# -------------------------------
+# Endpointy
+# -------------------------------
+@api_bp.route("/stations")
+def stations():
+    """
+    Katalog stacji (z cache katalogu), posortowany po identyfikatorze.
+
+    - Parametry zapytania:
+        * `city`, `powiat`, `wojewodztwo` – filtr (bez rozróżniania wielkości liter i znaków diakrytycznych),
+        * `after` – identyfikator ostatniej stacji poprzedniej strony,
+        * `limit` – rozmiar strony,
+        * `fields` – lista zwracanych pól, np. `fields=id,stationName`.
+    - ETag: wersja katalogu stacji.
+    """
+    fields = parse_fields(STATION_FIELDS)
+    limit = parse_limit()
+    after = request.args.get("after", type=int)
+
+    catalog = get_station_catalog()
+    etag = make_etag("stations", catalog.version)
+    cached = not_modified(etag)
+    if cached is not None:
+        return cached
+
+    if request.args.get("city"):
+        selected = catalog.find_by_city(request.args["city"])
+    elif request.args.get("powiat"):
+        selected = catalog.find_by_powiat(request.args["powiat"])
+    elif request.args.get("wojewodztwo"):
+        selected = catalog.find_by_wojewodztwo(request.args["wojewodztwo"])
+    else:
+        selected = catalog.stations
+
+    selected = sorted((s for s in selected if after is None or s.id > after), key=lambda s: s.id)
+    items = [station_to_dict(s) for s in selected[:limit + 1]]
+    return json_response(page(items, limit, fields, lambda item: item["id"]), etag)
+
+
+@api_bp.route("/stations/nearby")
+def stations_nearby():
+    """
+    Stacje najbliższe punktowi, posortowane rosnąco po odległości (`distance_km`).
+
+    - Parametry zapytania:
+        * `lat`, `lon` – współrzędne punktu (wymagane),
+        * `radius` – promień w km (opcjonalny),
+        * `k` – liczba najbliższych stacji (domyślnie `limit`, najwyżej API_MAX_PAGE_SIZE),
+        * `fields` – jak w `/stations`.
+    - Korzysta z indeksu przestrzennego katalogu (`catalog.spatial_index`).
+    """
+    fields = parse_fields(STATION_FIELDS + ("distance_km",))
+    lat = request.args.get("lat", type=float)
+    lon = request.args.get("lon", type=float)
+    if lat is None or lon is None:
+        raise ApiError("Parametry 'lat' i 'lon' są wymagane")
+    radius = request.args.get("radius", type=float)
+    k = parse_limit("k", default=parse_limit())
+
+    index = get_station_catalog().spatial_index
+    if radius is not None:
+        found = index.within_radius(lat, lon, radius)[:k]
+    else:
+        found = index.nearest(lat, lon, k)
+
+    items = [dict(station_to_dict(s), distance_km=round(dist, 3)) for s, dist in found]
+    return json_response({"data": [select_fields(item, fields) for item in items]})
+
+
+@api_bp.route("/places/autocomplete")
+def places_autocomplete():
+    """
+    Podpowiedzi nazw miejsc (miasta, gminy, powiaty, stacje) z gazetera lokalnych tabel.
+
+    - Parametry zapytania:
+        * `q` – początek nazwy (bez rozróżniania wielkości liter i polskich znaków),
+        * `kind` – opcjonalnie rodzaj miejsca (może wystąpić wielokrotnie),
+        * `limit` – maksymalna liczba podpowiedzi.
+    - Nie korzysta z sieci.
+    """
+    kinds = request.args.getlist("kind")
+    unknown = [k for k in kinds if k not in PLACE_KINDS]
+    if unknown:
+        raise ApiError(f"Nieznany rodzaj miejsca: {', '.join(unknown)}. Dostępne: {', '.join(PLACE_KINDS)}")
+    limit = min(request.args.get("limit", 10, type=int) or 10, current_app.config["API_MAX_PAGE_SIZE"])
+
+    places = get_gazetteer().complete(request.args.get("q", ""), limit=limit, kinds=kinds or None)
+    return json_response({"data": [
+        {"name": p.name, "kind": p.kind, "lat": round(p.lat, 5), "lon": round(p.lon, 5)} for p in places
+    ]})
+
+
+@api_bp.route("/stations/<int:station_id>")
+def station(station_id):
+    """Pojedyncza stacja z katalogu; 404, jeżeli nie istnieje."""
+    fields = parse_fields(STATION_FIELDS)
+    catalog = get_station_catalog()
+    found = catalog.get(station_id)
+    if found is None:
+        raise ApiError(f"Nie znaleziono stacji {station_id}", 404)
+
+    etag = make_etag("station", station_id, catalog.version)
+    cached = not_modified(etag)
+    if cached is not None:
+        return cached
+    return json_response({"data": select_fields(station_to_dict(found), fields)}, etag)
+
+
+@api_bp.route("/stations/<int:station_id>/sensors")
+def station_sensors(station_id):
+    """Czujniki stacji zapisane w bazie danych (archiwum)."""
+    fields = parse_fields(SENSOR_FIELDS)
+    items = [sensor_to_dict(s) for s in DataService().get_sensors_list_from_db(station_id)]
+
+    etag = make_etag("sensors", station_id, items)
+    cached = not_modified(etag)
+    if cached is not None:
+        return cached
+    return json_response({"data": [select_fields(item, fields) for item in items]}, etag)
+
+
+@api_bp.route("/sensors/<int:sensor_id>/measurements")
+def sensor_measurements(sensor_id):
+    """
+    Pomiary czujnika z bazy danych, posortowane rosnąco po dacie.
+
+    - Parametry zapytania:
+        * `start`, `end` – zakres dat (ISO 8601, koniec wyłącznie),
+        * `after` – data ostatniego pomiaru poprzedniej strony (wartość `next`),
+        * `limit`, `fields` – jak w `/stations`.
+    - ETag: wersja danych czujnika z `SensorStatistics` (liczba pomiarów i data ostatniego),
+      więc niezmienione dane nie są nawet odczytywane z bazy.
+    """
+    fields = parse_fields(MEASUREMENT_FIELDS)
+    limit = parse_limit()
+    start, end, after = parse_datetime_arg("start"), parse_datetime_arg("end"), parse_datetime_arg("after")
+
+    service = DataService()
+    statistics = service.get_sensor_statistics(sensor_id)
+    version = None if statistics is None else (
+        statistics.count, statistics.missing_count, statistics.first_data, statistics.last_data
+    )
+    etag = make_etag("measurements", sensor_id, version)
+    cached = not_modified(etag)
+    if cached is not None:
+        return cached
+
+    measurements = service.get_measurements_in_range(sensor_id, start, end, limit=limit + 1, after=after)
+    items = [measurement_to_dict(m) for m in measurements]
+    return json_response(page(items, limit, fields, lambda item: item["data"]), etag)
+
+
+@api_bp.route("/stations/<int:station_id>/aqi")
+def station_aqi(station_id):
+    """
+    Historia indeksu jakości powietrza (AQI) stacji z bazy danych.
+
+    Parametry zapytania jak w `/sensors/<sensor_id>/measurements`;
+    ETag: liczba indeksów stacji i data najnowszego.
+    """
+    fields = parse_fields(STATION_INDEX_FIELDS)
+    limit = parse_limit()
+    start, end, after = parse_datetime_arg("start"), parse_datetime_arg("end"), parse_datetime_arg("after")
+
+    service = DataService()
+    etag = make_etag("aqi", station_id, service.get_station_index_version(station_id))
+    cached = not_modified(etag)
+    if cached is not None:
+        return cached
+
+    indexes = service.get_station_index_in_range(station_id, start, end, limit=limit + 1, after=after)
+    items = [station_index_to_dict(i) for i in indexes]
+    return json_response(page(items, limit, fields, lambda item: item["calculation_date"]), etag)
+
+
+@api_bp.route("/export")
+def export():
+    """
+    Strumieniowy eksport pomiarów z bazy danych do pliku.
+
+    - Parametry zapytania:
+        * `format` – `csv` (domyślnie), `ndjson` lub `parquet`,
+        * `sensor_id`, `station_id`, `wojewodztwo`, `powiat` – filtry,
+        * `start`, `end` – zakres dat (ISO 8601, koniec wyłącznie).
+    - Plik generowany jest w trakcie wysyłania (kursor po stronie serwera),
+      więc pamięć nie rośnie wraz z wielkością eksportu.
+    """
+    fmt = request.args.get("format", "csv")
+    if fmt not in EXPORT_FORMATS:
+        raise ApiError(f"Nieznany format: {fmt}. Dostępne: {', '.join(EXPORT_FORMATS)}")
+    if fmt == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ApiError("Eksport do Parquet jest niedostępny (brak pakietu pyarrow)", 501)
+
+    chunks = ExportService(current_app.config["EXPORT_CHUNK_SIZE"]).export(
+        fmt,
+        sensor_id=request.args.get("sensor_id", type=int),
+        station_id=request.args.get("station_id", type=int),
+        wojewodztwo=request.args.get("wojewodztwo"),
+        powiat=request.args.get("powiat"),
+        start=parse_datetime_arg("start"),
+        end=parse_datetime_arg("end")
+    )
+
+    mimetype, extension = EXPORT_FORMATS[fmt]
+    response = Response(stream_with_context(chunks), mimetype=mimetype)
+    response.headers["Content-Disposition"] = f"attachment; filename=measurements.{extension}"
+    return response
@@ -1,18 +1,39 @@
-from flask import Blueprint, render_template, request, redirect, url_for
-from app.services.downloader import Downloader
+from flask import Blueprint, abort, render_template, request, redirect, url_for
+from app.services.async_downloader import AsyncDownloader
 from app.services.data_service import DataService
 from app.services.maps_service import StationMap, StationMapWithRadius
 from app.services.calculation_service import CalculationService
+from app.services.catalog_service import get_station_catalog
+from app.services.time_series import TimeSeries
+from app.services.gazetteer import get_gazetteer
+from app.services.geocoding import get_geocoder
 from app.models.station import Station
+from config import Config
 
+import asyncio
 import json
 import folium
+from datetime import date, datetime, time, timedelta
 
 from math import radians, cos, sin, asin, sqrt
 import requests
 
 station_bp = Blueprint("stations", __name__)
-api_address = "https://api.gios.gov.pl/pjp-api/v1/rest"
+api_address = Config.GIOS_API_URL
+
+
+def measurements_to_json(measurements, max_points: int = None) -> str:
+    """
+    Serializuje pomiary do JSON (lista słowników: data + wartość) dla wykresów w szablonie.
+
+    Przyjmuje kolumnową serię `TimeSeries` albo obiekty z polami `data` i `wartosc`
+    (zamieniane na `TimeSeries`). Daty zapisywane są w formacie "YYYY-MM-DD HH:MM:SS",
+    takim samym jak w API GIOŚ. Przy podanym `max_points` seria jest zmniejszana
+    metodą LTTB (`TimeSeries.downsample`), która zachowuje szczyty wartości.
+    """
+    if not isinstance(measurements, TimeSeries):
+        measurements = TimeSeries.from_rows(measurements)
+    return json.dumps(measurements.downsample(max_points).to_chart_points(), ensure_ascii=False)
 
 @station_bp.route("/")
 def index():
@@ -30,18 +51,16 @@ def list_stations():
     """
     Widok wyświetlający listę stacji pomiarowych w Polsce wraz z ich lokalizacją na mapie.
 
-    - Pobiera listę stacji z API GIOŚ przy użyciu klasy `Downloader`.
-    - Tworzy mapę osadzoną w środku Polski.
+    - Pobiera listę stacji z katalogu stacji API GIOŚ (`get_station_catalog`).
+    - Tworzy mapę osadzoną w środku Polski (HTML mapy z cache `StationMap.render_html`).
     - Renderuje szablon
     """
 
-    downloader = Downloader(api_address)
-    stations_list = downloader.fetch_stations_list()
+    stations_list = get_station_catalog(api_address).stations
 
     station_map = StationMap(stations_list)
-    fmap = station_map.create_default_map()
 
-    return render_template("stations.html", source="api", stations=stations_list, map_html=fmap._repr_html_())
+    return render_template("stations.html", source="api", stations=stations_list, map_html=station_map.render_html())
 
 @station_bp.route("/archive")
 def list_stations_archive():
@@ -49,7 +68,8 @@ def list_stations_archive():
     Widok wyświetlający archiwalną listę stacji pomiarowych z bazy danych.
 
     - Korzysta z `DataService` do pobrania listy stacji zapisanych lokalnie w bazie.
-    - Tworzy mapę za pomocą klasy `StationMap` z domyślnym ustawieniem środka i przybliżenia.
+    - Tworzy mapę za pomocą klasy `StationMap` z domyślnym ustawieniem środka i przybliżenia
+      (HTML mapy z cache `StationMap.render_html`).
     - Renderuje szablon
     """
 
@@ -58,9 +78,8 @@ def list_stations_archive():
     stations_list = service.get_stations_list_from_db()
 
     station_map = StationMap(stations_list)
-    fmap = station_map.create_default_map()
 
-    return render_template("stations.html", source="db", stations=stations_list, map_html=fmap._repr_html_())
+    return render_template("stations.html", source="db", stations=stations_list, map_html=station_map.render_html())
 
 @station_bp.route("/city")
 def stations_list():
@@ -68,8 +87,11 @@ def stations_list():
     Widok wyświetlający sortowaną (przez nazwę miejscowości)
     listę stacji pomiarowych w Polsce wraz z ich lokalizacją na mapie.
 
-    - Pobiera listę stacji z API GIOŚ przy użyciu klasy `Downloader`.
-    - Tworzy mapę osadzoną w środku Polski.
+    - Wyszukuje stacje w indeksie miast katalogu stacji (`get_station_catalog`),
+      bez rozróżniania wielkości liter i polskich znaków.
+    - Gdy nazwa nie pasuje dokładnie, używa najlepszej podpowiedzi miasta
+      z gazetera lokalnych tabel (`get_gazetteer`), np. "krak" -> "Kraków".
+    - Tworzy mapę osadzoną w środku Polski (HTML mapy z cache `StationMap.render_html`).
     - Renderuje szablon
     """
 
@@ -78,14 +100,17 @@ def stations_list():
 
 
     if city:
-        downloader = Downloader(api_address)
-        stations_list = downloader.fetch_stations_list_by_city(city_name=city)
+        catalog = get_station_catalog(api_address)
+        stations_list = catalog.find_by_city(city)
+        if not stations_list:
+            place = get_gazetteer().lookup(city, kinds=("city",))
+            if place is not None:
+                stations_list = catalog.find_by_city(place.name)
 
     station_map = StationMap(stations_list)
-    fmap = station_map.create_default_map()
 
 
-    return render_template("stations.html", source="api", stations=stations_list, map_html=fmap._repr_html_())
+    return render_template("stations.html", source="api", stations=stations_list, map_html=station_map.render_html())
 
 
 @station_bp.route("/nearby")
@@ -96,23 +121,24 @@ def stations_nearby():
     - Pobiera parametry zapytania:
         * `location` – adres lub nazwa miejscowości podana przez użytkownika,
         * `radius` – promień wyszukiwania w kilometrach.
-    - Pobiera listę stacji z API GIOŚ przy użyciu klasy `Downloader`.
+    - Pobiera listę stacji z katalogu stacji API GIOŚ (`get_station_catalog`).
     - Tworzy obiekt `StationMapWithRadius`, który umożliwia:
         * sortowanie stacji względem odległości od lokalizacji,
-        * filtrowanie według promienia wyszukiwania.
+        * filtrowanie według promienia wyszukiwania
+          (indeks przestrzenny katalogu, `catalog.spatial_index`).
+    - Lokalizację geokoduje przez `get_geocoder()` (z trwałym cache wyników w bazie).
     - Generuje mapę z zaznaczonymi stacjami znajdującymi się w zadanym promieniu.
     - Renderuje szablon
     """
 
-    stations_list = []
-
     location = request.args.get("location")
     radius = request.args.get("radius", type=float)
 
-    downloader = Downloader(api_address)
-    stations_list = downloader.fetch_stations_list()
+    catalog = get_station_catalog(api_address)
 
-    station_map_with_radius = StationMapWithRadius(stations_list, location, radius)
+    station_map_with_radius = StationMapWithRadius(catalog.stations, location, radius,
+                                                   spatial_index=catalog.spatial_index,
+                                                   geocoder=get_geocoder())
     stations_list_sorted = station_map_with_radius.sort_list_by_location_and_radius()
 
     fmap = station_map_with_radius.create_map()
@@ -120,67 +146,66 @@ def stations_nearby():
     return render_template("stations.html", source="api", stations=stations_list_sorted, map_html=fmap._repr_html_())
 
 @station_bp.route("/live/<int:station_id>")
-def station_detail(station_id):
+async def station_detail(station_id):
     """
     Widok szczegółowy dla wybranej stacji pomiarowej (na żywo, z API GIOŚ).
 
     - Przyjmuje w URL identyfikator stacji (`station_id`).
-    - Korzysta z `Downloader`, aby pobrać:
-        * słownik wszystkich stacji (`fetch_stations_dict`),
+    - Korzysta z `AsyncDownloader`, aby współbieżnie pobrać:
+        * stację z katalogu stacji (`get_station_catalog`),
         * listę czujników przypisanych do stacji (`fetch_station_sensors_list`),
         * aktualny wskaźnik jakości powietrza AQI (`fetch_station_index`).
     - Renderuje szablon
     """
 
-    downloader = Downloader(api_address)
-    stations_dict = downloader.fetch_stations_dict()
-    sensors_list = downloader.fetch_station_sensors_list(str(station_id))
-    aqi = downloader.fetch_station_index(str(station_id))
+    downloader = AsyncDownloader(api_address, max_concurrency=Config.GIOS_MAX_CONCURRENCY)
+    catalog, sensors_list, aqi = await downloader.gather(
+        asyncio.to_thread(get_station_catalog, api_address),
+        downloader.fetch_station_sensors_list(station_id),
+        downloader.fetch_station_index(station_id)
+    )
 
     return render_template("station_detail.html",
                            source="api",
-                           station=stations_dict[station_id],
+                           station=catalog.get(station_id),
                            sensors=sensors_list,
                            aqi=aqi)
 
 @station_bp.route("/archive/<int:station_id>")
 def station_detail_archive(station_id):
     """
-    Widok szczegółowy dla wybranej stacji pomiarowej (dane archiwalne, z API GIOŚ).
+    Widok szczegółowy dla wybranej stacji pomiarowej (dane archiwalne, z bazy danych).
 
     - Przyjmuje w URL identyfikator stacji (`station_id`).
-    - Korzysta z `Downloader`, aby pobrać:
-        * słownik wszystkich stacji (`fetch_stations_dict`),
-        * listę czujników przypisanych do stacji (`fetch_station_sensors_list`),
-        * aktualny wskaźnik jakości powietrza AQI (`fetch_station_index`).
+    - Korzysta z `DataService`, aby pobrać:
+        * stację po kluczu głównym razem z miastem, gminą i czujnikami (`get_station`),
+        * archiwalne indeksy jakości powietrza AQI stacji (`get_station_index_list_from_db`).
+    - Zwraca 404, jeżeli stacji nie ma w bazie.
     - Renderuje szablon
     """
 
     service = DataService()
 
-    sensors_list = service.get_sensors_list_from_db(station_id)
-    stations_list = service.get_stations_list_from_db()
+    station: Station = service.get_station(station_id)
+    if station is None:
+        abort(404)
+    sensors_list = station.sensors
     station_indexes = service.get_station_index_list_from_db(station_id)
 
-    station: Station = None
-    for item in stations_list:
-        if(item.id == station_id):
-            station = item
-
     return render_template("station_detail.html", source="db", station=station, sensors=sensors_list, station_indexes=station_indexes)
 
 
 @station_bp.route("/live/<int:station_id>/<int:sensor_id>", methods=["POST", "GET"])
-def sensor_detail(station_id, sensor_id):
+async def sensor_detail(station_id, sensor_id):
     """
     Widok szczegółowy czujnika pomiarowego w wybranej stacji (dane na żywo z API GIOŚ).
 
     - Parametry ścieżki:
         * `station_id` – identyfikator stacji,
         * `sensor_id` – identyfikator czujnika w tej stacji.
-    - Pobiera z API:
+    - Pobiera współbieżnie z API (`AsyncDownloader`):
         * listę pomiarów dla danego czujnika (`fetch_measurement`),
-        * słownik wszystkich stacji (`fetch_stations_dict`),
+        * stację z katalogu stacji (`get_station_catalog`),
         * słownik czujników przypisanych do wskazanej stacji (`fetch_station_sensors_dict`).
     - Tworzy obiekt `measurements_json`, czyli dane pomiarowe
       zserializowane do JSON (lista słowników: data + wartość), gotowe
@@ -188,27 +213,24 @@ def sensor_detail(station_id, sensor_id):
     - Renderuje szablon
     """
 
-    downloader = Downloader(api_address)
-    measurements = downloader.fetch_measurement(str(sensor_id))
-    stations_dict = downloader.fetch_stations_dict()
-    sensors_dict = downloader.fetch_station_sensors_dict(str(station_id))
+    downloader = AsyncDownloader(api_address, max_concurrency=Config.GIOS_MAX_CONCURRENCY)
+    measurements, catalog, sensors_dict = await downloader.gather(
+        downloader.fetch_measurement(sensor_id),
+        asyncio.to_thread(get_station_catalog, api_address),
+        downloader.fetch_station_sensors_dict(station_id)
+    )
 
     calculation = CalculationService(measurements)
     results = calculation.calculation_model()
 
 
-    measurements_json = json.dumps([
-        {
-            "data": m.data,
-            "wartosc": m.wartosc
-        } for m in measurements
-    ], ensure_ascii=False)
+    measurements_json = measurements_to_json(measurements, Config.CHART_MAX_POINTS)
 
     return render_template(
         "sensor_detail.html",
         source="api",
         station_id=station_id,
-        station=stations_dict[station_id],
+        station=catalog.get(station_id),
         sensor=sensors_dict[sensor_id],
         measurements=measurements,
         measurements_json=measurements_json,
@@ -217,7 +239,7 @@ def sensor_detail(station_id, sensor_id):
 
 
 @station_bp.route("/archive/<int:station_id>/<int:sensor_id>", methods=["POST", "GET"])
-def sensor_detail_archive(station_id, sensor_id):
+async def sensor_detail_archive(station_id, sensor_id):
     """
     Widok szczegółowy czujnika pomiarowego w wybranej stacji (dane archiwalne z API GIOŚ).
 
@@ -226,31 +248,38 @@ def sensor_detail_archive(station_id, sensor_id):
         * `sensor_id` – identyfikator czujnika w tej stacji.
     - Pobiera z API:
         * listę pomiarów dla danego czujnika (`fetch_measurement`),
-        * słownik wszystkich stacji (`fetch_stations_dict`),
+        * stację z katalogu stacji (`get_station_catalog`),
         * słownik czujników przypisanych do wskazanej stacji (`fetch_station_sensors_dict`).
-    - Tworzy obiekt `measurements_json`, czyli dane pomiarowe
-      zserializowane do JSON (lista słowników: data + wartość), gotowe
-      do wykorzystania w wykresach lub skryptach JS w szablonie.
+    - Do tabeli odczytuje z bazy tylko `ARCHIVE_TABLE_SIZE` ostatnich pomiarów.
+    - Statystyki odczytuje z przyrostowo utrzymywanych `SensorStatistics` (O(1));
+      tylko gdy ich brak, liczy je z pełnej serii pomiarów (`DataService.get_time_series`).
+    - Tworzy obiekt `measurements_json`, czyli dane do wykresu z agregatów
+      (`DataService.get_series`) w rozdzielczości dobranej do zakresu danych,
+      zserializowane do JSON (lista słowników: data + wartość).
     - Renderuje szablon
     """
 
     service = DataService()
-    measurements = service.get_measurements_list_from_db(sensor_id)
-
-    downloader = Downloader(api_address)
-    stations_dict = downloader.fetch_stations_dict()
-    sensors_dict = downloader.fetch_station_sensors_dict(str(station_id))
+    measurements = service.get_measurements_in_range(sensor_id, limit=Config.ARCHIVE_TABLE_SIZE, newest_first=True)
+    measurements.reverse()  # tabela w kolejności chronologicznej
+    statistics = service.get_sensor_statistics(sensor_id)
+
+    downloader = AsyncDownloader(api_address, max_concurrency=Config.GIOS_MAX_CONCURRENCY)
+    catalog, sensors_dict = await downloader.gather(
+        asyncio.to_thread(get_station_catalog, api_address),
+        downloader.fetch_station_sensors_dict(station_id)
+    )
 
-    calculation = CalculationService(measurements)
-    results = calculation.calculation_model()
+    if statistics is not None:
+        results = CalculationService.calculation_from_statistics(statistics)
+    else:
+        results = CalculationService(service.get_time_series(sensor_id)).calculation_model()
 
 
-    measurements_json = json.dumps([
-        {
-            "data": m.data,
-            "wartosc": m.wartosc
-        } for m in measurements
-    ], ensure_ascii=False)
+    measurements_json = measurements_to_json(
+        service.get_series(sensor_id, min_points=Config.CHART_MIN_POINTS),
+        Config.CHART_MAX_POINTS
+    )
 
 
 
@@ -258,7 +287,7 @@ def sensor_detail_archive(station_id, sensor_id):
         "sensor_detail.html",
         source="db",
         station_id=station_id,
-        station=stations_dict[station_id],
+        station=catalog.get(station_id),
         sensor=sensors_dict[sensor_id],
         measurements=measurements,
         measurements_json=measurements_json,
@@ -266,7 +295,7 @@ def sensor_detail_archive(station_id, sensor_id):
     )
 
 @station_bp.route("/archive/<int:station_id>/<int:sensor_id>/filtred", methods=["POST", "GET"])
-def sensor_detail_archive_filtered(station_id, sensor_id):
+async def sensor_detail_archive_filtered(station_id, sensor_id):
     """
         Widok szczegółowy czujnika pomiarowego dla danych archiwalnych (z bazy danych)
         z możliwością filtrowania pomiarów po zakresie dat.
@@ -275,50 +304,44 @@ def sensor_detail_archive_filtered(station_id, sensor_id):
 
 
         - Obsługuje parametry zapytania:
-            * `startDate` – początkowa data filtrowania (string),
-            * `endDate` – końcowa data filtrowania (string).
-        - Jeżeli podano zakres dat, filtruje pomiary tak, aby uwzględniały
-          wyłącznie rekordy, których `m.data` mieści się w zadanym przedziale.
-        - Tworzy `measurements_json`, czyli dane pomiarowe w formacie JSON
-          (lista słowników: data + wartość), gotowe do wykorzystania
-          w części frontendowej (np. na wykresach).
+            * `startDate` – początkowa data filtrowania (YYYY-MM-DD),
+            * `endDate` – końcowa data filtrowania (YYYY-MM-DD, włącznie).
+        - Pobiera z bazy wyłącznie pomiary z zadanego przedziału
+          jako kolumnową serię (`DataService.get_time_series`) i raz liczy dla nich statystyki.
+        - Tworzy `measurements_json`, czyli dane do wykresu z agregatów
+          (`DataService.get_series`) w rozdzielczości dobranej do zakresu dat,
+          w formacie JSON (lista słowników: data + wartość).
         - Renderuje szablon
     """
 
-    service = DataService()
-    measurements = service.get_measurements_list_from_db(sensor_id)
+    start_date = request.args.get("startDate", type=date.fromisoformat)
+    end_date = request.args.get("endDate", type=date.fromisoformat)
 
-    downloader = Downloader(api_address)
-    stations_dict = downloader.fetch_stations_dict()
-    sensors_dict = downloader.fetch_station_sensors_dict(str(station_id))
+    start = datetime.combine(start_date, time.min) if start_date else None
+    end = datetime.combine(end_date + timedelta(days=1), time.min) if end_date else None  # data końcowa włącznie
 
-    start_str = request.args.get("startDate")
-    end_str = request.args.get("endDate")
-
-    print(start_str)
-    print(end_str)
-    filtered = []
-    measurements_json = []
-    results = {}
-    if(start_str and end_str != None):
-        for m in measurements:
-            if (m.data >= start_str and m.data <= end_str):
-                calculation = CalculationService(measurements)
-                results = calculation.calculation_model()
-                filtered.append({
-                    "data": m.data,  # jeśli m.data to datetime
-                    "wartosc": m.wartosc
-                })
-        measurements_json = json.dumps(filtered, ensure_ascii=False)
+    service = DataService()
+    measurements = service.get_time_series(sensor_id, start, end)
 
+    downloader = AsyncDownloader(api_address, max_concurrency=Config.GIOS_MAX_CONCURRENCY)
+    catalog, sensors_dict = await downloader.gather(
+        asyncio.to_thread(get_station_catalog, api_address),
+        downloader.fetch_station_sensors_dict(station_id)
+    )
 
+    calculation = CalculationService(measurements)
+    results = calculation.calculation_model()
 
+    measurements_json = measurements_to_json(
+        service.get_series(sensor_id, start, end, min_points=Config.CHART_MIN_POINTS),
+        Config.CHART_MAX_POINTS
+    )
 
     return render_template(
         "sensor_detail.html",
         source="db",
         station_id=station_id,
-        station=stations_dict[station_id],
+        station=catalog.get(station_id),
         sensor=sensors_dict[sensor_id],
         measurements=measurements,
         measurements_json=measurements_json,
@@ -327,15 +350,15 @@ def sensor_detail_archive_filtered(station_id, sensor_id):
 
 
 @station_bp.route("/<int:station_id>/<int:sensor_id>/add", methods=["POST"])
-def add_data(station_id, sensor_id):
+async def add_data(station_id, sensor_id):
     """
         Endpoint do dodawania danych pomiarowych wybranego czujnika do lokalnej bazy danych.
 
         - Parametry ścieżki:
             * `station_id` – identyfikator stacji,
             * `sensor_id` – identyfikator czujnika w tej stacji.
-        - Pobiera dane z API GIOŚ:
-            * słownik wszystkich stacji (`fetch_stations_dict`),
+        - Pobiera współbieżnie dane z API GIOŚ (`AsyncDownloader`):
+            * stację z katalogu stacji (`get_station_catalog`),
             * słownik czujników przypisanych do stacji (`fetch_station_sensors_dict`),
             * listę pomiarów czujnika (`fetch_measurement`),
             * bieżący wskaźnik jakości powietrza stacji (`fetch_station_index`).
@@ -346,16 +369,18 @@ def add_data(station_id, sensor_id):
 
     service = DataService()
 
-    downloader = Downloader(api_address)
-    stations_dict = downloader.fetch_stations_dict()
-    sensors_dict = downloader.fetch_station_sensors_dict(str(station_id))
-    measurements = downloader.fetch_measurement(str(sensor_id))
-    station_index = downloader.fetch_station_index(str(station_id))
+    downloader = AsyncDownloader(api_address, max_concurrency=Config.GIOS_MAX_CONCURRENCY)
+    catalog, sensors_dict, measurements, station_index = await downloader.gather(
+        asyncio.to_thread(get_station_catalog, api_address),
+        downloader.fetch_station_sensors_dict(station_id),
+        downloader.fetch_measurement(sensor_id),
+        downloader.fetch_station_index(station_id)
+    )
 
     calculation = CalculationService(measurements)
     results = calculation.calculation_model()
 
-    service.save_measurement(stations_dict[station_id], sensors_dict[sensor_id], measurements, sensor_id, station_index, station_id)
+    service.save_measurement(catalog.get(station_id), sensors_dict[sensor_id], measurements, sensor_id, station_index, station_id)
 
     return redirect(url_for("stations.sensor_detail", station_id=station_id,
                             sensor_id=sensor_id))
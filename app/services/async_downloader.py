@@ -0,0 +1,60 @@
+import asyncio
+from typing import Dict, List
+import requests
+from app.models.dto import SensorData, MeasurementData, StationIndexData
+from app.services.downloader import Downloader
+from app.services.station_catalog import StationCatalog
+
+DEFAULT_MAX_CONCURRENCY = 8
+
+
+class AsyncDownloader:
+    """
+    Asynchroniczny wariant `Downloader`.
+
+    Każde wywołanie API wykonywane jest w osobnym wątku (przez współdzieloną
+    pulę połączeń `Downloader`), a liczba jednoczesnych zapytań ograniczona
+    jest semaforem. Dzięki temu kilka zapytań potrzebnych do jednej strony
+    (np. czujniki + pomiary + indeks AQI) trwa tyle, co najwolniejsze z nich.
+
+    Obiekt należy tworzyć w obrębie jednej pętli zdarzeń (np. jeden na żądanie).
+
+    Argumenty:
+        base_url (str): Bazowy adres API GIOŚ.
+        max_concurrency (int): Maksymalna liczba jednoczesnych zapytań.
+        session (requests.Session | None): Sesja HTTP (domyślnie współdzielona).
+        timeout: Timeouty (connect, read) przekazywane do `Downloader`.
+    """
+
+    def __init__(self, base_url: str, max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 session: requests.Session = None, timeout=None):
+        self.base_url = base_url
+        self.session = session
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _run(self, method_name: str, *args):
+        # nowy Downloader na każde wywołanie - jego słowniki wynikowe nie są
+        # bezpieczne przy współbieżnym użyciu, a sesja i tak jest współdzielona
+        downloader = Downloader(self.base_url, session=self.session, timeout=self.timeout)
+        async with self._semaphore:
+            return await asyncio.to_thread(getattr(downloader, method_name), *args)
+
+    async def gather(self, *aws):
+        """Uruchamia podane korutyny współbieżnie i zwraca wyniki w tej samej kolejności."""
+        return await asyncio.gather(*aws)
+
+    async def fetch_station_index(self, station_id) -> StationIndexData:
+        return await self._run("fetch_station_index", str(station_id))
+
+    async def fetch_measurement(self, sensor_id) -> List[MeasurementData]:
+        return await self._run("fetch_measurement", str(sensor_id))
+
+    async def fetch_station_sensors_list(self, station_id) -> List[SensorData]:
+        return await self._run("fetch_station_sensors_list", str(station_id))
+
+    async def fetch_station_sensors_dict(self, station_id) -> Dict[int, SensorData]:
+        return await self._run("fetch_station_sensors_dict", str(station_id))
+
+    async def fetch_station_catalog(self) -> StationCatalog:
+        return await self._run("fetch_station_catalog")
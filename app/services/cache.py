@@ -0,0 +1,141 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    Cache w pamięci procesu z czasem życia wpisów (TTL) i limitem rozmiaru (LRU).
+
+    - Wpis młodszy niż `ttl * refresh_ahead` zwracany jest bez żadnej pracy.
+    - Wpis starszy (ale wciąż w oknie `ttl + stale_ttl`) jest zwracany od razu,
+      a w tle uruchamiane jest jego odświeżenie (stale-while-revalidate).
+    - Brak wpisu lub wpis całkowicie przeterminowany -> ładowanie synchroniczne;
+      jeśli wpis jest już ładowany (np. rozgrzewanie w tle), czekamy na ten wynik
+      zamiast ładować go drugi raz.
+    - Po przekroczeniu `maxsize` usuwany jest najdawniej używany wpis.
+
+    Argumenty:
+        ttl (float | None): Czas życia wpisu w sekundach (None = bez wygasania).
+        maxsize (int): Maksymalna liczba wpisów.
+        refresh_ahead (float): Ułamek TTL, po którym wpis jest odświeżany w tle.
+        stale_ttl (float): Jak długo po wygaśnięciu można jeszcze serwować stary wpis.
+    """
+
+    def __init__(self, ttl=None, maxsize: int = 128, refresh_ahead: float = 0.8, stale_ttl: float = 0):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.refresh_ahead = refresh_ahead
+        self.stale_ttl = stale_ttl
+        self._data = OrderedDict()  # key -> (value, stored_at)
+        self._lock = threading.RLock()
+        self._refreshing = {}  # key -> threading.Event ustawiane po zakończeniu ładowania
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def _age(self, stored_at: float) -> float:
+        return time.monotonic() - stored_at
+
+    def get(self, key, default=None):
+        """Zwraca wpis, o ile nie wygasł; w przeciwnym razie `default`."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            value, stored_at = entry
+            if self.ttl is not None and self._age(stored_at) >= self.ttl:
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def peek(self, key, default=None):
+        """Zwraca wpis bez względu na jego wiek (również przeterminowany)."""
+        with self._lock:
+            entry = self._data.get(key)
+            return entry[0] if entry is not None else default
+
+    def set(self, key, value):
+        """Zapisuje wpis i w razie potrzeby usuwa najdawniej używane."""
+        with self._lock:
+            self._data[key] = (value, time.monotonic())
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def get_or_load(self, key, loader):
+        """
+        Zwraca wartość z cache lub ładuje ją funkcją `loader()`.
+
+        Puste wyniki ładowania (np. `{}` po błędzie pobierania) nie są zapisywane,
+        a jeśli istnieje stary wpis, to jest on zwracany zamiast pustego wyniku.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+
+        if entry is not None:
+            value, stored_at = entry
+            age = self._age(stored_at)
+            if self.ttl is None or age < self.ttl * self.refresh_ahead:
+                with self._lock:
+                    if key in self._data:
+                        self._data.move_to_end(key)
+                return value
+            if age < self.ttl + self.stale_ttl:
+                self.refresh_in_background(key, loader)
+                return value
+
+        with self._lock:
+            pending = self._refreshing.get(key)
+            if pending is None:
+                self._refreshing[key] = threading.Event()
+        if pending is not None:
+            pending.wait()
+            with self._lock:
+                loaded = self._data.get(key)
+            if loaded is not None and loaded is not entry:
+                return loaded[0]
+            value = loader()  # ładowanie w toku nie powiodło się
+            if value:
+                self.set(key, value)
+                return value
+        else:
+            value = self.refresh(key, loader)
+            if value:
+                return value
+        return entry[0] if entry is not None else value
+
+    def refresh(self, key, loader):
+        """Synchronicznie przeładowuje wpis; nieudane ładowanie zostawia stary wpis."""
+        try:
+            value = loader()
+            if value:
+                self.set(key, value)
+            return value
+        finally:
+            with self._lock:
+                done = self._refreshing.pop(key, None)
+            if done is not None:
+                done.set()
+
+    def refresh_in_background(self, key, loader):
+        """Uruchamia odświeżenie wpisu w wątku w tle (maks. jedno naraz na klucz)."""
+        with self._lock:
+            if key in self._refreshing:
+                return None
+            self._refreshing[key] = threading.Event()
+
+        thread = threading.Thread(target=self.refresh, args=(key, loader), daemon=True)
+        thread.start()
+        return thread
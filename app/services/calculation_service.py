@@ -1,63 +1,162 @@
+import math
+import numpy as np
 from app.models.calculation import Calculation
+from app.services.time_series import TimeSeries
+
 
 class CalculationService:
-    def __init__(self, values):
+    """
+    Wektorowa (NumPy) analiza serii pomiarów.
+
+    Przyjmuje kolumnową serię `TimeSeries` (bez kopiowania danych), listę
+    obiektów z polami `wartosc` i `data` (np. Measurement) albo surową
+    tablicę/listę wartości (float, NaN = brak pomiaru).
+    Wszystkie statystyki liczone są jednorazowo przy tworzeniu obiektu.
+    """
+
+    PERCENTYLE = (25, 50, 75, 95)
+
+    def __init__(self, values, timestamps=None):
 
         self.values = values
-        self.pomiary = []
-        self.pomiary_to_value_list()
+        self.czasy, self.wartosci = self._to_arrays(values, timestamps)
+        self.pomiary = self.wartosci[~np.isnan(self.wartosci)]
+        self._statystyki = self._oblicz()
+
+    @staticmethod
+    def _to_arrays(values, timestamps=None):
+        """Zwraca (czasy w godzinach | None, wartości float64 z NaN w miejsce braków)."""
+        if isinstance(values, TimeSeries):
+            return values.hours(), np.where(values.mask, values.values, np.nan)
+
+        if values is None or len(values) == 0:
+            return None, np.empty(0, dtype=np.float64)
+
+        first = values[0]
+        if not hasattr(first, "wartosc"):
+            wartosci = np.asarray(values, dtype=np.float64)
+            czasy = None if timestamps is None else np.asarray(timestamps, dtype=np.float64)
+            return czasy, wartosci
+
+        wartosci = np.fromiter(
+            (np.nan if v.wartosc is None else v.wartosc for v in values),
+            dtype=np.float64, count=len(values)
+        )
+        czasy = None
+        if getattr(first, "data", None) is not None:
+            sekundy = np.array([v.data for v in values], dtype="datetime64[s]").astype(np.int64)
+            czasy = sekundy / 3600.0
+        return czasy, wartosci
+
+    def _oblicz(self):
+        n_all = len(self.wartosci)
+        if n_all == 0:
+            return None
+
+        valid = ~np.isnan(self.wartosci)
+        y = self.wartosci[valid]
+        n = len(y)
+        stats = {"udzial_brakow": round(1 - n / n_all, 3)}
+        if n == 0:
+            return stats
+
+        stats["min"] = round(float(y.min()), 3)
+        stats["max"] = round(float(y.max()), 3)
+        stats["srednia"] = round(float(y.mean()), 3)
+        stats["odchylenie"] = round(float(y.std()), 3)
+        stats["percentyle"] = {
+            p: round(float(v), 3) for p, v in zip(self.PERCENTYLE, np.percentile(y, self.PERCENTYLE))
+        }
+
+        if n >= 2:
+            # oś czasu: znaczniki czasu (w godzinach), a gdy ich brak - kolejne indeksy
+            x = self.czasy[valid] if self.czasy is not None else np.flatnonzero(valid).astype(np.float64)
+            x = x - x.mean()
+            sxx = float(np.dot(x, x))
+            stats["nachylenie"] = float(np.dot(x, y) / sxx) if sxx else 0.0
+        return stats
+
+    @staticmethod
+    def trend_from_slope(nachylenie):
+        """Zamienia nachylenie prostej regresji na opis trendu."""
+        if nachylenie is None:
+            return "za mało danych do określenia trendu"
+
+        if np.isclose(nachylenie, 0, atol=1e-12):
+            return "stały"
+        elif nachylenie > 0:
+            return "rosnący"
+        else:
+            return "malejący"
+
+    @classmethod
+    def calculation_from_statistics(cls, stats) -> Calculation:
+        """
+        Buduje model Calculation z przyrostowo utrzymywanych statystyk czujnika
+        (SensorStatistics) w czasie O(1), bez odczytu pomiarów.
+
+        Percentyle nie dają się liczyć przyrostowo, więc pozostają puste.
+        """
+        n = stats.count
+        n_all = n + stats.missing_count
+        if n == 0:
+            return Calculation(min=None, max=None, srednia=None, trend=cls.trend_from_slope(None),
+                               udzial_brakow=1.0 if n_all else None)
+
+        srednia = stats.total / n
+        wariancja = max(stats.total_sq / n - srednia * srednia, 0.0)
+
+        nachylenie = None
+        if n >= 2:
+            sxx = stats.sum_tt - stats.sum_t * stats.sum_t / n
+            sxy = stats.sum_ty - stats.sum_t * stats.total / n
+            nachylenie = sxy / sxx if sxx > 0 else 0.0
+
+        return Calculation(
+            min=round(stats.min, 3),
+            max=round(stats.max, 3),
+            srednia=round(srednia, 3),
+            trend=cls.trend_from_slope(nachylenie),
+            odchylenie=round(math.sqrt(wariancja), 3),
+            udzial_brakow=round(1 - n / n_all, 3),
+            nachylenie=None if nachylenie is None else round(nachylenie, 6)
+        )
 
     def calculation_model(self):
-        """Zwraca wyniki analizy w formie modelu Pydantic"""
+        """Zwraca wyniki analizy w formie modelu Calculation"""
+        stats = self._statystyki or {}
 
         return Calculation(
             min=self.min_wartosc(),
             max=self.max_wartosc(),
             srednia=self.srednia(),
-            trend=self.trend()
+            trend=self.trend(),
+            odchylenie=stats.get("odchylenie"),
+            percentyle=stats.get("percentyle"),
+            udzial_brakow=stats.get("udzial_brakow"),
+            nachylenie=None if stats.get("nachylenie") is None else round(stats["nachylenie"], 6)
         )
 
-    def pomiary_to_value_list(self):
-
-        for v in self.values:
-            if v.wartosc is not None:
-                self.pomiary.append(v.wartosc)
-
-
     def min_wartosc(self):
         """Zwraca najmniejszą wartość z listy pomiarów"""
-        if self.values:
-            return round(min(self.pomiary), 3)
+        if self._statystyki:
+            return self._statystyki.get("min")
 
     def max_wartosc(self):
         """Zwraca największą wartość z listy pomiarów"""
-        if self.values:
-            return round(max(self.pomiary), 3)
+        if self._statystyki:
+            return self._statystyki.get("max")
 
     def srednia(self):
         """Zwraca średnią wartość pomiarów"""
-        if self.values:
-            return round(sum(self.pomiary) / len(self.pomiary), 3)
+        if self._statystyki:
+            return self._statystyki.get("srednia")
 
     def trend(self):
-        """Określa trend danych:
+        """Określa trend danych na podstawie nachylenia prostej regresji (MNK):
         - 'rosnący' jeśli dane mają tendencję do wzrostu
         - 'malejący' jeśli dane mają tendencję do spadku
         - 'stały' jeśli brak wyraźnego trendu
         """
-        if self.values:
-            if len(self.pomiary) < 2:
-                return "za mało danych do określenia trendu"
-
-            roznice = [self.pomiary[i+1] - self.pomiary[i] for i in range(len(self.pomiary)-1)]
-            suma_roznic = sum(roznice)
-
-            if suma_roznic > 0:
-                return "rosnący"
-            elif suma_roznic < 0:
-                return "malejący"
-            else:
-                return "stały"
-
-
-# P
+        if self._statystyki:
+            return self.trend_from_slope(self._statystyki.get("nachylenie"))
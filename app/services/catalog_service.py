@@ -0,0 +1,45 @@
+from app.services.cache import TTLCache
+from app.services.downloader import Downloader
+from app.services.station_catalog import StationCatalog
+
+# Katalog stacji (station/findAll) zmienia się rzadko - trzymamy go w pamięci procesu.
+_catalog_cache = TTLCache(ttl=6 * 3600, maxsize=4, stale_ttl=24 * 3600)
+_api_address = None
+
+
+def configure_catalog_cache(api_address: str, ttl: float = 6 * 3600, stale_ttl: float = 24 * 3600, maxsize: int = 4):
+    """
+    Ustawia adres API oraz parametry cache katalogu stacji.
+
+    Argumenty:
+        api_address (str): Bazowy adres API GIOŚ.
+        ttl (float): Czas życia katalogu w sekundach.
+        stale_ttl (float): Jak długo po wygaśnięciu można serwować stary katalog.
+        maxsize (int): Maksymalna liczba przechowywanych katalogów.
+    """
+    global _api_address
+    _api_address = api_address
+    _catalog_cache.ttl = ttl
+    _catalog_cache.stale_ttl = stale_ttl
+    _catalog_cache.maxsize = maxsize
+
+
+def _load_station_catalog(api_address: str) -> StationCatalog:
+    return Downloader(api_address).fetch_station_catalog()
+
+
+def get_station_catalog(api_address: str = None) -> StationCatalog:
+    """
+    Zwraca indeksowany katalog stacji z cache; pobiera go z API tylko
+    przy pierwszym użyciu lub po całkowitym wygaśnięciu wpisu.
+    """
+    api_address = api_address or _api_address
+    return _catalog_cache.get_or_load(("station_catalog", api_address),
+                                      lambda: _load_station_catalog(api_address))
+
+
+def warm_catalog(api_address: str = None):
+    """Pobiera katalog stacji w tle (np. przy starcie procesu roboczego)."""
+    api_address = api_address or _api_address
+    return _catalog_cache.refresh_in_background(("station_catalog", api_address),
+                                                lambda: _load_station_catalog(api_address))
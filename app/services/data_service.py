@@ -1,8 +1,53 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.dialects import postgresql, sqlite
 from app import db
+from app.models.city import City
+from app.models.gmina import Gmina
 from app.models.station import Station
 from app.models.sensor import Sensor
 from app.models.measurement import Measurement
 from app.models.station_index import StationIndex
+from app.models.sensor_statistics import SensorStatistics
+from app.models.measurement_rollup import MeasurementRollup, RESOLUTIONS, bucket_start
+from app.models.dto import StationData, SensorData, MeasurementData, StationIndexData, to_model
+from app.services.time_series import TimeSeries
+
+# przybliżona długość przedziału każdej rozdzielczości agregatów
+RESOLUTION_STEPS = {
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+    "month": timedelta(days=30),
+}
+
+# minimalna liczba punktów wykresu przy wyborze rozdzielczości
+DEFAULT_MIN_POINTS = 200
+
+# bazy z obsługą INSERT ... ON CONFLICT, na którym opiera się zapis danych
+DIALECT_INSERTS = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+
+
+def check_database_support(database_uri: str):
+    """
+    Sprawdza przy starcie aplikacji, czy baza z `SQLALCHEMY_DATABASE_URI` jest
+    obsługiwana przez DataService (zamiast błędu dopiero przy pierwszym zapisie).
+
+    Argumenty:
+        database_uri (str): Adres bazy danych.
+    """
+    dialect = make_url(database_uri).get_backend_name()
+    if dialect not in DIALECT_INSERTS:
+        raise RuntimeError(
+            f"Nieobsługiwana baza danych '{dialect}' w SQLALCHEMY_DATABASE_URI - "
+            f"zapis danych wymaga jednej z: {', '.join(DIALECT_INSERTS)}"
+        )
 
 
 class DataService:
@@ -13,7 +58,7 @@ class DataService:
     # -------------------------------
     # Station
     # -------------------------------
-    def get_or_create_station(self, station_data: Station) -> Station:
+    def get_or_create_station(self, station_data: StationData) -> Station:
         """
         Szuka stacji po id, jeżeli nie istnieje -> tworzy nową.
         """
@@ -23,7 +68,7 @@ class DataService:
             print("Station exist")
             return station
         else:
-            db.session.add(station_data)
+            self.save_stations([station_data])
 
 
             # sensors_data.id_stacji = station_data.id
@@ -32,12 +77,81 @@ class DataService:
             db.session.commit()
         return station
 
+    def save_stations(self, stations: List[StationData]):
+        """
+        Zapisuje stacje wraz z ich gminami i miastami (w bieżącej transakcji).
+
+        Każda gmina (klucz naturalny: gmina, powiat, województwo) i każde miasto
+        zapisywane są raz, niezależnie od liczby stacji, które na nie wskazują:
+        gminy i stacje poleceniem INSERT ... ON CONFLICT DO NOTHING, miasta
+        z aktualizacją nazwy i gminy. Obiekty `stations` (np. ze współdzielonego
+        cache katalogu) nie są przypinane do sesji ani modyfikowane.
+
+        Argumenty:
+            stations (list[Station]): Stacje z powiązanymi City i Gmina.
+        """
+        if not stations:
+            return
+
+        # 1. Gminy
+        gmina_keys = {
+            (s.city.gmina.gminaName, s.city.gmina.powiatName, s.city.gmina.wojewodztwoName)
+            for s in stations
+        }
+        gmina_columns = (Gmina.gminaName, Gmina.powiatName, Gmina.wojewodztwoName)
+        db.session.execute(
+            self._dialect_insert(Gmina.__table__).on_conflict_do_nothing(
+                index_elements=["gminaName", "powiatName", "wojewodztwoName"]
+            ),
+            [{"gminaName": g, "powiatName": p, "wojewodztwoName": w} for g, p, w in gmina_keys]
+        )
+        gmina_ids = {
+            (g, p, w): gmina_id for gmina_id, g, p, w in db.session.execute(
+                select(Gmina.id, *gmina_columns).where(tuple_(*gmina_columns).in_(list(gmina_keys)))
+            )
+        }
+
+        # 2. Miasta
+        cities = {
+            s.city.id: {
+                "id": s.city.id,
+                "name": s.city.name,
+                "gmina_id": gmina_ids[(s.city.gmina.gminaName, s.city.gmina.powiatName,
+                                       s.city.gmina.wojewodztwoName)]
+            } for s in stations
+        }
+        stmt = self._dialect_insert(City.__table__)
+        db.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["id"],
+                set_={"name": stmt.excluded.name, "gmina_id": stmt.excluded.gmina_id}
+            ),
+            list(cities.values())
+        )
+
+        # 3. Stacje
+        db.session.execute(
+            self._dialect_insert(Station.__table__).on_conflict_do_nothing(),
+            list({
+                s.id: {
+                    "id": s.id,
+                    "stationCode": s.stationCode,
+                    "stationName": s.stationName,
+                    "gegrLat": s.gegrLat,
+                    "gegrLon": s.gegrLon,
+                    "addressStreet": s.addressStreet,
+                    "city_id": s.city.id
+                } for s in stations
+            }.values())
+        )
+
     # -------------------------------
     # Station
     # -------------------------------
-    def get_or_create_sensor(self, sensors_data: Sensor, station_data: Station) -> Sensor:
+    def get_or_create_sensor(self, sensors_data: SensorData, station_data: StationData) -> Sensor:
         """
-        Szuka sensora po id, jeżeli nie istnieje -> tworzy nowy wiersz.
+        Szuka sensora po id, jeżeli nie istnieje -> tworzy nowy wiersz
+        (SensorData zamieniany jest na model Sensor).
         """
         sensor = Sensor.query.filter_by(id_stanowiska=sensors_data.id_stanowiska).first()
 
@@ -46,8 +160,9 @@ class DataService:
             return sensor
         else:
 
-            sensors_data.id_stacji = station_data.id
-            db.session.add(sensors_data)
+            sensor_model = to_model(sensors_data)
+            sensor_model.id_stacji = station_data.id
+            db.session.add(sensor_model)
 
             db.session.commit()
         return sensor
@@ -55,13 +170,207 @@ class DataService:
     # -------------------------------
     # Measurement
     # -------------------------------
-    def save_measurement(self, station_data: Station, sensors_data: Sensor, measurement_data: list, sensor_id: int,
-                         station_index_data: StationIndex, station_id: int) -> Measurement:
+    def _insert_measurements(self, rows: List[dict]) -> list:
+        """
+        Wstawia paczkę pomiarów jednym poleceniem INSERT ... ON CONFLICT DO UPDATE.
+
+        Duplikaty (ten sam `sensor_id` i `data`) są pomijane przez bazę na podstawie
+        klucza unikalnego, więc koszt zależy od wielkości paczki, a nie od historii.
+        Wyjątkiem są pomiary zapisane wcześniej bez wartości - API GIOŚ uzupełnia
+        je później, więc ich wartość jest nadpisywana (tylko NULL -> wartość).
+        Wstawione i uzupełnione wiersze są od razu doliczane do statystyk czujników
+        i agregatów godzinowych, dobowych i miesięcznych.
+
+        Argumenty:
+            rows (list[dict]): Wiersze z kluczami sensor_id, kod_stanowiska, data, wartosc.
+
+        Zwraca:
+            list[Row]: Faktycznie wstawione lub uzupełnione wiersze (sensor_id, data, wartosc).
+        """
+        if not rows:
+            return []
+
+        table = Measurement.__table__
+        missing = self._missing_measurement_keys(rows)
+        stmt = self._dialect_insert(table)
+        stmt = (
+            stmt.on_conflict_do_update(
+                index_elements=["sensor_id", "data"],
+                set_={"wartosc": stmt.excluded.wartosc, "kod_stanowiska": stmt.excluded.kod_stanowiska},
+                where=table.c.wartosc.is_(None) & stmt.excluded.wartosc.is_not(None)
+            )
+            .returning(table.c.sensor_id, table.c.data, table.c.wartosc)
+        )
+        written = db.session.execute(stmt, rows).all()
+
+        filled = [row for row in written if (row.sensor_id, row.data) in missing]
+        inserted = [row for row in written if (row.sensor_id, row.data) not in missing]
+        self._update_statistics(inserted, filled)
+        self._update_rollups(written)
+        return written
+
+    @staticmethod
+    def _missing_measurement_keys(rows: List[dict]) -> set:
+        """
+        Zwraca klucze (sensor_id, data) pomiarów z paczki, które są już zapisane bez wartości
+        i mogą zostać uzupełnione (jedno zapytanie; takich pomiarów jest niewiele).
+        """
+        candidates = {(row["sensor_id"], row["data"]) for row in rows if row["wartosc"] is not None}
+        if not candidates:
+            return set()
+
+        stored = db.session.execute(
+            select(Measurement.sensor_id, Measurement.data).where(
+                Measurement.sensor_id.in_({sensor_id for sensor_id, _ in candidates}),
+                Measurement.data >= min(data for _, data in candidates),
+                Measurement.wartosc.is_(None)
+            )
+        ).tuples()
+        return candidates.intersection(stored)
+
+    @staticmethod
+    def _dialect_insert(table):
+        """Zwraca INSERT z obsługą ON CONFLICT dla bieżącej bazy (SQLite lub PostgreSQL)."""
+        # obsługiwana baza sprawdzana jest przy starcie (check_database_support)
+        return DIALECT_INSERTS[db.session.get_bind().dialect.name](table)
+
+    def _update_statistics(self, inserted: list, filled: list = ()):
+        """
+        Dolicza nowo wstawione pomiary oraz wartości uzupełnione w pomiarach
+        zapisanych wcześniej bez wartości do SensorStatistics (w bieżącej transakcji).
+        """
+        if not inserted and not filled:
+            return
+
+        sensor_ids = {row.sensor_id for row in inserted} | {row.sensor_id for row in filled}
+        statistics = {
+            s.sensor_id: s for s in db.session.scalars(
+                select(SensorStatistics)
+                .where(SensorStatistics.sensor_id.in_(sensor_ids))
+                .with_for_update()
+            )
+        }
+
+        created = set()
+        for row in [*inserted, *filled]:
+            if row.sensor_id not in statistics:
+                statistics[row.sensor_id] = SensorStatistics.empty(row.sensor_id)
+                db.session.add(statistics[row.sensor_id])
+                created.add(row.sensor_id)
+
+        for row in inserted:
+            statistics[row.sensor_id].add(row.data, row.wartosc)
+
+        for row in filled:
+            if row.sensor_id in created:
+                # pomiar bez wartości zapisany przed utworzeniem statystyk nie był w nich liczony
+                statistics[row.sensor_id].add(row.data, row.wartosc)
+            else:
+                statistics[row.sensor_id].fill(row.data, row.wartosc)
+
+    def _update_rollups(self, inserted: list):
+        """
+        Dolicza nowe wartości pomiarów (również uzupełnione) do agregatów MeasurementRollup
+        (w bieżącej transakcji).
+
+        Pomiary są najpierw grupowane w pamięci, a następnie każdy przedział
+        zapisywany jest jednym poleceniem INSERT ... ON CONFLICT DO UPDATE.
+        """
+        groups = defaultdict(list)
+        for row in inserted:
+            if row.wartosc is None:
+                continue
+            for resolution in RESOLUTIONS:
+                groups[(row.sensor_id, resolution, bucket_start(row.data, resolution))].append(row.wartosc)
+
+        if not groups:
+            return
+
+        rows = [
+            {
+                "sensor_id": sensor_id,
+                "resolution": resolution,
+                "bucket": bucket,
+                "count": len(values),
+                "total": sum(values),
+                "min": min(values),
+                "max": max(values)
+            } for (sensor_id, resolution, bucket), values in groups.items()
+        ]
+
+        table = MeasurementRollup.__table__
+        stmt = self._dialect_insert(table)
+        # SQLite: wieloargumentowe min()/max(), PostgreSQL: least()/greatest()
+        if db.session.get_bind().dialect.name == "sqlite":
+            least, greatest = func.min, func.max
+        else:
+            least, greatest = func.least, func.greatest
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["sensor_id", "resolution", "bucket"],
+            set_={
+                "count": table.c.count + stmt.excluded.count,
+                "total": table.c.total + stmt.excluded.total,
+                "min": least(table.c.min, stmt.excluded.min),
+                "max": greatest(table.c.max, stmt.excluded.max)
+            }
+        )
+        db.session.execute(stmt, rows)
+
+    def get_sensor_statistics(self, sensor_id: int):
+        """
+        Pobiera zagregowane statystyki czujnika (odczyt jednego wiersza).
+
+        Zwraca:
+            SensorStatistics | None: Statystyki lub None, jeśli czujnik nie ma pomiarów.
+        """
+        return db.session.get(SensorStatistics, sensor_id)
+
+    def get_sensor_watermarks(self, sensor_ids: List[int]) -> Dict[int, Tuple[datetime, Optional[datetime]]]:
+        """
+        Zwraca znaczniki zapisanych pomiarów każdego czujnika (jedno zapytanie
+        do SensorStatistics): datę najnowszego pomiaru i datę najnowszego pomiaru
+        z wartością. Pomiary pomiędzy nimi zapisane są bez wartości i mogą zostać
+        jeszcze uzupełnione przez API GIOŚ. Czujniki bez pomiarów są pomijane.
+
+        Argumenty:
+            sensor_ids (list[int]): Identyfikatory czujników (id_stanowiska).
+
+        Zwraca:
+            dict[int, tuple[datetime, datetime | None]]: Identyfikator czujnika ->
+            (data najnowszego pomiaru, data najnowszego pomiaru z wartością).
+        """
+        if not sensor_ids:
+            return {}
+        rows = db.session.execute(
+            select(SensorStatistics.sensor_id, SensorStatistics.last_data, SensorStatistics.last_valid_data)
+            .where(SensorStatistics.sensor_id.in_(sensor_ids), SensorStatistics.last_data.is_not(None))
+        )
+        return {sensor_id: (last_data, last_valid_data) for sensor_id, last_data, last_valid_data in rows}
+
+    def get_sensor_stations(self, sensor_ids: List[int]) -> Dict[int, int]:
+        """
+        Zwraca identyfikatory stacji zapisanych czujników.
+
+        Zwraca:
+            dict[int, int]: Identyfikator czujnika (id_stanowiska) -> identyfikator stacji.
+        """
+        if not sensor_ids:
+            return {}
+        return dict(db.session.execute(
+            select(Sensor.id_stanowiska, Sensor.id_stacji).where(Sensor.id_stanowiska.in_(sensor_ids))
+        ).tuples().all())
+
+    def save_measurement(self, station_data: StationData, sensors_data: SensorData,
+                         measurement_data: List[MeasurementData], sensor_id: int,
+                         station_index_data: StationIndexData, station_id: int) -> int:
         """
         1. Sprawdza czy istnieje stacja — jeżeli nie, dodaje.
         2. Sprawdza czy istnieje sensor — jeżeli nie, dodaje.
-        3. Zapisuje pomiar powiązany z sensorem.
+        3. Zapisuje pomiary powiązane z sensorem (jednym poleceniem, z pominięciem duplikatów).
         4. Zapisuje pomiar_aqi powiązany ze stacją.
+
+        Zwraca:
+            int: Liczba nowo zapisanych pomiarów.
         """
         # 1. Stacja
         self.get_or_create_station(station_data)
@@ -70,33 +379,115 @@ class DataService:
         self.get_or_create_sensor(sensors_data, station_data)
 
         # 3. Measurement
-        measurements_db = self.get_measurements_list_from_db(sensor_id)
-
-        for measurement in measurement_data:
-            if measurement not in measurements_db:
-                measurement.sensor_id = sensor_id
-                db.session.add(measurement)
+        inserted = self._insert_measurements([
+            {
+                "sensor_id": sensor_id,
+                "kod_stanowiska": m.kod_stanowiska,
+                "data": m.data,
+                "wartosc": m.wartosc
+            } for m in measurement_data
+        ])
 
         # 4. AQI
-        station_indexes_db = self.get_station_index_list_from_db(station_id)
-
-        if station_index_data.calculation_date not in station_indexes_db:
-            db.session.add(station_index_data)
+        if station_index_data:
+            exists = StationIndex.query.filter_by(
+                station_id=station_id,
+                calculation_date=station_index_data.calculation_date
+            ).first()
+            if exists is None:
+                db.session.add(to_model(station_index_data))
 
         db.session.commit()
 
-        return measurement
+        return len(inserted)
+
+    def save_bulk(self, stations: List[StationData], sensors: List[SensorData],
+                  measurements: Dict[int, List[MeasurementData]], station_indexes: List[StationIndexData]) -> int:
+        """
+        Zapisuje w jednej transakcji paczkę danych pobranych z API.
+
+        Stacje i czujniki dodawane są tylko wtedy, gdy jeszcze nie istnieją,
+        a pomiary i indeksy AQI - tylko te, których nie ma w bazie. Obiekty DTO
+        z Downloadera zamieniane są na modele dopiero tutaj (`to_model`).
+
+        Argumenty:
+            stations (list[StationData]): Stacje.
+            sensors (list[SensorData]): Czujniki stacji.
+            measurements (dict[int, list[MeasurementData]]): Pomiary według identyfikatora czujnika.
+            station_indexes (list[StationIndexData]): Indeksy AQI stacji.
+
+        Zwraca:
+            int: Liczba nowo zapisanych pomiarów.
+        """
+        # 1. Stacje (z gminami i miastami)
+        self.save_stations(stations)
+
+        # 2. Sensory
+        sensor_ids = [s.id_stanowiska for s in sensors]
+        existing_sensors = set(db.session.scalars(
+            select(Sensor.id_stanowiska).where(Sensor.id_stanowiska.in_(sensor_ids))
+        ))
+        for sensor in sensors:
+            if sensor.id_stanowiska not in existing_sensors:
+                db.session.add(to_model(sensor))
+                existing_sensors.add(sensor.id_stanowiska)
+
+        # 3. Pomiary
+        inserted = self._insert_measurements([
+            {
+                "sensor_id": sensor_id,
+                "kod_stanowiska": m.kod_stanowiska,
+                "data": m.data,
+                "wartosc": m.wartosc
+            } for sensor_id, items in measurements.items() for m in items
+        ])
+
+        # 4. AQI
+        index_keys = [(i.station_id, i.calculation_date) for i in station_indexes]
+        existing_indexes = set()
+        if index_keys:
+            existing_indexes = set(db.session.execute(
+                select(StationIndex.station_id, StationIndex.calculation_date)
+                .where(tuple_(StationIndex.station_id, StationIndex.calculation_date).in_(index_keys))
+            ).tuples())
+        for station_index in station_indexes:
+            key = (station_index.station_id, station_index.calculation_date)
+            if key not in existing_indexes:
+                existing_indexes.add(key)
+                db.session.add(to_model(station_index))
+
+        db.session.commit()
+        return len(inserted)
 
     def get_stations_list_from_db(self):
         """
             Pobiera listę wszystkich stacji pomiarowych z bazy danych.
 
+            Miasto i gmina każdej stacji ładowane są tym samym zapytaniem (JOIN),
+            więc odczyt `station.city.gmina` nie wykonuje kolejnych zapytań.
+
             Zwraca:
                 list[Station]: Lista obiektów Station.
         """
-        stations = Station.query.all()
+        stations = Station.query.options(joinedload(Station.city).joinedload(City.gmina)).all()
         return stations
 
+    def get_station(self, station_id: int):
+        """
+        Pobiera jedną stację po kluczu głównym, razem z miastem, gminą i czujnikami
+        (dwa zapytania niezależnie od liczby czujników).
+
+        Argumenty:
+            station_id (int): Identyfikator stacji.
+
+        Zwraca:
+            Station | None: Stacja lub None, jeśli nie ma jej w bazie.
+        """
+        return db.session.get(Station, station_id, options=[
+            joinedload(Station.city).joinedload(City.gmina),
+            selectinload(Station.sensors)
+        ])
+
     def get_sensors_list_from_db(self, sensors_id: int):
         """
         Pobiera listę czujników przypisanych do konkretnej stacji.
@@ -123,6 +514,124 @@ class DataService:
         measurements = Measurement.query.filter_by(sensor_id=sensors_id).all()
         return measurements
 
+    def get_measurements_in_range(self, sensor_id: int, start: datetime = None, end: datetime = None,
+                                  limit: int = None, offset: int = None,
+                                  after: datetime = None, newest_first: bool = False) -> List[Measurement]:
+        """
+        Pobiera pomiary czujnika z zadanego przedziału czasu, posortowane po dacie.
+
+        Filtrowanie, sortowanie i stronicowanie wykonywane są w bazie
+        (z użyciem indeksu (sensor_id, data)).
+
+        Argumenty:
+            sensor_id (int): Identyfikator czujnika.
+            start (datetime | None): Początek przedziału (włącznie).
+            end (datetime | None): Koniec przedziału (wyłącznie).
+            limit (int | None): Maksymalna liczba zwróconych pomiarów.
+            offset (int | None): Liczba pominiętych pomiarów.
+            after (datetime | None): Stronicowanie kluczem - tylko pomiary późniejsze
+                niż podana data (data ostatniego pomiaru poprzedniej strony).
+            newest_first (bool): Sortowanie od najnowszych (np. ostatnie `limit` pomiarów).
+
+        Zwraca:
+            list[Measurement]: Lista obiektów Measurement z przedziału.
+        """
+        query = Measurement.query.filter(Measurement.sensor_id == sensor_id)
+        if start is not None:
+            query = query.filter(Measurement.data >= start)
+        if end is not None:
+            query = query.filter(Measurement.data < end)
+        if after is not None:
+            query = query.filter(Measurement.data > after)
+
+        query = query.order_by(Measurement.data.desc() if newest_first else Measurement.data)
+        if limit is not None:
+            query = query.limit(limit)
+        if offset:
+            query = query.offset(offset)
+        return query.all()
+
+    def get_time_series(self, sensor_id: int, start: datetime = None, end: datetime = None) -> TimeSeries:
+        """
+        Pobiera pomiary czujnika z zadanego przedziału jako kolumnową serię `TimeSeries`.
+
+        Zapytanie Core odczytuje tylko kolumny (data, wartosc), bez tworzenia
+        obiektów Measurement - do analizy (CalculationService) i wykresów.
+
+        Argumenty:
+            sensor_id (int): Identyfikator czujnika.
+            start (datetime | None): Początek przedziału (włącznie).
+            end (datetime | None): Koniec przedziału (wyłącznie).
+
+        Zwraca:
+            TimeSeries: Seria posortowana po dacie.
+        """
+        query = select(Measurement.data, Measurement.wartosc).where(Measurement.sensor_id == sensor_id)
+        if start is not None:
+            query = query.where(Measurement.data >= start)
+        if end is not None:
+            query = query.where(Measurement.data < end)
+
+        return TimeSeries.from_rows(db.session.execute(query.order_by(Measurement.data)).tuples())
+
+    @staticmethod
+    def choose_resolution(start: datetime, end: datetime, min_points: int = DEFAULT_MIN_POINTS) -> str:
+        """
+        Wybiera najgrubszą rozdzielczość, która dla przedziału [start, end)
+        daje co najmniej `min_points` punktów (w ostateczności "hour").
+        """
+        span = end - start
+        for resolution in reversed(RESOLUTIONS):
+            if span / RESOLUTION_STEPS[resolution] >= min_points:
+                return resolution
+        return RESOLUTIONS[0]
+
+    def get_series(self, sensor_id: int, start: datetime = None, end: datetime = None,
+                   min_points: int = DEFAULT_MIN_POINTS) -> list:
+        """
+        Pobiera szereg czasowy czujnika do wykresu z agregatów MeasurementRollup.
+
+        Rozdzielczość dobierana jest automatycznie (`choose_resolution`), np. dla
+        zakresu rocznego odczytywanych jest ok. 365 agregatów dobowych zamiast
+        ok. 8760 pomiarów godzinowych.
+
+        Argumenty:
+            sensor_id (int): Identyfikator czujnika.
+            start (datetime | None): Początek przedziału (domyślnie pierwszy pomiar czujnika).
+            end (datetime | None): Koniec przedziału, wyłącznie (domyślnie po ostatnim pomiarze).
+            min_points (int): Minimalna oczekiwana liczba punktów.
+
+        Zwraca:
+            list[Row]: Wiersze (data, wartosc, min, max, count) posortowane po dacie,
+            gdzie `data` to początek przedziału, a `wartosc` to średnia w przedziale.
+        """
+        if start is None or end is None:
+            statistics = self.get_sensor_statistics(sensor_id)
+            if statistics is None or statistics.first_data is None:
+                return []
+            start = start or statistics.first_data
+            end = end or statistics.last_data + timedelta(hours=1)
+
+        resolution = self.choose_resolution(start, end, min_points)
+
+        query = (
+            select(
+                MeasurementRollup.bucket.label("data"),
+                (MeasurementRollup.total / MeasurementRollup.count).label("wartosc"),
+                MeasurementRollup.min,
+                MeasurementRollup.max,
+                MeasurementRollup.count
+            )
+            .where(
+                MeasurementRollup.sensor_id == sensor_id,
+                MeasurementRollup.resolution == resolution,
+                MeasurementRollup.bucket >= bucket_start(start, resolution),
+                MeasurementRollup.bucket < end
+            )
+            .order_by(MeasurementRollup.bucket)
+        )
+        return db.session.execute(query).all()
+
     def get_station_index_list_from_db(self, station_id: int):
         """
         Pobiera listę wszystkich indeksów stacji pomiarowych z bazy danych.
@@ -133,4 +642,41 @@ class DataService:
         station_indexes = StationIndex.query.filter_by(station_id=station_id).all()
         return station_indexes
 
+    def get_station_index_in_range(self, station_id: int, start: datetime = None, end: datetime = None,
+                                   limit: int = None, after: datetime = None) -> List[StationIndex]:
+        """
+        Pobiera indeksy AQI stacji z zadanego przedziału czasu, posortowane po dacie obliczenia.
+
+        Argumenty:
+            station_id (int): Identyfikator stacji.
+            start (datetime | None): Początek przedziału (włącznie).
+            end (datetime | None): Koniec przedziału (wyłącznie).
+            limit (int | None): Maksymalna liczba zwróconych indeksów.
+            after (datetime | None): Stronicowanie kluczem - tylko indeksy późniejsze niż podana data.
+
+        Zwraca:
+            list[StationIndex]: Lista obiektów StationIndex z przedziału.
+        """
+        query = StationIndex.query.filter(StationIndex.station_id == station_id)
+        if start is not None:
+            query = query.filter(StationIndex.calculation_date >= start)
+        if end is not None:
+            query = query.filter(StationIndex.calculation_date < end)
+        if after is not None:
+            query = query.filter(StationIndex.calculation_date > after)
 
+        query = query.order_by(StationIndex.calculation_date)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+
+    def get_station_index_version(self, station_id: int) -> tuple:
+        """
+        Zwraca wersję danych AQI stacji: (liczba indeksów, data najnowszego indeksu).
+
+        Zmienia się przy każdym zapisie nowego indeksu, więc nadaje się do ETag.
+        """
+        return tuple(db.session.execute(
+            select(func.count(StationIndex.id), func.max(StationIndex.calculation_date))
+            .where(StationIndex.station_id == station_id)
+        ).one())
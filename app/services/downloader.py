@@ -1,87 +1,257 @@
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import requests
-from typing import Dict, List
-from app.models import Gmina, City, Station
-from app.models.sensor import Sensor
-from app.models.measurement import Measurement
-from app.models.station_index import StationIndex
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+from app.services.http_cache import HttpCache, get_http_cache
+from app.services.http_client import get_session, get_timeout, request_slot
+from app.services.station_catalog import StationCatalog
+from app.models.dto import GminaData, CityData, StationData, SensorData, MeasurementData, StationIndexData
+
+
+# stronicowanie list w API GIOŚ: rozmiar strony (maksymalnie 500)
+# i liczba stron pobieranych jednocześnie po odczytaniu pierwszej
+DEFAULT_PAGE_SIZE = 500
+DEFAULT_PAGE_WORKERS = 4
+
+_page_size = DEFAULT_PAGE_SIZE
+_page_workers = DEFAULT_PAGE_WORKERS
+_page_pool: Optional[ThreadPoolExecutor] = None
+_page_pool_lock = threading.Lock()
+
+
+def configure_paging(page_size: int = DEFAULT_PAGE_SIZE, max_workers: int = DEFAULT_PAGE_WORKERS):
+    """Ustawia rozmiar strony i liczbę równolegle pobieranych stron list API GIOŚ."""
+    global _page_size, _page_workers, _page_pool
+    with _page_pool_lock:
+        _page_size = page_size
+        if max_workers != _page_workers and _page_pool is not None:
+            _page_pool.shutdown(wait=False)
+            _page_pool = None
+        _page_workers = max_workers
+
+
+def get_page_pool() -> ThreadPoolExecutor:
+    """
+    Zwraca pulę wątków pobierających dalsze strony list, wspólną dla całego procesu.
+
+    Liczba jednocześnie pobieranych stron nie rośnie z liczbą wątków wywołujących
+    (np. `SYNC_WORKERS`), a zadania puli nie zlecają kolejnych zadań, więc nie
+    może dojść do zakleszczenia.
+    """
+    global _page_pool
+    if _page_pool is None:
+        with _page_pool_lock:
+            if _page_pool is None:
+                _page_pool = ThreadPoolExecutor(max_workers=_page_workers, thread_name_prefix="gios-page")
+    return _page_pool
+
+
+def parse_gios_datetime(value):
+    """Zamienia datę z API GIOŚ ("2025-08-27 12:00:00" lub "2025-08-27") na datetime"""
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value)
 
 
 class Downloader:
-    def __init__(self, base_url: str):
+    """
+    Klient API GIOŚ.
+
+    Odpowiedzi zamieniane są na lekkie, niemutowalne obiekty DTO (`StationData`,
+    `SensorData`, `MeasurementData`, `StationIndexData`) zamiast modeli SQLAlchemy -
+    większość z nich jest tylko wyświetlana. Na modele zamienia je dopiero
+    `DataService` przy zapisie do bazy.
+
+    Odpowiedzi zapisywane są w dyskowym cache `HttpCache` (domyślnie
+    skonfigurowanym przez `configure_http_cache`): świeże wpisy nie wymagają
+    zapytania, a nieświeże są rewalidowane nagłówkami ETag / Last-Modified.
+
+    Listy (stacje, czujniki, pomiary) są stronicowane: po pierwszej stronie
+    (z liczbą stron `totalPages`) pozostałe strony pobierane są równolegle
+    we wspólnej puli (`get_page_pool`), a ich elementy przetwarzane po kolei.
+
+    Każde zapytanie HTTP (również o kolejne strony) wywołuje najpierw `acquire`
+    (np. `TokenBucket.acquire`) i zajmuje miejsce `request_slot`; odpowiedzi
+    z cache nie zużywają limitu.
+
+    Błędy API są domyślnie wypisywane, a metody zwracają pusty wynik; przy
+    `raise_errors=True` wyjątek `RequestException` jest przekazywany wywołującemu
+    (np. żeby harmonogram mógł liczyć nieudane zapytania).
+    """
+
+    def __init__(self, base_url: str, session: requests.Session = None, timeout=None, cache: HttpCache = None,
+                 page_size: int = None, raise_errors: bool = False, acquire: Callable[[], None] = None):
         self.base_url = base_url
-        self.stations_dict: Dict[int, Station] = {}
-        self.sensors_dict: Dict[int, Sensor] = {}
+        self.session = session or get_session()
+        self.timeout = timeout or get_timeout()
+        self.cache = cache if cache is not None else get_http_cache()
+        self.page_size = page_size or _page_size
+        self.raise_errors = raise_errors
+        self.acquire = acquire
+        self.stations_dict: Dict[int, StationData] = {}
+        self.sensors_dict: Dict[int, SensorData] = {}
         self.stations_list = []
 
-    def fetch_station_index(self, station_id, endpoint: str = "aqindex/getIndex") -> StationIndex:
+    def _request(self, url: str, headers: Dict[str, str] = None) -> requests.Response:
+        """Wykonuje zapytanie GET przez współdzieloną sesję (po `acquire`, w ramach `request_slot`)."""
+        if self.acquire is not None:
+            self.acquire()
+        with request_slot():
+            if headers:
+                return self.session.get(url, timeout=self.timeout, headers=headers)
+            return self.session.get(url, timeout=self.timeout)
+
+    def _get_json(self, url: str, cache_mode: str = "default"):
+        """
+        Wykonuje zapytanie GET i zwraca zdekodowany JSON.
+
+        Przy włączonym cache (`cache_mode`):
+            - "default": świeża odpowiedź zwracana jest z dysku, a nieświeża
+              rewalidowana zapytaniem warunkowym (przy 304 używana jest zapisana treść),
+            - "revalidate": zapytanie warunkowe nawet dla świeżego wpisu,
+            - "reload": zapytanie bez użycia zapisanej odpowiedzi (wynik jest zapisywany).
+        """
+        if self.cache is None:
+            response = self._request(url)
+            response.raise_for_status()
+            return response.json()
+
+        cached = self.cache.get(url) if cache_mode != "reload" else None
+        if cached is not None and cache_mode == "default" and self.cache.is_fresh(cached):
+            return cached.json()
+
+        response = self._request(url, cached.validators() if cached is not None else None)
+        if response.status_code == 304 and cached is not None:
+            self.cache.touch(url)
+            return cached.json()
+
+        response.raise_for_status()
+        data = response.json()
+        self.cache.set(url, response.content, etag=response.headers.get("ETag"),
+                       last_modified=response.headers.get("Last-Modified"))
+        return data
+
+    def _page_url(self, url: str, page: int) -> str:
+        separator = "&" if "?" in url else "?"
+        return f"{url}{separator}page={page}&size={self.page_size}"
+
+    def _cached_pages(self, url: str) -> Optional[list]:
+        """
+        Zwraca wszystkie strony listy z cache, o ile każda z nich jest świeża;
+        w przeciwnym razie None (strony muszą pochodzić z jednego odczytu API).
+        """
+        first = self.cache.get(self._page_url(url, 0))
+        if first is None or not self.cache.is_fresh(first):
+            return None
+
+        pages = [first]
+        for page in range(1, first.json().get("totalPages") or 1):
+            cached = self.cache.get(self._page_url(url, page))
+            if cached is None or not self.cache.is_fresh(cached):
+                return None
+            pages.append(cached)
+        return [cached.json() for cached in pages]
+
+    def _iter_items(self, url: str, key: str) -> Iterator[dict]:
+        """
+        Zwraca kolejne elementy listy `key` ze wszystkich stron odpowiedzi.
+
+        Pierwsza strona określa liczbę stron (`totalPages`); pozostałe pobierane
+        są równolegle, a ich elementy zwracane w kolejności stron, gdy tylko
+        dana strona jest dostępna.
+
+        Wszystkie strony pochodzą z jednego stanu listy (pomiary przesuwają się
+        między stronami co godzinę): albo wszystkie są świeże w cache, albo
+        pierwsza strona jest rewalidowana, a pozostałe pobierane bez cache.
+        """
+        page_mode = "default"
+        if self.cache is not None:
+            pages = self._cached_pages(url)
+            if pages is not None:
+                for raw_data in pages:
+                    yield from raw_data.get(key) or []
+                return
+            page_mode = "reload"
+
+        first = self._get_json(self._page_url(url, 0), cache_mode="revalidate")
+        yield from first.get(key) or []
+
+        total_pages = first.get("totalPages") or 1
+        if total_pages <= 1:
+            return
+
+        futures = [
+            get_page_pool().submit(self._get_json, self._page_url(url, page), page_mode)
+            for page in range(1, total_pages)
+        ]
+        try:
+            for future in futures:
+                yield from future.result().get(key) or []
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def fetch_station_index(self, station_id, endpoint: str = "aqindex/getIndex") -> StationIndexData:
         """Pobiera dane pomiarowe wskazanego stanowiska pomiarowego"""
 
         url = self.base_url.rstrip("/") + "/" + endpoint.lstrip("/") + "/" + station_id.lstrip("/")
         try:
-            response = requests.get(url)
-            response.raise_for_status()
-            raw_data = response.json()
+            raw_data = self._get_json(url)
 
             sensors_data = raw_data.get("AqIndex")
             print(sensors_data)
 
-            aqi = StationIndex(
+            aqi = StationIndexData(
                 station_id=sensors_data["Identyfikator stacji pomiarowej"],
-                calculation_date=sensors_data["Data wykonania obliczeń indeksu"],
+                calculation_date=parse_gios_datetime(sensors_data["Data wykonania obliczeń indeksu"]),
                 index_value=sensors_data["Wartość indeksu"],
                 index_category=sensors_data["Nazwa kategorii indeksu"],
                 calculation_date_st=sensors_data["Data danych źródłowych, z których policzono wartość indeksu dla wskaźnika st"],
             )
 
         except requests.exceptions.RequestException as e:
+            if self.raise_errors:
+                raise
             print(f"Błąd pobierania danych: {e}")
             return {}
 
         return aqi
 
 
-    def fetch_measurement(self, station_id, endpoint: str = "data/getData") -> List[Station]:
+    def fetch_measurement(self, station_id, endpoint: str = "data/getData") -> List[MeasurementData]:
         """Pobiera dane pomiarowe wskazanego stanowiska pomiarowego"""
 
         url = self.base_url.rstrip("/") + "/" + endpoint.lstrip("/") + "/" + station_id.lstrip("/")
         try:
-            response = requests.get(url)
-            response.raise_for_status()
-            raw_data = response.json()
-
-            sensors_data = raw_data.get("Lista danych pomiarowych")
-
             measurements = []
 
-            for item in sensors_data:
-                measurement = Measurement(
+            for item in self._iter_items(url, "Lista danych pomiarowych"):
+                measurement = MeasurementData(
                     kod_stanowiska=item["Kod stanowiska"],
-                    data=item["Data"],
+                    data=parse_gios_datetime(item["Data"]),
                     wartosc=item["Wartość"]
                 )
                 measurements.append(measurement)
 
         except requests.exceptions.RequestException as e:
+            if self.raise_errors:
+                raise
             print(f"Błąd pobierania danych: {e}")
             return {}
 
         return measurements
 
-    def fetch_station_sensors_list(self, station_id, endpoint: str = "station/sensors") -> List[Sensor]:
-        """Pobiera informacje na temat sensorów w danej stacji na podstawie id {id: Station}"""
+    def fetch_station_sensors_list(self, station_id, endpoint: str = "station/sensors") -> List[SensorData]:
+        """Pobiera informacje na temat sensorów w danej stacji na podstawie id {id: SensorData}"""
 
         url = self.base_url.rstrip("/") + "/" + endpoint.lstrip("/") + "/" + station_id.lstrip("/")
 
         try:
-            response = requests.get(url)
-            response.raise_for_status()
-            raw_data = response.json()
-
-            sensors_data = raw_data.get("Lista stanowisk pomiarowych dla podanej stacji")
-
-            sensors: List[Sensor] = []
-            for item in sensors_data:
-                sensor = Sensor(
+            sensors: List[SensorData] = []
+            for item in self._iter_items(url, "Lista stanowisk pomiarowych dla podanej stacji"):
+                sensor = SensorData(
                     id_stanowiska=item["Identyfikator stanowiska"],
                     id_stacji=item["Identyfikator stacji"],
                     wskaznik=item["Wskaźnik"],
@@ -92,27 +262,23 @@ class Downloader:
                 sensors.append(sensor)
 
         except requests.exceptions.RequestException as e:
+            if self.raise_errors:
+                raise
             print(f"Błąd pobierania danych: {e}")
             return {}
 
         return sensors
 
-    def fetch_station_sensors_dict(self, station_id, endpoint: str = "station/sensors") -> Dict[int, Station]:
-        """Pobiera informacje na temat sensorów w danej stacji na podstawie id {id: Station}"""
+    def fetch_station_sensors_dict(self, station_id, endpoint: str = "station/sensors") -> Dict[int, SensorData]:
+        """Pobiera informacje na temat sensorów w danej stacji na podstawie id {id: SensorData}"""
 
         url = self.base_url.rstrip("/") + "/" + endpoint.lstrip("/") + "/" + station_id.lstrip("/")
 
         try:
-            response = requests.get(url)
-            response.raise_for_status()
-            raw_data = response.json()
-
-            sensors_data = raw_data.get("Lista stanowisk pomiarowych dla podanej stacji")
-
             self.sensors_dict.clear()
 
-            for item in sensors_data:
-                sensor = Sensor(
+            for item in self._iter_items(url, "Lista stanowisk pomiarowych dla podanej stacji"):
+                sensor = SensorData(
                     id_stanowiska=item["Identyfikator stanowiska"],
                     id_stacji=item["Identyfikator stacji"],
                     wskaznik=item["Wskaźnik"],
@@ -123,137 +289,121 @@ class Downloader:
                 self.sensors_dict[sensor.id_stanowiska] = sensor
 
         except requests.exceptions.RequestException as e:
+            if self.raise_errors:
+                raise
             print(f"Błąd pobierania danych: {e}")
             return {}
 
         return self.sensors_dict
 
-    def fetch_stations_list(self, endpoint: str = "station/findAll") -> List[Station]:
-        """Pobiera listę stacji i zapisuje je w formie listy"""
-        url = self.base_url.rstrip("/") + "/" + endpoint.lstrip("/")
-        try:
-            response = requests.get(url)
-            response.raise_for_status()
-            raw_data = response.json()
-
-            stations = raw_data.get("Lista stacji pomiarowych")
-
-            for station in stations:
-
-                gmina = Gmina(
-                    gminaName=station["Gmina"],
-                    powiatName=station["Powiat"],
-                    wojewodztwoName=station["Województwo"]
+    def _parse_stations(self, stations: Iterable[dict]) -> List[StationData]:
+        """
+        Buduje obiekty StationData (wraz z CityData i GminaData) z surowych stacji z API
+        (listy lub strumienia elementów kolejnych stron).
+
+        Gminy (klucz: gmina, powiat, województwo) i miasta (klucz: identyfikator miasta)
+        są współdzielone - stacje z jednego miasta wskazują na ten sam obiekt CityData,
+        a nazwy powiatów i województw są internowane.
+        """
+        stations_list: List[StationData] = []
+        gminy: Dict[tuple, GminaData] = {}
+        cities: Dict[int, CityData] = {}
+
+        for station in stations:
+
+            gmina_key = (sys.intern(station["Gmina"]), sys.intern(station["Powiat"]),
+                         sys.intern(station["Województwo"]))
+            gmina = gminy.get(gmina_key)
+            if gmina is None:
+                gmina = gminy[gmina_key] = GminaData(
+                    gminaName=gmina_key[0],
+                    powiatName=gmina_key[1],
+                    wojewodztwoName=gmina_key[2]
                 )
 
-                city = City(
+            city = cities.get(station["Identyfikator miasta"])
+            if city is None:
+                city = cities[station["Identyfikator miasta"]] = CityData(
                     id=station["Identyfikator miasta"],
                     name=station["Nazwa miasta"],
                     gmina=gmina
                 )
 
-                station_obj = Station(
+            station_obj = StationData(
 
-                    id=station["Identyfikator stacji"],
-                    stationCode=station["Kod stacji"],
-                    stationName=station["Nazwa stacji"],
-                    gegrLat=station["WGS84 φ N"],
-                    gegrLon=station["WGS84 λ E"],
-                    city=city,
-                    addressStreet=station["Ulica"]
-                )
-                self.stations_list.append(station_obj)
+                id=station["Identyfikator stacji"],
+                stationCode=station["Kod stacji"],
+                stationName=station["Nazwa stacji"],
+                gegrLat=station["WGS84 φ N"],
+                gegrLon=station["WGS84 λ E"],
+                city=city,
+                addressStreet=station["Ulica"]
+            )
+            stations_list.append(station_obj)
 
-            return self.stations_list
+        return stations_list
+
+    def fetch_station_catalog(self, endpoint: str = "station/findAll") -> StationCatalog:
+        """Pobiera listę stacji raz i zwraca ją jako indeksowany StationCatalog"""
+        url = self.base_url.rstrip("/") + "/" + endpoint.lstrip("/")
+        try:
+            stations = self._iter_items(url, "Lista stacji pomiarowych")
+
+            return StationCatalog(self._parse_stations(stations))
 
         except requests.exceptions.RequestException as e:
+            if self.raise_errors:
+                raise
             print(f"Błąd pobierania danych: {e}")
-            return {}
+            return StationCatalog([])
 
-    def fetch_stations_list_by_city(self, city_name: str, endpoint: str = "station/findAll") -> List[Station]:
+    def fetch_stations_list(self, endpoint: str = "station/findAll") -> List[StationData]:
         """Pobiera listę stacji i zapisuje je w formie listy"""
         url = self.base_url.rstrip("/") + "/" + endpoint.lstrip("/")
         try:
-            response = requests.get(url)
-            response.raise_for_status()
-            raw_data = response.json()
-
-            stations = raw_data.get("Lista stacji pomiarowych")
-
-            for station in stations:
-
-                gmina = Gmina(
-                    gminaName=station["Gmina"],
-                    powiatName=station["Powiat"],
-                    wojewodztwoName=station["Województwo"]
-                )
+            stations = self._iter_items(url, "Lista stacji pomiarowych")
 
-                city = City(
-                    id=station["Identyfikator miasta"],
-                    name=station["Nazwa miasta"],
-                    gmina=gmina
-                )
+            self.stations_list.extend(self._parse_stations(stations))
 
-                station_obj = Station(
+            return self.stations_list
 
-                    id=station["Identyfikator stacji"],
-                    stationCode=station["Kod stacji"],
-                    stationName=station["Nazwa stacji"],
-                    gegrLat=station["WGS84 φ N"],
-                    gegrLon=station["WGS84 λ E"],
-                    city=city,
-                    addressStreet=station["Ulica"]
-                )
+        except requests.exceptions.RequestException as e:
+            if self.raise_errors:
+                raise
+            print(f"Błąd pobierania danych: {e}")
+            return {}
 
-                if station_obj.city.name == city_name:
+    def fetch_stations_list_by_city(self, city_name: str, endpoint: str = "station/findAll") -> List[StationData]:
+        """Pobiera listę stacji z podanego miasta (bez rozróżniania wielkości liter i polskich znaków)"""
+        url = self.base_url.rstrip("/") + "/" + endpoint.lstrip("/")
+        try:
+            stations = self._iter_items(url, "Lista stacji pomiarowych")
 
-                    self.stations_list.append(station_obj)
+            catalog = StationCatalog(self._parse_stations(stations))
+            self.stations_list.extend(catalog.find_by_city(city_name))
 
             return self.stations_list
 
         except requests.exceptions.RequestException as e:
+            if self.raise_errors:
+                raise
             print(f"Błąd pobierania danych: {e}")
             return {}
 
-    def fetch_stations_dict(self, endpoint: str = "station/findAll") -> Dict[int, Station]:
-        """Pobiera listę stacji i zapisuje je w formie {id: Station}"""
+    def fetch_stations_dict(self, endpoint: str = "station/findAll") -> Dict[int, StationData]:
+        """Pobiera listę stacji i zapisuje je w formie {id: StationData}"""
         url = self.base_url.rstrip("/") + "/" + endpoint.lstrip("/")
         try:
-            response = requests.get(url)
-            response.raise_for_status()
-            raw_data = response.json()
-
-            stations = raw_data.get("Lista stacji pomiarowych")
+            stations = self._iter_items(url, "Lista stacji pomiarowych")
 
             self.stations_dict.clear()
-            for station in stations:
-
-                gmina = Gmina(
-                    gminaName=station["Gmina"],
-                    powiatName=station["Powiat"],
-                    wojewodztwoName=station["Województwo"]
-                )
-
-                city = City(
-                    id=station["Identyfikator miasta"],
-                    name=station["Nazwa miasta"],
-                    gmina=gmina
-                )
-
-                station_obj = Station(
-
-                    id=station["Identyfikator stacji"],
-                    stationCode=station["Kod stacji"],
-                    stationName=station["Nazwa stacji"],
-                    gegrLat=station["WGS84 φ N"],
-                    gegrLon=station["WGS84 λ E"],
-                    city=city,
-                    addressStreet=station["Ulica"]
-                )
+            for station_obj in self._parse_stations(stations):
                 self.stations_dict[station_obj.id] = station_obj
 
             return self.stations_dict
 
         except requests.exceptions.RequestException as e:
+            if self.raise_errors:
+                raise
             print(f"Błąd pobierania danych: {e}")
             return {}
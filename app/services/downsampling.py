@@ -0,0 +1,51 @@
+import numpy as np
+
+
+def lttb_indices(x, y, max_points: int) -> np.ndarray:
+    """
+    Wybiera indeksy punktów serii metodą Largest-Triangle-Three-Buckets (LTTB).
+
+    Pierwszy i ostatni punkt są zawsze zachowane, a pozostałe punkty dzielone są
+    na `max_points - 2` przedziałów. Z każdego przedziału wybierany jest punkt
+    tworzący największy trójkąt z punktem wybranym w poprzednim przedziale
+    i średnią następnego, dzięki czemu zachowane zostają lokalne szczyty
+    (np. epizody smogowe). Średnie przedziałów i pola trójkątów liczone są
+    wektorowo w NumPy.
+
+    Argumenty:
+        x: Rosnące współrzędne osi X (np. czas w sekundach).
+        y: Wartości serii (bez braków danych).
+        max_points (int): Maksymalna liczba zwróconych punktów.
+
+    Zwraca:
+        np.ndarray: Posortowane indeksy wybranych punktów.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if max_points >= n or max_points < 3:
+        return np.arange(n)
+
+    n_buckets = max_points - 2
+    # granice przedziałów w zakresie [1, n - 1); punkt 0 i n - 1 są zawsze wybrane
+    edges = np.linspace(1, n - 1, n_buckets + 1).astype(np.int64)
+    counts = np.diff(edges)
+    avg_x = np.add.reduceat(x[:n - 1], edges[:-1]) / counts
+    avg_y = np.add.reduceat(y[:n - 1], edges[:-1]) / counts
+    # "następny przedział" dla ostatniego przedziału to ostatni punkt serii
+    next_x = np.append(avg_x[1:], x[-1])
+    next_y = np.append(avg_y[1:], y[-1])
+
+    indices = np.empty(max_points, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    a = 0
+    for i in range(n_buckets):
+        start, stop = edges[i], edges[i + 1]
+        area = np.abs(
+            (x[a] - next_x[i]) * (y[start:stop] - y[a])
+            - (x[a] - x[start:stop]) * (next_y[i] - y[a])
+        )
+        a = start + int(np.argmax(area))
+        indices[i + 1] = a
+    return indices
+
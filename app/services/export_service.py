@@ -0,0 +1,196 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Iterator
+from sqlalchemy import select
+from app import db
+from app.models.measurement import Measurement
+from app.models.sensor import Sensor
+from app.models.station import Station
+from app.models.city import City
+from app.models.gmina import Gmina
+from app.services.text_utils import fold_text
+
+# kolumny eksportu w kolejności zapisu
+EXPORT_COLUMNS = ("sensor_id", "station_id", "wskaznik_kod", "kod_stanowiska", "data", "wartosc")
+
+# format -> (typ MIME, rozszerzenie pliku)
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+class ExportService:
+    """
+    Strumieniowy eksport zarchiwizowanych pomiarów (CSV, NDJSON, Parquet).
+
+    Pomiary odczytywane są kursorem po stronie serwera (`yield_per`), paczkami
+    po `chunk_size` wierszy, a każdy format jest generatorem fragmentów pliku -
+    zużycie pamięci nie zależy od wielkości eksportu.
+
+    Argumenty:
+        chunk_size (int): Liczba wierszy odczytywanych z bazy i zapisywanych naraz.
+    """
+
+    def __init__(self, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+
+    @staticmethod
+    def _matching_names(column, name: str) -> list:
+        # porównanie bez wielkości liter i znaków diakrytycznych, których SQLite nie obsługuje w lower()
+        folded = fold_text(name)
+        return [n for n in db.session.scalars(select(column).distinct()) if fold_text(n) == folded]
+
+    def build_query(self, sensor_id: int = None, station_id: int = None, wojewodztwo: str = None,
+                    powiat: str = None, start: datetime = None, end: datetime = None):
+        """
+        Buduje zapytanie o pomiary spełniające filtry, posortowane po czujniku i dacie.
+
+        Argumenty:
+            sensor_id (int | None): Identyfikator czujnika (id_stanowiska).
+            station_id (int | None): Identyfikator stacji.
+            wojewodztwo (str | None): Nazwa województwa (np. "łódzkie").
+            powiat (str | None): Nazwa powiatu.
+            start (datetime | None): Początek przedziału (włącznie).
+            end (datetime | None): Koniec przedziału (wyłącznie).
+        """
+        query = (
+            select(
+                Measurement.sensor_id,
+                Sensor.id_stacji.label("station_id"),
+                Sensor.wskaznik_kod,
+                Measurement.kod_stanowiska,
+                Measurement.data,
+                Measurement.wartosc
+            )
+            .outerjoin(Sensor, Sensor.id_stanowiska == Measurement.sensor_id)
+        )
+
+        if sensor_id is not None:
+            query = query.where(Measurement.sensor_id == sensor_id)
+        if station_id is not None:
+            query = query.where(Sensor.id_stacji == station_id)
+        if wojewodztwo or powiat:
+            query = query.join(Station, Station.id == Sensor.id_stacji).join(City).join(Gmina)
+            if wojewodztwo:
+                query = query.where(Gmina.wojewodztwoName.in_(self._matching_names(Gmina.wojewodztwoName, wojewodztwo)))
+            if powiat:
+                query = query.where(Gmina.powiatName.in_(self._matching_names(Gmina.powiatName, powiat)))
+        if start is not None:
+            query = query.where(Measurement.data >= start)
+        if end is not None:
+            query = query.where(Measurement.data < end)
+
+        return query.order_by(Measurement.sensor_id, Measurement.data)
+
+    def iter_chunks(self, query) -> Iterator[list]:
+        """Zwraca kolejne paczki wierszy z kursora po stronie serwera."""
+        result = db.session.execute(query.execution_options(yield_per=self.chunk_size))
+        for chunk in result.partitions():
+            yield chunk
+
+    # -------------------------------
+    # Formaty
+    # -------------------------------
+    def to_csv(self, query) -> Iterator[str]:
+        """CSV z nagłówkiem; daty w formacie ISO 8601."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_COLUMNS)
+        for chunk in self.iter_chunks(query):
+            for row in chunk:
+                writer.writerow((row.sensor_id, row.station_id, row.wskaznik_kod, row.kod_stanowiska,
+                                 row.data.isoformat(), row.wartosc))
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        yield buffer.getvalue()
+
+    def to_ndjson(self, query) -> Iterator[str]:
+        """Jeden obiekt JSON na wiersz."""
+        for chunk in self.iter_chunks(query):
+            yield "".join(
+                json.dumps({
+                    "sensor_id": row.sensor_id,
+                    "station_id": row.station_id,
+                    "wskaznik_kod": row.wskaznik_kod,
+                    "kod_stanowiska": row.kod_stanowiska,
+                    "data": row.data.isoformat(),
+                    "wartosc": row.wartosc
+                }, ensure_ascii=False) + "\n"
+                for row in chunk
+            )
+
+    def to_parquet(self, query) -> Iterator[bytes]:
+        """
+        Parquet (kolumnowy) - każda paczka wierszy zapisywana jest jako osobna grupa wierszy.
+
+        Wymaga opcjonalnego pakietu `pyarrow`.
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Eksport do Parquet wymaga pakietu pyarrow (pip install pyarrow)")
+
+        schema = pa.schema([
+            ("sensor_id", pa.int64()),
+            ("station_id", pa.int64()),
+            ("wskaznik_kod", pa.string()),
+            ("kod_stanowiska", pa.string()),
+            ("data", pa.timestamp("s")),
+            ("wartosc", pa.float64()),
+        ])
+        sink = _ChunkSink()
+        with pq.ParquetWriter(sink, schema) as writer:
+            for chunk in self.iter_chunks(query):
+                columns = list(zip(*chunk))
+                writer.write_table(pa.Table.from_arrays(
+                    [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+                    schema=schema
+                ))
+                yield sink.drain()
+        yield sink.drain()
+
+    def export(self, fmt: str, **filters) -> Iterator:
+        """
+        Zwraca generator fragmentów pliku eksportu w podanym formacie.
+
+        Argumenty:
+            fmt (str): "csv", "ndjson" lub "parquet".
+            **filters: Filtry przekazywane do `build_query`.
+        """
+        writers = {"csv": self.to_csv, "ndjson": self.to_ndjson, "parquet": self.to_parquet}
+        if fmt not in writers:
+            raise ValueError(f"Nieznany format eksportu: {fmt}")
+        return writers[fmt](self.build_query(**filters))
+
+
+class _ChunkSink(io.RawIOBase):
+    """Plik tylko do zapisu, z którego zapisane bajty można odbierać fragmentami."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
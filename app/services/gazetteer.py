@@ -0,0 +1,184 @@
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+from app.models.dto import StationData
+from app.services.cache import TTLCache
+from app.services.data_service import DataService
+from app.services.geocoding import Coords, Geocoder
+from app.services.text_utils import fold_text
+
+# kolejność rodzajów miejsc w podpowiedziach (od najważniejszego)
+PLACE_KINDS = ("city", "gmina", "powiat", "station")
+
+
+@dataclass(frozen=True)
+class Place:
+    """
+    Miejsce w gazeterze: miasto, gmina, powiat lub stacja wraz ze współrzędnymi.
+
+    Dla miast, gmin i powiatów współrzędne to środek (średnia) położenia ich stacji.
+    """
+    name: str
+    kind: str
+    lat: float
+    lon: float
+    station_count: int = 1
+
+    @property
+    def coords(self) -> Coords:
+        return self.lat, self.lon
+
+
+class _TrieNode:
+    __slots__ = ("children", "places")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.places: List[int] = []  # indeksy miejsc, których klucz zaczyna się od tej ścieżki
+
+
+class Gazetteer:
+    """
+    Indeks prefiksowy (trie) nazw miejsc do podpowiedzi i geokodowania bez sieci.
+
+    Kluczami są nazwy po `fold_text` (bez wielkości liter i polskich znaków) - cała
+    nazwa oraz każdy jej kolejny wyraz, więc "niepodl" znajdzie stację
+    "Warszawa, al. Niepodległości". Każdy węzeł trie przechowuje posortowaną listę
+    pasujących miejsc, dzięki czemu zapytanie to przejście po `len(prefix)` węzłach.
+
+    Argumenty:
+        places (list[Place]): Miejsca do zaindeksowania.
+    """
+
+    def __init__(self, places: Iterable[Place]):
+        # kolejność miejsc = ranking podpowiedzi: rodzaj, liczba stacji, długość nazwy
+        self.places = sorted(places, key=lambda p: (PLACE_KINDS.index(p.kind), -p.station_count,
+                                                    len(p.name), p.name))
+        self._root = _TrieNode()
+        self._exact: Dict[str, List[int]] = defaultdict(list)
+
+        for i, place in enumerate(self.places):
+            folded = fold_text(place.name)
+            self._exact[folded].append(i)
+            for key in self._keys(folded):
+                node = self._root
+                for char in key:
+                    node = node.children.setdefault(char, _TrieNode())
+                    if not node.places or node.places[-1] != i:
+                        node.places.append(i)
+
+    @staticmethod
+    def _keys(folded: str) -> List[str]:
+        words = folded.replace(",", " ").replace("-", " ").split()
+        return [folded] + [" ".join(words[i:]) for i in range(1, len(words))]
+
+    def __len__(self):
+        return len(self.places)
+
+    @classmethod
+    def from_stations(cls, stations: Iterable[StationData]) -> "Gazetteer":
+        """
+        Buduje gazeter ze stacji (z powiązanymi miastem i gminą) - StationData
+        lub modeli Station z bazy, które mają te same pola.
+        """
+        groups = defaultdict(list)  # (rodzaj, nazwa po fold_text) -> [(nazwa, lat, lon)]
+        for station in stations:
+            try:
+                lat, lon = float(station.gegrLat), float(station.gegrLon)
+            except (TypeError, ValueError):
+                continue
+
+            names = [("station", station.stationName)]
+            city = station.city
+            if city is not None:
+                names.append(("city", city.name))
+                if city.gmina is not None:
+                    names.append(("gmina", city.gmina.gminaName))
+                    names.append(("powiat", city.gmina.powiatName))
+            for kind, name in names:
+                if name:
+                    groups[(kind, fold_text(name))].append((name, lat, lon))
+
+        places = []
+        for (kind, _), items in groups.items():
+            places.append(Place(
+                name=items[0][0],
+                kind=kind,
+                lat=sum(item[1] for item in items) / len(items),
+                lon=sum(item[2] for item in items) / len(items),
+                station_count=len(items)
+            ))
+        return cls(places)
+
+    def complete(self, prefix: str, limit: int = 10, kinds: Iterable[str] = None) -> List[Place]:
+        """
+        Zwraca miejsca pasujące do początku nazwy (lub wyrazu nazwy).
+
+        Dokładne dopasowania są na początku, dalej kolejność wg rodzaju
+        (miasto, gmina, powiat, stacja) i liczby stacji.
+        """
+        folded = fold_text(prefix)
+        if not folded:
+            return []
+
+        node = self._root
+        for char in folded:
+            node = node.children.get(char)
+            if node is None:
+                return []
+
+        kinds = set(kinds) if kinds else None
+        exact = [i for i in self._exact.get(folded, []) if kinds is None or self.places[i].kind in kinds]
+        result = list(exact)
+        for i in node.places:
+            if len(result) >= limit:
+                break
+            if i not in exact and (kinds is None or self.places[i].kind in kinds):
+                result.append(i)
+        return [self.places[i] for i in result[:limit]]
+
+    def lookup(self, name: str, kinds: Iterable[str] = None) -> Optional[Place]:
+        """Zwraca najlepiej pasujące miejsce (dokładna nazwa, a w drugiej kolejności prefiks) lub None."""
+        found = self.complete(name, limit=1, kinds=kinds)
+        return found[0] if found else None
+
+
+class GazetteerGeocoder(Geocoder):
+    """
+    Geokodowanie bez sieci z gazetera lokalnych tabel (np. gdy Nominatim jest niedostępny).
+
+    Dla adresu "Łódź, ul. Piotrkowska 1" sprawdzana jest też sama część przed przecinkiem.
+    """
+
+    def geocode(self, query: str) -> Optional[Coords]:
+        gazetteer = get_gazetteer()
+        for candidate in (query, query.split(",")[0]):
+            place = gazetteer.lookup(candidate)
+            if place is not None:
+                return place.coords
+        return None
+
+
+# Gazeter budowany z bazy danych, przechowywany w pamięci procesu; po wygaśnięciu
+# budowany ponownie w bieżącym żądaniu (do zapytania potrzebny jest kontekst aplikacji).
+_gazetteer_cache = TTLCache(ttl=3600, maxsize=1, refresh_ahead=1.0)
+
+
+def configure_gazetteer(ttl: float = 3600):
+    """Ustawia czas życia gazetera w sekundach (po nim budowany jest od nowa z bazy)."""
+    _gazetteer_cache.ttl = ttl
+
+
+def invalidate_gazetteer():
+    """Usuwa gazeter z cache (np. po zapisaniu nowych stacji)."""
+    _gazetteer_cache.clear()
+
+
+def build_gazetteer() -> Gazetteer:
+    """Buduje gazeter z tabel stacji, miast i gmin (jedno zapytanie)."""
+    return Gazetteer.from_stations(DataService().get_stations_list_from_db())
+
+
+def get_gazetteer() -> Gazetteer:
+    """Zwraca gazeter z cache; wymaga kontekstu aplikacji Flask."""
+    return _gazetteer_cache.get_or_load("gazetteer", build_gazetteer)
@@ -0,0 +1,166 @@
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+import requests
+from app import db
+from app.models.geocode_cache import GeocodeCacheEntry
+from app.services.cache import TTLCache
+from app.services.data_service import DataService
+from app.services.text_utils import fold_text
+
+Coords = Tuple[float, float]
+
+NOMINATIM_URL = "https://nominatim.openstreetmap.org/search"
+DEFAULT_TIMEOUT = (3.05, 10)
+
+
+class Geocoder(ABC):
+    """
+    Interfejs geokodera: zamienia tekst (adres, nazwę miejscowości) na współrzędne.
+
+    Implementacje zwracają (lat, lon) albo None, gdy miejsce nie zostało znalezione,
+    a błędy komunikacji zgłaszają wyjątkiem `requests.RequestException`.
+    """
+
+    @abstractmethod
+    def geocode(self, query: str) -> Optional[Coords]:
+        ...
+
+
+class NominatimGeocoder(Geocoder):
+    """
+    Geokodowanie przez Nominatim (OpenStreetMap API).
+
+    Argumenty:
+        url (str): Adres usługi wyszukiwania.
+        timeout: Timeout zapytania (sekundy lub para connect, read).
+        user_agent (str): Nagłówek User-Agent wymagany przez Nominatim.
+    """
+
+    def __init__(self, url: str = NOMINATIM_URL, timeout=DEFAULT_TIMEOUT, user_agent: str = "stations-app"):
+        self.url = url
+        self.timeout = timeout
+        self.user_agent = user_agent
+
+    def geocode(self, query: str) -> Optional[Coords]:
+        params = {"q": query, "format": "json", "limit": 1}
+        resp = requests.get(self.url, params=params, headers={"User-Agent": self.user_agent}, timeout=self.timeout)
+        resp.raise_for_status()
+        data = resp.json()
+        if not data:
+            return None
+        return float(data[0]["lat"]), float(data[0]["lon"])
+
+
+class StaticGeocoder(Geocoder):
+    """
+    Geokoder ze stałego słownika miejsc (np. zamiennik Nominatim w testach).
+
+    Argumenty:
+        places (dict[str, tuple[float, float]]): Nazwa miejsca -> (lat, lon);
+            nazwy porównywane są po `fold_text`.
+    """
+
+    def __init__(self, places: Dict[str, Coords]):
+        self.places = {fold_text(name): coords for name, coords in places.items()}
+        self.calls = 0
+
+    def geocode(self, query: str) -> Optional[Coords]:
+        self.calls += 1
+        return self.places.get(fold_text(query))
+
+
+class FallbackGeocoder(Geocoder):
+    """
+    Geokoder łańcuchowy: gdy `primary` nie znajdzie miejsca lub jest niedostępny
+    (błąd sieci), pyta `fallback` (np. gazeter lokalnych tabel).
+    """
+
+    def __init__(self, primary: Geocoder, fallback: Geocoder):
+        self.primary = primary
+        self.fallback = fallback
+
+    def geocode(self, query: str) -> Optional[Coords]:
+        try:
+            coords = self.primary.geocode(query)
+        except requests.exceptions.RequestException as e:
+            print(f"Geokoder niedostępny, używam zapasowego: {e}")
+            coords = None
+        return coords if coords is not None else self.fallback.geocode(query)
+
+
+class CachedGeocoder(Geocoder):
+    """
+    Geokoder z trwałym cache wyników w bazie danych (`GeocodeCacheEntry`)
+    i cache LRU w pamięci procesu przed nim.
+
+    - Zapytania normalizowane są przez `fold_text` ("  Łódź " i "lodz" to ten sam wpis).
+    - Wyniki wygasają po `ttl`, a wyniki negatywne (brak miejsca) po `negative_ttl`.
+    - Błędy geokodera nie są zapamiętywane.
+    - Wpis zapisywany jest przez INSERT ... ON CONFLICT DO UPDATE na osobnym
+      połączeniu, więc równoległe zapytania o to samo miejsce nie kończą się
+      błędem klucza, a niezatwierdzone zmiany sesji widoku nie są zatwierdzane.
+
+    Wymaga kontekstu aplikacji Flask (sesja bazy danych).
+
+    Argumenty:
+        geocoder (Geocoder): Geokoder wywoływany przy braku wpisu.
+        ttl (float): Czas życia wyniku w sekundach.
+        negative_ttl (float): Czas życia wyniku negatywnego w sekundach.
+        maxsize (int): Liczba wpisów w cache w pamięci.
+    """
+
+    def __init__(self, geocoder: Geocoder, ttl: float = 30 * 24 * 3600, negative_ttl: float = 24 * 3600,
+                 maxsize: int = 1024):
+        self.geocoder = geocoder
+        self.ttl = timedelta(seconds=ttl)
+        self.negative_ttl = timedelta(seconds=negative_ttl)
+        self._memory = TTLCache(ttl=None, maxsize=maxsize)  # klucz -> (współrzędne | None, data wygaśnięcia)
+
+    def _expires_at(self, coords: Optional[Coords], created_at: datetime) -> datetime:
+        return created_at + (self.ttl if coords is not None else self.negative_ttl)
+
+    def geocode(self, query: str) -> Optional[Coords]:
+        key = fold_text(query)[:200]
+        if not key:
+            return None
+        now = datetime.now()
+
+        entry = self._memory.get(key)
+        if entry is not None and entry[1] > now:
+            return entry[0]
+
+        with db.session.no_autoflush:
+            row = db.session.get(GeocodeCacheEntry, key)
+        if row is not None and self._expires_at(row.coords, row.created_at) > now:
+            self._memory.set(key, (row.coords, self._expires_at(row.coords, row.created_at)))
+            return row.coords
+
+        coords = self.geocoder.geocode(query)
+        stmt = DataService._dialect_insert(GeocodeCacheEntry.__table__).values(
+            address=key,
+            lat=coords[0] if coords else None,
+            lon=coords[1] if coords else None,
+            created_at=now
+        )
+        with db.engine.begin() as connection:
+            connection.execute(stmt.on_conflict_do_update(
+                index_elements=["address"],
+                set_={"lat": stmt.excluded.lat, "lon": stmt.excluded.lon, "created_at": stmt.excluded.created_at}
+            ))
+        self._memory.set(key, (coords, self._expires_at(coords, now)))
+        return coords
+
+
+_geocoder: Geocoder = NominatimGeocoder()
+
+
+def configure_geocoder(geocoder: Geocoder):
+    """Ustawia geokoder używany przez widoki (np. `CachedGeocoder(NominatimGeocoder())`)."""
+    global _geocoder
+    _geocoder = geocoder
+
+
+def get_geocoder() -> Geocoder:
+    """Zwraca geokoder skonfigurowany dla procesu."""
+    return _geocoder
@@ -0,0 +1,192 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+# domyślny czas świeżości odpowiedzi API GIOŚ (w sekundach) według rodzaju endpointu;
+# po jego upływie odpowiedź jest rewalidowana zapytaniem warunkowym (ETag / Last-Modified)
+DEFAULT_MAX_AGE = {
+    "station/findAll": 6 * 3600,
+    "station/sensors": 24 * 3600,
+    "data/getData": 15 * 60,
+    "aqindex/getIndex": 15 * 60,
+}
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+# co ile sekund szacowany rozmiar cache jest przeliczany na nowo z katalogu
+# (uwzględnia wpisy zapisane przez inne procesy)
+SIZE_RESCAN_INTERVAL = 60
+
+
+@dataclass
+class CachedResponse:
+    """Odpowiedź zapisana w cache wraz z walidatorami do zapytań warunkowych."""
+    url: str
+    body: bytes
+    stored_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    def json(self):
+        return json.loads(self.body)
+
+    def validators(self) -> Dict[str, str]:
+        """Nagłówki zapytania warunkowego (If-None-Match / If-Modified-Since)."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    """
+    Cache odpowiedzi HTTP na dysku, współdzielony przez wszystkie procesy na hoście
+    (np. procesy robocze gunicorna).
+
+    - Kluczem jest pełny URL; każdy wpis to jeden plik (nagłówek JSON + treść).
+    - Wpis młodszy niż `max_age` jego rodzaju endpointu zwracany jest bez zapytania
+      do API; starszy jest rewalidowany (odpowiedź 304 tylko odświeża wpis).
+    - Zapis jest atomowy (plik tymczasowy + `os.replace`), więc inne procesy
+      nigdy nie odczytają niepełnego wpisu.
+    - Łączny rozmiar wpisów jest szacowany przy zapisie (bez przeglądania katalogu);
+      katalog przeglądany jest dopiero, gdy szacunek przekroczy `max_bytes` lub
+      minie `SIZE_RESCAN_INTERVAL`, i wtedy usuwane są najdawniej
+      zapisane/odświeżone wpisy.
+
+    Argumenty:
+        directory (str): Katalog cache (tworzony w razie potrzeby).
+        max_bytes (int): Maksymalny łączny rozmiar wpisów w bajtach.
+        max_age (dict[str, float] | None): Czas świeżości według fragmentu ścieżki URL
+            (np. {"data/getData": 900}); URL bez dopasowania jest zawsze rewalidowany.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES, max_age: Dict[str, float] = None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = DEFAULT_MAX_AGE if max_age is None else max_age
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._size: Optional[int] = None  # szacowany łączny rozmiar wpisów (None - nieznany)
+        self._scanned_at = 0.0
+
+    def _path(self, url: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(url.encode("utf-8")).hexdigest() + ".cache")
+
+    def max_age_for(self, url: str) -> float:
+        """Czas świeżości odpowiedzi dla URL (najdłuższy pasujący fragment ścieżki)."""
+        matches = [pattern for pattern in self.max_age if pattern in url]
+        return self.max_age[max(matches, key=len)] if matches else 0
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """Zwraca wpis dla URL (również nieświeży) lub None."""
+        path = self._path(url)
+        try:
+            with open(path, "rb") as file:
+                header = json.loads(file.readline())
+                body = file.read()
+            stored_at = os.path.getmtime(path)
+        except (OSError, ValueError):
+            return None
+        if header.get("url") != url:
+            return None
+        return CachedResponse(url=url, body=body, stored_at=stored_at,
+                              etag=header.get("etag"), last_modified=header.get("last_modified"))
+
+    def is_fresh(self, entry: CachedResponse) -> bool:
+        return time.time() - entry.stored_at < self.max_age_for(entry.url)
+
+    def set(self, url: str, body: bytes, etag: str = None, last_modified: str = None):
+        """Zapisuje odpowiedź atomowo; odpowiedzi większe niż `max_bytes` są pomijane."""
+        if len(body) > self.max_bytes:
+            return
+        header = json.dumps({"url": url, "etag": etag, "last_modified": last_modified}).encode("utf-8")
+        path = self._path(url)
+        try:
+            replaced = os.path.getsize(path)
+        except OSError:
+            replaced = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(header + b"\n")
+                file.write(body)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+
+        with self._lock:
+            if self._size is not None:
+                self._size += len(header) + 1 + len(body) - replaced
+            needs_scan = (self._size is None or self._size > self.max_bytes
+                          or time.monotonic() - self._scanned_at >= SIZE_RESCAN_INTERVAL)
+        if needs_scan:
+            self.evict()
+
+    def touch(self, url: str):
+        """Oznacza wpis jako świeży (po odpowiedzi 304 Not Modified)."""
+        try:
+            os.utime(self._path(url))
+        except OSError:
+            pass
+
+    def size(self) -> int:
+        """Łączny rozmiar wpisów w bajtach."""
+        return sum(entry.stat().st_size for entry in os.scandir(self.directory) if entry.name.endswith(".cache"))
+
+    def evict(self):
+        """Usuwa najstarsze wpisy, dopóki łączny rozmiar przekracza `max_bytes`."""
+        entries = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(".cache"):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue  # usunięty równolegle przez inny proces
+            total -= size
+
+        with self._lock:
+            self._size = total
+            self._scanned_at = time.monotonic()
+
+    def clear(self):
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith((".cache", ".tmp")):
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+
+
+# Cache odpowiedzi API GIOŚ używany przez Downloader (None = wyłączony)
+_http_cache: Optional[HttpCache] = None
+
+
+def configure_http_cache(directory: Optional[str], max_bytes: int = DEFAULT_MAX_BYTES,
+                         max_age: Dict[str, float] = None):
+    """Włącza cache odpowiedzi na dysku w podanym katalogu (None - wyłącza cache)."""
+    global _http_cache
+    _http_cache = HttpCache(directory, max_bytes=max_bytes, max_age=max_age) if directory else None
+
+
+def get_http_cache() -> Optional[HttpCache]:
+    """Zwraca skonfigurowany cache odpowiedzi lub None, jeśli jest wyłączony."""
+    return _http_cache
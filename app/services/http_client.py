@@ -0,0 +1,89 @@
+import threading
+from contextlib import contextmanager
+import requests
+from requests.adapters import HTTPAdapter
+
+# (connect, read) w sekundach
+DEFAULT_TIMEOUT = (3.05, 15)
+DEFAULT_POOL_SIZE = 10
+
+_session = None
+_session_lock = threading.Lock()
+_pool_size = DEFAULT_POOL_SIZE
+_timeout = DEFAULT_TIMEOUT
+# ogranicza liczbę jednoczesnych zapytań w procesie do rozmiaru puli połączeń
+_request_slots = threading.BoundedSemaphore(DEFAULT_POOL_SIZE)
+
+
+def create_session(pool_size: int = DEFAULT_POOL_SIZE) -> requests.Session:
+    """
+    Tworzy sesję HTTP z pulą połączeń keep-alive.
+
+    Argumenty:
+        pool_size (int): Maksymalna liczba utrzymywanych połączeń na host.
+
+    Zwraca:
+        requests.Session: Sesja z zamontowanym adapterem puli połączeń
+        i nagłówkami akceptującymi odpowiedzi skompresowane gzip.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        "Accept": "application/json",
+        "Accept-Encoding": "gzip, deflate",
+        "User-Agent": "AirMonitor",
+    })
+    return session
+
+
+def configure_session(pool_size: int = DEFAULT_POOL_SIZE, timeout=DEFAULT_TIMEOUT):
+    """
+    Ustawia parametry współdzielonej sesji (rozmiar puli, timeouty).
+
+    Jeżeli sesja została już utworzona z innym rozmiarem puli,
+    jest zamykana i zostanie odtworzona przy następnym `get_session()`.
+    """
+    global _session, _pool_size, _timeout, _request_slots
+    with _session_lock:
+        _timeout = timeout
+        if pool_size != _pool_size:
+            if _session is not None:
+                _session.close()
+                _session = None
+            _request_slots = threading.BoundedSemaphore(pool_size)
+        _pool_size = pool_size
+
+
+def get_session() -> requests.Session:
+    """
+    Zwraca sesję HTTP współdzieloną przez wszystkie wątki procesu roboczego.
+
+    Sesja tworzona jest leniwie przy pierwszym wywołaniu.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session(_pool_size)
+    return _session
+
+
+def get_timeout():
+    """Zwraca skonfigurowane timeouty (connect, read) dla zapytań do API."""
+    return _timeout
+
+
+@contextmanager
+def request_slot():
+    """
+    Zajmuje jedno z `pool_size` miejsc na zapytanie do API na czas jego trwania.
+
+    Niezależnie od tego, ile wątków (pule synchronizacji, strony list,
+    AsyncDownloader) wykonuje zapytania, w procesie trwa ich naraz najwyżej
+    tyle, ile połączeń mieści pula sesji.
+    """
+    slots = _request_slots
+    with slots:
+        yield
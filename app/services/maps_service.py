@@ -1,6 +1,19 @@
+import hashlib
 import folium
 from math import radians, cos, sin, asin, sqrt
 import requests
+from app.services.cache import TTLCache
+from app.services.geocoding import NominatimGeocoder
+from app.services.spatial_index import SpatialIndex
+
+# Wyrenderowany HTML map (klucz: skrót zbioru stacji i parametrów mapy), usuwanie LRU.
+_map_html_cache = TTLCache(ttl=None, maxsize=32)
+
+
+def configure_map_cache(maxsize: int = 32):
+    """Ustawia maksymalną liczbę przechowywanych map."""
+    _map_html_cache.maxsize = maxsize
+
 
 class StationMap:
     def __init__(self, stations_list, center_lat=52.0, center_lon=19.0, zoom_start=6, height=600):
@@ -10,6 +23,20 @@ class StationMap:
         self.height = height
         self.map = None
 
+    def cache_key(self) -> str:
+        """Skrót parametrów mapy i danych stacji, które trafiają do markerów."""
+        digest = hashlib.sha1(repr((type(self).__name__, self.center, self.zoom_start, self.height)).encode("utf-8"))
+        for s in self.stations_list:
+            digest.update(repr((s.gegrLat, s.gegrLon, s.stationName, getattr(s.city, "name", None))).encode("utf-8"))
+        return digest.hexdigest()
+
+    def render_html(self) -> str:
+        """
+        Zwraca HTML mapy (`_repr_html_`), renderując ją tylko przy pierwszym użyciu
+        danego zbioru stacji i parametrów - kolejne wywołania to odczyt z cache.
+        """
+        return _map_html_cache.get_or_load(self.cache_key(), lambda: self.create_default_map()._repr_html_())
+
 
     def create_default_map(self):
         """Tworzy mapę i dodaje stacje jako markery."""
@@ -29,9 +56,16 @@ class StationMap:
 
 
 class StationMapWithRadius(StationMap):
-    """Klasa dziedzicząca po StationMap, z dodatkowymi zmiennymi aby umożliwoć filtracje."""
+    """
+    Klasa dziedzicząca po StationMap, z dodatkowymi zmiennymi aby umożliwoć filtracje.
+
+    `spatial_index` pozwala użyć gotowego indeksu przestrzennego (np. `catalog.spatial_index`);
+    bez niego indeks budowany jest z `stations_list`. `geocoder` (np. `CachedGeocoder`)
+    zamienia lokalizację na współrzędne; domyślnie `NominatimGeocoder`.
+    """
     def __init__(self, stations_list, location, radius,
-                 center_lat=52.0, center_lon=19.0, zoom_start=6, height=600):
+                 center_lat=52.0, center_lon=19.0, zoom_start=6, height=600, spatial_index=None,
+                 geocoder=None):
         # wywołanie konstruktora klasy bazowej
         super().__init__(stations_list, center_lat, center_lon, zoom_start, height)
 
@@ -41,6 +75,9 @@ class StationMapWithRadius(StationMap):
         self.coords = []
         self.lat = None
         self.lon = None
+        self.spatial_index = spatial_index
+        self.geocoder = geocoder
+        self.distances = {}  # id stacji -> odległość w km od lokalizacji
 
     def create_map(self):
         """Tworzy mapę i dodaje stacje jako markery."""
@@ -61,10 +98,16 @@ class StationMapWithRadius(StationMap):
         return self.map
 
     def sort_list_by_location_and_radius(self):
-        """Na podstawie lokalizacji i promienia w kilometach sortuje listę"""
+        """
+        Na podstawie lokalizacji i promienia w kilometrach zwraca stacje w promieniu,
+        posortowane od najbliższej. Bez lokalizacji, promienia lub wyniku geokodowania
+        zwraca pustą listę. Lokalizacja geokodowana jest tylko raz.
+        """
+        stations_list_in_radius = []
         if self.location and self.radius:
-            self.coords = self.geocode_address()
-            print(f'Coords {self.coords}')
+            if not self.coords:
+                self.coords = self.geocode_address()
+                print(f'Coords {self.coords}')
             if self.coords:
                 self.lat, self.lon = self.coords
                 stations_list_in_radius = self.filter_stations_by_radius()
@@ -72,16 +115,17 @@ class StationMapWithRadius(StationMap):
         return stations_list_in_radius
 
     def geocode_address(self):
-        """Geokodowanie przez Nominatim (OpenStreetMap API)."""
-        url = "https://nominatim.openstreetmap.org/search"
-        params = {"q": self.location, "format": "json", "limit": 1}
-        resp = requests.get(url, params=params, headers={"User-Agent": "stations-app"})
-        resp.raise_for_status()
-        data = resp.json()
-        print(data)
-        if not data:
+        """
+        Geokodowanie lokalizacji przez `self.geocoder` (domyślnie Nominatim, OpenStreetMap API).
+
+        Zwraca (lat, lon) albo None, gdy miejsce nie zostało znalezione lub geokoder jest niedostępny.
+        """
+        geocoder = self.geocoder or NominatimGeocoder()
+        try:
+            return geocoder.geocode(self.location)
+        except requests.exceptions.RequestException as e:
+            print(f"Błąd geokodowania '{self.location}': {e}")
             return None
-        return float(data[0]["lat"]), float(data[0]["lon"])
 
     def haversine(self, lat1, lon1, lat2, lon2):
         """Odległość w km między dwoma punktami."""
@@ -93,12 +137,9 @@ class StationMapWithRadius(StationMap):
         return R * c
 
     def filter_stations_by_radius(self):
-        result = []
-        for s in self.stations_list:
-            slat = s.gegrLat
-            slon = s.gegrLon
-            if slat and slon:
-                dist = self.haversine(float(slat), float(slon), self.lat, self.lon)
-                if dist <= self.radius:
-                    result.append(s)
-        return result
+        """Zwraca stacje w promieniu od (self.lat, self.lon), od najbliższej (indeks przestrzenny)."""
+        if self.spatial_index is None:
+            self.spatial_index = SpatialIndex(self.stations_list)
+        found = self.spatial_index.within_radius(self.lat, self.lon, self.radius)
+        self.distances = {s.id: dist for s, dist in found}
+        return [s for s, _ in found]
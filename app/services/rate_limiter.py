@@ -0,0 +1,50 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Ogranicznik liczby zapytań typu "token bucket", bezpieczny wątkowo.
+
+    Wiadro napełnia się z prędkością `rate` tokenów na sekundę, do maksymalnie
+    `capacity` tokenów. Każde zapytanie zużywa jeden token; gdy wiadro jest puste,
+    `acquire()` czeka na uzupełnienie.
+
+    Argumenty:
+        rate (float): Średnia liczba zapytań na sekundę.
+        capacity (int): Maksymalna liczba zapytań wykonanych jednorazowo (burst).
+    """
+
+    def __init__(self, rate: float, capacity: int = 1):
+        if rate <= 0:
+            raise ValueError("rate musi być większe od zera")
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def try_acquire(self, tokens: int = 1) -> bool:
+        """Pobiera tokeny, jeżeli są dostępne; nie blokuje."""
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens: int = 1):
+        """Pobiera tokeny, w razie potrzeby czekając na ich uzupełnienie."""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
@@ -0,0 +1,211 @@
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
+import requests
+from app import db
+from app.models.dto import MeasurementData, StationIndexData
+from app.services.data_service import DataService
+from app.services.downloader import Downloader
+from app.services.rate_limiter import TokenBucket
+
+
+@dataclass
+class PollSummary:
+    """Podsumowanie jednego cyklu odpytywania."""
+    sensors: int = 0
+    updated_sensors: int = 0
+    measurements: int = 0
+    station_indexes: int = 0
+    errors: int = 0
+
+
+class PollingScheduler:
+    """
+    Cykliczne pobieranie nowych pomiarów śledzonych czujników i stacji.
+
+    - Śledzone są wskazane czujniki (muszą już być w bazie) oraz wszystkie
+      czujniki wskazanych stacji (stacje i czujniki zapisywane są przy starcie).
+    - Dla każdego czujnika znaczniki "high-water mark" to data najnowszego
+      zapisanego pomiaru i najnowszego pomiaru z wartością (`SensorStatistics`,
+      jedno zapytanie na cykl). Zapisywane są wyłącznie pomiary nowsze od
+      pierwszego znacznika oraz wartości nowsze od drugiego - API GIOŚ zwraca
+      ostatnie godziny bez wartości i uzupełnia je później. Czujniki bez nowych
+      danych w ogóle nie trafiają do bazy.
+    - Zapytania do API wykonywane są w puli `max_workers` wątków przez wspólny
+      `TokenBucket`; zapis odbywa się tylko w wątku wywołującym.
+    - Odstęp między cyklami to `interval` z losowym odchyleniem ±`jitter`
+      (ułamek interwału), żeby wiele procesów nie odpytywało API jednocześnie.
+    - Błąd zapytania do API liczony jest w `PollSummary.errors`; błąd całego
+      cyklu (np. zablokowana baza) wycofuje transakcję i nie przerywa pracy.
+
+    Argumenty:
+        base_url (str): Bazowy adres API GIOŚ.
+        sensor_ids (list[int]): Identyfikatory śledzonych czujników (id_stanowiska).
+        station_ids (list[int]): Identyfikatory śledzonych stacji.
+        interval (float): Średni odstęp między cyklami w sekundach.
+        jitter (float): Maksymalne odchylenie odstępu jako ułamek `interval` (0-1).
+        max_workers (int): Liczba jednoczesnych zapytań do API.
+        rate_limiter (TokenBucket | None): Ogranicznik liczby zapytań do API.
+        data_service (DataService | None): Serwis zapisu danych.
+        session (requests.Session | None): Sesja HTTP (domyślnie współdzielona).
+    """
+
+    def __init__(self, base_url: str, sensor_ids: Iterable[int] = (), station_ids: Iterable[int] = (),
+                 interval: float = 3600, jitter: float = 0.1, max_workers: int = 4,
+                 rate_limiter: TokenBucket = None, data_service: DataService = None,
+                 session: requests.Session = None):
+        if not 0 <= jitter < 1:
+            raise ValueError("jitter musi być z przedziału [0, 1)")
+        self.base_url = base_url
+        self.sensor_ids = list(sensor_ids)
+        self.station_ids = list(station_ids)
+        self.interval = interval
+        self.jitter = jitter
+        self.max_workers = max_workers
+        self.rate_limiter = rate_limiter or TokenBucket(rate=10, capacity=20)
+        self.data_service = data_service or DataService()
+        self.session = session
+
+        self.targets: Dict[int, int] = {}  # id_stanowiska -> id stacji
+        self._index_watermarks: Dict[int, datetime] = {}
+
+    def _call(self, method_name: str, *args):
+        # błędy API przekazywane są do puli wątków i liczone w PollSummary.errors;
+        # limit dotyczy każdego zapytania HTTP, również o kolejne strony list
+        downloader = Downloader(self.base_url, session=self.session, raise_errors=True,
+                                acquire=self.rate_limiter.acquire)
+        return getattr(downloader, method_name)(*args)
+
+    def resolve_targets(self) -> Dict[int, int]:
+        """
+        Ustala listę śledzonych czujników.
+
+        Stacje z `station_ids` pobierane są z katalogu API wraz z czujnikami
+        i zapisywane w bazie; czujniki z `sensor_ids` odczytywane są z bazy
+        (nieznane czujniki są pomijane z ostrzeżeniem).
+
+        Zwraca:
+            dict[int, int]: Identyfikator czujnika -> identyfikator stacji.
+        """
+        targets = self.data_service.get_sensor_stations(self.sensor_ids)
+        for sensor_id in self.sensor_ids:
+            if sensor_id not in targets:
+                print(f"Czujnik {sensor_id} nie jest zapisany w bazie - pomijam "
+                      f"(śledź jego stację lub uruchom synchronizację)")
+
+        if self.station_ids:
+            catalog = self._call("fetch_station_catalog")
+            stations = [catalog.get(station_id) for station_id in self.station_ids]
+            for station_id, station in zip(self.station_ids, stations):
+                if station is None:
+                    print(f"Stacja {station_id} nie istnieje w katalogu API GIOŚ - pomijam")
+            stations = [s for s in stations if s is not None]
+
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                sensor_lists = list(pool.map(
+                    lambda station: self._call("fetch_station_sensors_list", str(station.id)) or [], stations
+                ))
+            sensors = [sensor for sensor_list in sensor_lists for sensor in sensor_list]
+            self.data_service.save_bulk(stations, sensors, {}, [])
+            targets.update({sensor.id_stanowiska: sensor.id_stacji for sensor in sensors})
+
+        self.targets = targets
+        return targets
+
+    def _fetch_new(self, sensor_id: int, watermark: Optional[tuple]) -> List[MeasurementData]:
+        measurements = self._call("fetch_measurement", str(sensor_id)) or []
+        if watermark is None:
+            return measurements
+        last_data, last_valid_data = watermark
+        return [
+            m for m in measurements
+            if m.data > last_data
+            or (m.wartosc is not None and (last_valid_data is None or m.data > last_valid_data))
+        ]
+
+    def _fetch_index(self, station_id: int) -> Optional[StationIndexData]:
+        station_index = self._call("fetch_station_index", str(station_id)) or None
+        watermark = self._index_watermarks.get(station_id)
+        if station_index is None or (watermark is not None and station_index.calculation_date <= watermark):
+            return None
+        return station_index
+
+    def poll_once(self) -> PollSummary:
+        """Wykonuje jeden cykl: pobiera pomiary śledzonych czujników i zapisuje tylko nowe."""
+        if not self.targets:
+            self.resolve_targets()
+
+        summary = PollSummary(sensors=len(self.targets))
+        watermarks = self.data_service.get_sensor_watermarks(list(self.targets))
+        station_ids = sorted(set(self.targets.values()))
+
+        new_measurements: Dict[int, List[MeasurementData]] = {}
+        station_indexes: List[StationIndexData] = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            sensor_futures = {
+                sensor_id: pool.submit(self._fetch_new, sensor_id, watermarks.get(sensor_id))
+                for sensor_id in self.targets
+            }
+            index_futures = {station_id: pool.submit(self._fetch_index, station_id) for station_id in station_ids}
+
+            for sensor_id, future in sensor_futures.items():
+                try:
+                    measurements = future.result()
+                except Exception as e:
+                    print(f"Błąd pobierania pomiarów czujnika {sensor_id}: {e}")
+                    summary.errors += 1
+                    continue
+                if measurements:
+                    new_measurements[sensor_id] = measurements
+
+            for station_id, future in index_futures.items():
+                try:
+                    station_index = future.result()
+                except Exception as e:
+                    print(f"Błąd pobierania indeksu AQI stacji {station_id}: {e}")
+                    summary.errors += 1
+                    continue
+                if station_index is not None:
+                    station_indexes.append(station_index)
+
+        if new_measurements or station_indexes:
+            summary.measurements = self.data_service.save_bulk([], [], new_measurements, station_indexes)
+        summary.updated_sensors = len(new_measurements)
+        summary.station_indexes = len(station_indexes)
+        for station_index in station_indexes:
+            self._index_watermarks[station_index.station_id] = station_index.calculation_date
+        return summary
+
+    def next_delay(self) -> float:
+        """Odstęp do następnego cyklu: `interval` z losowym odchyleniem ±`jitter`."""
+        return self.interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def run(self, cycles: int = None, stop_event: threading.Event = None,
+            on_cycle: Callable[[PollSummary], None] = None):
+        """
+        Odpytuje API cyklicznie, aż do wykonania `cycles` cykli lub ustawienia `stop_event`.
+
+        Argumenty:
+            cycles (int | None): Liczba cykli (domyślnie bez ograniczenia).
+            stop_event (threading.Event | None): Zdarzenie przerywające oczekiwanie i pętlę.
+            on_cycle (callable | None): Wywoływane z podsumowaniem po każdym udanym cyklu.
+        """
+        stop_event = stop_event or threading.Event()
+        done = 0
+        while not stop_event.is_set():
+            try:
+                summary = self.poll_once()
+            except Exception as e:
+                # np. "database is locked" przy równoległym zapisie aplikacji - kolejny cykl ponowi zapis
+                db.session.rollback()
+                print(f"Błąd cyklu odpytywania: {e}")
+                summary = None
+            done += 1
+            if on_cycle and summary is not None:
+                on_cycle(summary)
+            if cycles is not None and done >= cycles:
+                break
+            stop_event.wait(self.next_delay())
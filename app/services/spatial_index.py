@@ -0,0 +1,71 @@
+from typing import List, Tuple
+import numpy as np
+from app.models.dto import StationData
+
+EARTH_RADIUS_KM = 6371.0
+
+
+class SpatialIndex:
+    """
+    Indeks przestrzenny stacji do zapytań "w promieniu" i "k najbliższych".
+
+    Współrzędne wszystkich stacji są raz zamieniane na tablice NumPy (w radianach),
+    a odległości liczone są wektorowo wzorem haversine dla całej tablicy naraz.
+    Stacje bez poprawnych współrzędnych są pomijane.
+
+    Argumenty:
+        stations (list[StationData]): Stacje (np. katalog stacji).
+    """
+
+    def __init__(self, stations: List[StationData]):
+        self.stations = []
+        coords = []
+        for station in stations:
+            try:
+                coords.append((float(station.gegrLat), float(station.gegrLon)))
+            except (TypeError, ValueError):
+                continue
+            self.stations.append(station)
+
+        coords = np.radians(np.array(coords, dtype=np.float64).reshape(-1, 2))
+        self._lat = coords[:, 0]
+        self._lon = coords[:, 1]
+        self._cos_lat = np.cos(self._lat)
+
+    def __len__(self):
+        return len(self.stations)
+
+    def distances(self, lat: float, lon: float) -> np.ndarray:
+        """Odległości (km) od punktu (lat, lon) do każdej stacji indeksu."""
+        lat, lon = np.radians(lat), np.radians(lon)
+        a = (np.sin((self._lat - lat) / 2) ** 2
+             + np.cos(lat) * self._cos_lat * np.sin((self._lon - lon) / 2) ** 2)
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+    def _result(self, distances: np.ndarray, indices: np.ndarray) -> List[Tuple[StationData, float]]:
+        indices = indices[np.argsort(distances[indices], kind="stable")]
+        return [(self.stations[i], float(distances[i])) for i in indices]
+
+    def within_radius(self, lat: float, lon: float, radius_km: float) -> List[Tuple[StationData, float]]:
+        """
+        Zwraca stacje w promieniu `radius_km` od punktu, posortowane rosnąco po odległości.
+
+        Zwraca:
+            list[tuple[StationData, float]]: Pary (stacja, odległość w km).
+        """
+        distances = self.distances(lat, lon)
+        return self._result(distances, np.flatnonzero(distances <= radius_km))
+
+    def nearest(self, lat: float, lon: float, k: int) -> List[Tuple[StationData, float]]:
+        """
+        Zwraca `k` stacji najbliższych punktowi, posortowanych rosnąco po odległości.
+
+        Zwraca:
+            list[tuple[StationData, float]]: Pary (stacja, odległość w km).
+        """
+        if k <= 0 or not self.stations:
+            return []
+        distances = self.distances(lat, lon)
+        if k >= len(distances):
+            return self._result(distances, np.arange(len(distances)))
+        return self._result(distances, np.argpartition(distances, k - 1)[:k])
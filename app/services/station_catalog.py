@@ -0,0 +1,99 @@
+import hashlib
+from collections import defaultdict
+from functools import cached_property
+from typing import Dict, Iterator, List, Optional
+from app.models.dto import StationData
+from app.services.spatial_index import SpatialIndex
+from app.services.text_utils import fold_text
+
+
+class StationCatalog:
+    """
+    Jednokrotnie sparsowany katalog stacji z indeksami do szybkiego wyszukiwania.
+
+    Indeksy budowane są raz, przy tworzeniu obiektu:
+        - po identyfikatorze stacji,
+        - po kodzie stacji (`stationCode`),
+        - po nazwie miasta, powiatu i województwa (bez rozróżniania
+          wielkości liter i polskich znaków diakrytycznych).
+
+    Atrybuty:
+        stations (list[StationData]): Wszystkie stacje w kolejności z API.
+        by_id (dict[int, StationData]): Stacje według identyfikatora.
+        by_code (dict[str, StationData]): Stacje według kodu stacji.
+        version (str): Skrót zawartości katalogu - zmienia się tylko wtedy,
+            gdy zmienią się dane którejkolwiek stacji.
+    """
+
+    def __init__(self, stations: List[StationData]):
+        self.stations = list(stations)
+        self.by_id: Dict[int, StationData] = {}
+        self.by_code: Dict[str, StationData] = {}
+        self._by_city = defaultdict(list)
+        self._by_powiat = defaultdict(list)
+        self._by_wojewodztwo = defaultdict(list)
+        digest = hashlib.sha1()
+
+        for station in self.stations:
+            digest.update(repr(self._station_key(station)).encode("utf-8"))
+
+            self.by_id[station.id] = station
+            self.by_code[station.stationCode] = station
+
+            city = station.city
+            if city is None:
+                continue
+            self._by_city[fold_text(city.name)].append(station)
+
+            gmina = city.gmina
+            if gmina is None:
+                continue
+            self._by_powiat[fold_text(gmina.powiatName)].append(station)
+            self._by_wojewodztwo[fold_text(gmina.wojewodztwoName)].append(station)
+
+        self.version = digest.hexdigest()
+
+    @cached_property
+    def spatial_index(self) -> SpatialIndex:
+        """Indeks przestrzenny stacji, budowany raz dla danej wersji katalogu."""
+        return SpatialIndex(self.stations)
+
+    @staticmethod
+    def _station_key(station: StationData) -> tuple:
+        city = station.city
+        gmina = city.gmina if city is not None else None
+        return (
+            station.id, station.stationCode, station.stationName, station.gegrLat, station.gegrLon,
+            station.addressStreet,
+            city.name if city is not None else None,
+            (gmina.gminaName, gmina.powiatName, gmina.wojewodztwoName) if gmina is not None else None
+        )
+
+    def __len__(self):
+        return len(self.stations)
+
+    def __iter__(self) -> Iterator[StationData]:
+        return iter(self.stations)
+
+    def __contains__(self, station_id):
+        return station_id in self.by_id
+
+    def get(self, station_id: int) -> Optional[StationData]:
+        """Zwraca stację o podanym identyfikatorze lub None."""
+        return self.by_id.get(station_id)
+
+    def get_by_code(self, station_code: str) -> Optional[StationData]:
+        """Zwraca stację o podanym kodzie (np. "MzWarAlNiepo") lub None."""
+        return self.by_code.get(station_code)
+
+    def find_by_city(self, city_name: str) -> List[StationData]:
+        """Zwraca stacje w mieście (np. "lodz" znajdzie stacje w "Łódź")."""
+        return list(self._by_city.get(fold_text(city_name), []))
+
+    def find_by_powiat(self, powiat_name: str) -> List[StationData]:
+        """Zwraca stacje w powiecie."""
+        return list(self._by_powiat.get(fold_text(powiat_name), []))
+
+    def find_by_wojewodztwo(self, wojewodztwo_name: str) -> List[StationData]:
+        """Zwraca stacje w województwie."""
+        return list(self._by_wojewodztwo.get(fold_text(wojewodztwo_name), []))
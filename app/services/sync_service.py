@@ -0,0 +1,134 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+import requests
+from app.models.dto import StationData, SensorData, MeasurementData, StationIndexData
+from app.services.data_service import DataService
+from app.services.downloader import Downloader
+from app.services.rate_limiter import TokenBucket
+
+
+@dataclass
+class StationSyncResult:
+    """Dane pobrane z API dla jednej stacji (czujniki, ich pomiary i indeks AQI)."""
+    station: StationData
+    sensors: List[SensorData] = field(default_factory=list)
+    measurements: Dict[int, List[MeasurementData]] = field(default_factory=dict)
+    station_index: Optional[StationIndexData] = None
+
+
+@dataclass
+class SyncSummary:
+    """Podsumowanie przebiegu synchronizacji."""
+    stations: int = 0
+    sensors: int = 0
+    measurements: int = 0
+    errors: int = 0
+
+
+class SyncService:
+    """
+    Synchronizuje całe archiwum: wszystkie stacje, czujniki, pomiary i indeksy AQI.
+
+    - Dane każdej stacji pobierane są w puli wątków (`max_workers`).
+    - Każde zapytanie do API GIOŚ przechodzi przez wspólny `TokenBucket`.
+    - Błąd zapytania (np. 500, timeout) pomija całą stację i jest liczony
+      w `SyncSummary.errors` - stacja nie jest zapisywana z niepełnymi danymi.
+    - Zapis do bazy wykonywany jest wyłącznie w wątku wywołującym,
+      paczkami po `batch_size` stacji, przez `DataService.save_bulk`.
+
+    Argumenty:
+        base_url (str): Bazowy adres API GIOŚ.
+        data_service (DataService | None): Serwis zapisu danych.
+        max_workers (int): Liczba wątków pobierających dane.
+        rate_limiter (TokenBucket | None): Ogranicznik liczby zapytań do API.
+        batch_size (int): Liczba stacji zapisywanych w jednej transakcji.
+        session (requests.Session | None): Sesja HTTP (domyślnie współdzielona).
+    """
+
+    def __init__(self, base_url: str, data_service: DataService = None, max_workers: int = 8,
+                 rate_limiter: TokenBucket = None, batch_size: int = 20, session: requests.Session = None):
+        self.base_url = base_url
+        self.data_service = data_service or DataService()
+        self.max_workers = max_workers
+        self.rate_limiter = rate_limiter or TokenBucket(rate=10, capacity=20)
+        self.batch_size = batch_size
+        self.session = session
+
+    def _call(self, method_name: str, *args):
+        # błędy API przekazywane są do puli wątków i liczone w SyncSummary.errors;
+        # limit dotyczy każdego zapytania HTTP, również o kolejne strony list
+        downloader = Downloader(self.base_url, session=self.session, raise_errors=True,
+                                acquire=self.rate_limiter.acquire)
+        return getattr(downloader, method_name)(*args)
+
+    def fetch_stations(self) -> List[StationData]:
+        """Pobiera pełny katalog stacji."""
+        return self._call("fetch_station_catalog").stations
+
+    def fetch_station(self, station: StationData) -> StationSyncResult:
+        """Pobiera czujniki stacji, pomiary każdego czujnika oraz indeks AQI stacji."""
+        result = StationSyncResult(station=station)
+        result.sensors = self._call("fetch_station_sensors_list", str(station.id))
+
+        for sensor in result.sensors:
+            result.measurements[sensor.id_stanowiska] = self._call("fetch_measurement", str(sensor.id_stanowiska))
+
+        result.station_index = self._call("fetch_station_index", str(station.id))
+        return result
+
+    def _write(self, batch: List[StationSyncResult], summary: SyncSummary):
+        measurements: Dict[int, List[MeasurementData]] = {}
+        for result in batch:
+            measurements.update(result.measurements)
+
+        summary.measurements += self.data_service.save_bulk(
+            stations=[r.station for r in batch],
+            sensors=[s for r in batch for s in r.sensors],
+            measurements=measurements,
+            station_indexes=[r.station_index for r in batch if r.station_index is not None]
+        )
+        summary.stations += len(batch)
+        summary.sensors += sum(len(r.sensors) for r in batch)
+
+    def run(self, stations: List[StationData] = None,
+            progress: Callable[[StationData], None] = None) -> SyncSummary:
+        """
+        Wykonuje synchronizację.
+
+        Argumenty:
+            stations (list[StationData] | None): Stacje do synchronizacji (domyślnie wszystkie).
+            progress (callable | None): Wywoływane po przetworzeniu każdej stacji.
+
+        Zwraca:
+            SyncSummary: Liczba zsynchronizowanych stacji, czujników,
+            nowych pomiarów oraz błędów.
+        """
+        if stations is None:
+            stations = self.fetch_stations()
+
+        summary = SyncSummary()
+        batch: List[StationSyncResult] = []
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {pool.submit(self.fetch_station, station): station for station in stations}
+
+            for future in as_completed(futures):
+                station = futures[future]
+                try:
+                    batch.append(future.result())
+                except Exception as e:
+                    print(f"Błąd synchronizacji stacji {station.id}: {e}")
+                    summary.errors += 1
+
+                if len(batch) >= self.batch_size:
+                    self._write(batch, summary)
+                    batch = []
+
+                if progress:
+                    progress(station)
+
+        if batch:
+            self._write(batch, summary)
+
+        return summary
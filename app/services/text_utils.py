@@ -0,0 +1,17 @@
+import unicodedata
+
+# litery, których NFKD nie rozkłada na znak bazowy + diakrytyk
+_SPECIAL_CHARS = str.maketrans({"ł": "l", "Ł": "l"})
+
+
+def fold_text(text: str) -> str:
+    """
+    Normalizuje tekst do porównań: małe litery, bez polskich znaków
+    diakrytycznych i nadmiarowych spacji (np. "  Łódź " -> "lodz").
+    """
+    if not text:
+        return ""
+    text = text.translate(_SPECIAL_CHARS)
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.casefold().split())
@@ -0,0 +1,108 @@
+from datetime import datetime
+from typing import Iterable, Iterator, NamedTuple, Optional
+import numpy as np
+from app.services.downsampling import lttb_indices
+
+
+class Point(NamedTuple):
+    """Pojedynczy punkt serii (data + wartość), tworzony dopiero przy iteracji."""
+    data: datetime
+    wartosc: Optional[float]
+
+
+class TimeSeries:
+    """
+    Kolumnowa seria pomiarów jednego czujnika oparta na tablicach NumPy.
+
+    Zamiast obiektu Measurement na każdy punkt (setki bajtów z instrumentacją
+    SQLAlchemy) seria przechowuje trzy tablice: znaczniki czasu w sekundach
+    epoki (int64), wartości (float64, NaN w miejsce braków) i maskę poprawnych
+    pomiarów (bool) - razem 17 bajtów na punkt.
+
+    Iteracja zwraca punkty `Point(data, wartosc)`, więc serię można przekazać
+    do szablonów i kodu oczekującego obiektów z polami `data` i `wartosc`.
+
+    Argumenty:
+        timestamps: Znaczniki czasu w sekundach epoki.
+        values: Wartości pomiarów (NaN = brak pomiaru).
+        mask: Maska poprawnych pomiarów (domyślnie: wartości różne od NaN).
+    """
+
+    __slots__ = ("timestamps", "values", "mask")
+
+    def __init__(self, timestamps, values, mask=None):
+        self.timestamps = np.asarray(timestamps, dtype=np.int64)
+        self.values = np.asarray(values, dtype=np.float64)
+        self.mask = ~np.isnan(self.values) if mask is None else np.asarray(mask, dtype=bool)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable) -> "TimeSeries":
+        """
+        Buduje serię z par (data, wartosc), np. wierszy zapytania Core
+        lub obiektów Measurement (obiekty z polami `data` i `wartosc`).
+        """
+        rows = [(row.data, row.wartosc) if hasattr(row, "wartosc") else row for row in rows]
+        if not rows:
+            return cls.empty()
+
+        dates, values = zip(*rows)
+        timestamps = np.array(dates, dtype="datetime64[s]").astype(np.int64)
+        values = np.fromiter((np.nan if v is None else v for v in values), dtype=np.float64, count=len(rows))
+        return cls(timestamps, values)
+
+    @classmethod
+    def empty(cls) -> "TimeSeries":
+        return cls(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64))
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def __iter__(self) -> Iterator[Point]:
+        for data, wartosc, valid in zip(self.datetimes(), self.values.tolist(), self.mask.tolist()):
+            yield Point(data, wartosc if valid else None)
+
+    @property
+    def nbytes(self) -> int:
+        """Rozmiar tablic serii w bajtach."""
+        return self.timestamps.nbytes + self.values.nbytes + self.mask.nbytes
+
+    def datetimes(self) -> list:
+        """Znaczniki czasu jako lista obiektów datetime."""
+        return self.timestamps.astype("datetime64[s]").tolist()
+
+    def hours(self) -> np.ndarray:
+        """Znaczniki czasu w godzinach (oś X regresji w CalculationService)."""
+        return self.timestamps / 3600.0
+
+    def take(self, indices) -> "TimeSeries":
+        """Zwraca serię złożoną z punktów o podanych indeksach."""
+        return TimeSeries(self.timestamps[indices], self.values[indices], self.mask[indices])
+
+    def downsample(self, max_points: int) -> "TimeSeries":
+        """
+        Zmniejsza serię do co najwyżej `max_points` punktów metodą LTTB
+        (`lttb_indices`): serie mieszczące się w budżecie zwracane są bez zmian,
+        przy zmniejszaniu braki danych są pomijane, a wybrane punkty zachowują
+        kolejność wejściową (API GIOŚ zwraca najnowsze pomiary jako pierwsze).
+        """
+        if not max_points or len(self) <= max_points:
+            return self
+
+        valid = np.flatnonzero(self.mask)
+        if len(valid) <= max_points:
+            return self.take(valid)
+
+        order = valid[np.argsort(self.timestamps[valid], kind="stable")]
+        selected = order[lttb_indices(self.timestamps[order], self.values[order], max_points)]
+        return self.take(np.sort(selected))
+
+    def to_chart_points(self) -> list:
+        """
+        Zwraca listę słowników {data, wartosc} dla wykresów; daty w formacie
+        "YYYY-MM-DD HH:MM:SS", takim samym jak w API GIOŚ.
+        """
+        dates = np.datetime_as_string(self.timestamps.astype("datetime64[s]"), unit="s")
+        return [
+            {"data": data.replace("T", " "), "wartosc": wartosc if valid else None}
+            for data, wartosc, valid in zip(dates.tolist(), self.values.tolist(), self.mask.tolist())
+        ]
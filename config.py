@@ -5,4 +5,67 @@ BASE_DIR = os.path.abspath(os.path.dirname(__file__))
 class Config:
     SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(BASE_DIR, 'mydb.sqlite')}"
     SQLALCHEMY_TRACK_MODIFICATIONS = False
-    DEBUG = True
\ No newline at end of file
+    DEBUG = True
+
+    # Klient HTTP dla API GIOŚ
+    GIOS_API_URL = "https://api.gios.gov.pl/pjp-api/v1/rest"
+    GIOS_POOL_SIZE = 10
+    GIOS_CONNECT_TIMEOUT = 3.05
+    GIOS_READ_TIMEOUT = 15
+    GIOS_MAX_CONCURRENCY = 8
+    GIOS_RATE_LIMIT = 10  # zapytań na sekundę
+    GIOS_RATE_BURST = 20
+    GIOS_PAGE_SIZE = 500  # elementów na stronę list (maksimum API)
+    GIOS_PAGE_WORKERS = 4  # liczba stron list pobieranych równolegle (wspólna pula procesu)
+
+    # Dyskowy cache odpowiedzi API GIOŚ, wspólny dla wszystkich procesów roboczych
+    # (None - wyłączony): maksymalny rozmiar oraz czas świeżości według endpointu,
+    # po którym odpowiedź jest rewalidowana (ETag / Last-Modified);
+    # HTTP_CACHE_MAX_AGE = None - domyślne czasy DEFAULT_MAX_AGE z http_cache.py
+    HTTP_CACHE_DIR = os.path.join(BASE_DIR, "instance", "http_cache")
+    HTTP_CACHE_MAX_BYTES = 200 * 1024 * 1024
+    HTTP_CACHE_MAX_AGE = None
+
+    # Cache katalogu stacji (w sekundach)
+    CATALOG_CACHE_TTL = 6 * 3600
+    CATALOG_CACHE_STALE_TTL = 24 * 3600
+    CATALOG_WARM_ON_STARTUP = True
+
+    # Geokodowanie lokalizacji (Nominatim) i trwały cache wyników (w sekundach)
+    GEOCODER_URL = "https://nominatim.openstreetmap.org/search"
+    GEOCODER_TIMEOUT = (3.05, 10)
+    GEOCODE_CACHE_TTL = 30 * 24 * 3600
+    GEOCODE_NEGATIVE_TTL = 24 * 3600
+    GEOCODE_CACHE_SIZE = 1024
+    GAZETTEER_TTL = 3600  # gazeter nazw z lokalnych tabel (podpowiedzi, geokodowanie bez sieci)
+
+    # Cache wyrenderowanych map stacji (liczba map, usuwanie LRU)
+    MAP_CACHE_SIZE = 32
+
+    # Synchronizacja całego archiwum (flask sync)
+    SYNC_WORKERS = 8
+    SYNC_BATCH_SIZE = 20
+
+    # Cykliczne pobieranie nowych pomiarów (flask poll): śledzone czujniki
+    # (id_stanowiska) i stacje, odstęp między cyklami w sekundach i jego
+    # losowe odchylenie (ułamek odstępu) oraz liczba jednoczesnych zapytań
+    POLL_SENSORS = []
+    POLL_STATIONS = []
+    POLL_INTERVAL = 3600
+    POLL_JITTER = 0.1
+    POLL_WORKERS = 4
+
+    # Wykresy: minimalna liczba punktów przy wyborze rozdzielczości agregatów
+    # oraz budżet punktów przekazywanych do przeglądarki (LTTB)
+    CHART_MIN_POINTS = 200
+    CHART_MAX_POINTS = 1000
+
+    # Liczba ostatnich pomiarów w tabeli widoku archiwalnego czujnika
+    ARCHIVE_TABLE_SIZE = 500
+
+    # JSON API (/api/v1): domyślny i maksymalny rozmiar strony
+    API_PAGE_SIZE = 100
+    API_MAX_PAGE_SIZE = 1000
+
+    # Eksport pomiarów: liczba wierszy odczytywanych z bazy naraz
+    EXPORT_CHUNK_SIZE = 1000
@@ -0,0 +1,32 @@
+"""Add unique key (sensor_id, data) to measurements
+
+Revision ID: 4f4e6c6a53c8
+Revises: 3a9bc5cadd81
+Create Date: 2026-10-17 09:12:41.503218
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4f4e6c6a53c8'
+down_revision = '3a9bc5cadd81'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # usuwamy duplikaty zapisane przed wprowadzeniem klucza - zostaje najstarszy wiersz
+    op.execute(
+        "DELETE FROM measurements WHERE id NOT IN "
+        "(SELECT MIN(id) FROM measurements GROUP BY sensor_id, data)"
+    )
+
+    with op.batch_alter_table('measurements', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_measurements_sensor_id_data', ['sensor_id', 'data'])
+
+
+def downgrade():
+    with op.batch_alter_table('measurements', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_measurements_sensor_id_data', type_='unique')
@@ -0,0 +1,33 @@
+"""Add last_valid_data to sensor_statistics
+
+Revision ID: a6c9d4e1f7b2
+Revises: f5b8c3d0e2a6
+Create Date: 2026-10-17 16:02:44.518203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a6c9d4e1f7b2'
+down_revision = 'f5b8c3d0e2a6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('sensor_statistics', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('last_valid_data', sa.DateTime(), nullable=True))
+
+    op.execute(
+        'UPDATE sensor_statistics SET last_valid_data = ('
+        '  SELECT MAX(m.data) FROM measurements m'
+        '  WHERE m.sensor_id = sensor_statistics.sensor_id AND m.wartosc IS NOT NULL'
+        ')'
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('sensor_statistics', schema=None) as batch_op:
+        batch_op.drop_column('last_valid_data')
@@ -0,0 +1,67 @@
+"""Measurement and AQI dates as DateTime, composite indexes
+
+Revision ID: b7c3e91d2a40
+Revises: 4f4e6c6a53c8
+Create Date: 2026-10-17 10:03:17.284551
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7c3e91d2a40'
+down_revision = '4f4e6c6a53c8'
+branch_labels = None
+depends_on = None
+
+
+def _backfill_sqlite(table, column):
+    # SQLite przechowuje DateTime jako tekst w formacie "YYYY-MM-DD HH:MM:SS.ffffff";
+    # daty z API ("YYYY-MM-DD HH:MM:SS" lub "YYYY-MM-DD") doprowadzamy do tego formatu,
+    # aby porównania i klucz unikalny działały na jednolitych wartościach
+    op.execute(f"UPDATE {table} SET {column} = replace({column}, 'T', ' ')")
+    op.execute(f"UPDATE {table} SET {column} = {column} || ' 00:00:00.000000' WHERE length({column}) = 10")
+    op.execute(f"UPDATE {table} SET {column} = {column} || '.000000' WHERE length({column}) = 19")
+
+
+def upgrade():
+    is_sqlite = op.get_bind().dialect.name == 'sqlite'
+    if is_sqlite:
+        _backfill_sqlite('measurements', 'data')
+        _backfill_sqlite('station_index', 'calculation_date')
+
+    # reflect_args: w trybie batch (SQLite) kolumna jest od razu traktowana jako DateTime,
+    # dzięki czemu Alembic nie robi CAST(... AS DATETIME), który w SQLite obcina tekst daty do liczby
+    with op.batch_alter_table('measurements', schema=None,
+                              reflect_args=[sa.Column('data', sa.DateTime(), nullable=False)]) as batch_op:
+        batch_op.alter_column('data',
+               existing_type=sa.VARCHAR(length=50),
+               type_=sa.DateTime(),
+               existing_nullable=False,
+               postgresql_using='data::timestamp')
+
+    with op.batch_alter_table('station_index', schema=None,
+                              reflect_args=[sa.Column('calculation_date', sa.DateTime(), nullable=False)]) as batch_op:
+        batch_op.alter_column('calculation_date',
+               existing_type=sa.VARCHAR(length=50),
+               type_=sa.DateTime(),
+               existing_nullable=False,
+               postgresql_using='calculation_date::timestamp')
+        batch_op.create_index('ix_station_index_station_id_calculation_date',
+               ['station_id', 'calculation_date'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('station_index', schema=None) as batch_op:
+        batch_op.drop_index('ix_station_index_station_id_calculation_date')
+        batch_op.alter_column('calculation_date',
+               existing_type=sa.DateTime(),
+               type_=sa.VARCHAR(length=50),
+               existing_nullable=False)
+
+    with op.batch_alter_table('measurements', schema=None) as batch_op:
+        batch_op.alter_column('data',
+               existing_type=sa.DateTime(),
+               type_=sa.VARCHAR(length=50),
+               existing_nullable=False)
@@ -0,0 +1,82 @@
+"""Add sensor_statistics table
+
+Revision ID: c1d8a5f3e2b7
+Revises: b7c3e91d2a40
+Create Date: 2026-10-17 11:24:05.917342
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c1d8a5f3e2b7'
+down_revision = 'b7c3e91d2a40'
+branch_labels = None
+depends_on = None
+
+BACKFILL_CHUNK_SIZE = 5000
+
+measurements = sa.table('measurements',
+    sa.column('sensor_id', sa.Integer()),
+    sa.column('data', sa.DateTime()),
+    sa.column('wartosc', sa.Float())
+)
+
+
+def upgrade():
+    sensor_statistics = op.create_table('sensor_statistics',
+    sa.Column('sensor_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.Column('missing_count', sa.Integer(), nullable=False),
+    sa.Column('total', sa.Float(), nullable=False),
+    sa.Column('total_sq', sa.Float(), nullable=False),
+    sa.Column('min', sa.Float(), nullable=True),
+    sa.Column('max', sa.Float(), nullable=True),
+    sa.Column('first_data', sa.DateTime(), nullable=True),
+    sa.Column('last_data', sa.DateTime(), nullable=True),
+    sa.Column('time_origin', sa.DateTime(), nullable=True),
+    sa.Column('sum_t', sa.Float(), nullable=False),
+    sa.Column('sum_tt', sa.Float(), nullable=False),
+    sa.Column('sum_ty', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('sensor_id')
+    )
+
+    # wypełnienie statystyk z istniejących pomiarów (SQLite i PostgreSQL): pomiary
+    # czytane są strumieniowo po czujnikach, a czas liczony w godzinach od
+    # najstarszego pomiaru czujnika (time_origin), jak w SensorStatistics.add
+    bind = op.get_bind()
+    rows = bind.execution_options(yield_per=BACKFILL_CHUNK_SIZE).execute(
+        sa.select(measurements.c.sensor_id, measurements.c.data, measurements.c.wartosc)
+        .order_by(measurements.c.sensor_id, measurements.c.data)
+    )
+    batch = []
+    stats = None
+    for sensor_id, data, wartosc in rows:
+        if stats is None or stats['sensor_id'] != sensor_id:
+            if len(batch) >= BACKFILL_CHUNK_SIZE:
+                op.bulk_insert(sensor_statistics, batch)
+                batch = []
+            stats = {'sensor_id': sensor_id, 'count': 0, 'missing_count': 0, 'total': 0.0, 'total_sq': 0.0,
+                     'min': None, 'max': None, 'first_data': data, 'last_data': data, 'time_origin': data,
+                     'sum_t': 0.0, 'sum_tt': 0.0, 'sum_ty': 0.0}
+            batch.append(stats)
+        stats['last_data'] = data
+        if wartosc is None:
+            stats['missing_count'] += 1
+            continue
+        t = (data - stats['time_origin']).total_seconds() / 3600.0
+        stats['count'] += 1
+        stats['total'] += wartosc
+        stats['total_sq'] += wartosc * wartosc
+        stats['min'] = wartosc if stats['min'] is None else min(stats['min'], wartosc)
+        stats['max'] = wartosc if stats['max'] is None else max(stats['max'], wartosc)
+        stats['sum_t'] += t
+        stats['sum_tt'] += t * t
+        stats['sum_ty'] += t * wartosc
+    if batch:
+        op.bulk_insert(sensor_statistics, batch)
+
+
+def downgrade():
+    op.drop_table('sensor_statistics')
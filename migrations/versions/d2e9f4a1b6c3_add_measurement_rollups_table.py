@@ -0,0 +1,75 @@
+"""Add measurement_rollups table
+
+Revision ID: d2e9f4a1b6c3
+Revises: c1d8a5f3e2b7
+Create Date: 2026-10-17 12:08:52.640193
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2e9f4a1b6c3'
+down_revision = 'c1d8a5f3e2b7'
+branch_labels = None
+depends_on = None
+
+BACKFILL_CHUNK_SIZE = 5000
+
+measurements = sa.table('measurements',
+    sa.column('sensor_id', sa.Integer()),
+    sa.column('data', sa.DateTime()),
+    sa.column('wartosc', sa.Float())
+)
+
+# początek przedziału każdej rozdzielczości (jak bucket_start w modelu MeasurementRollup)
+BUCKET_STARTS = {
+    'hour': lambda data: data.replace(minute=0, second=0, microsecond=0),
+    'day': lambda data: data.replace(hour=0, minute=0, second=0, microsecond=0),
+    'month': lambda data: data.replace(day=1, hour=0, minute=0, second=0, microsecond=0),
+}
+
+
+def _rollup_rows(sensor_id, buckets):
+    return [
+        {'sensor_id': sensor_id, 'resolution': resolution, 'bucket': bucket,
+         'count': len(values), 'total': sum(values), 'min': min(values), 'max': max(values)}
+        for (resolution, bucket), values in buckets.items()
+    ]
+
+
+def upgrade():
+    measurement_rollups = op.create_table('measurement_rollups',
+    sa.Column('sensor_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('resolution', sa.String(length=5), nullable=False),
+    sa.Column('bucket', sa.DateTime(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.Column('total', sa.Float(), nullable=False),
+    sa.Column('min', sa.Float(), nullable=False),
+    sa.Column('max', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('sensor_id', 'resolution', 'bucket')
+    )
+
+    # wypełnienie agregatów z istniejących pomiarów (SQLite i PostgreSQL);
+    # pomiary czytane są strumieniowo, a przedziały grupowane osobno dla każdego czujnika
+    bind = op.get_bind()
+    rows = bind.execution_options(yield_per=BACKFILL_CHUNK_SIZE).execute(
+        sa.select(measurements.c.sensor_id, measurements.c.data, measurements.c.wartosc)
+        .where(measurements.c.wartosc.is_not(None))
+        .order_by(measurements.c.sensor_id, measurements.c.data)
+    )
+    current_sensor, buckets = None, {}
+    for sensor_id, data, wartosc in rows:
+        if sensor_id != current_sensor:
+            if buckets:
+                op.bulk_insert(measurement_rollups, _rollup_rows(current_sensor, buckets))
+            current_sensor, buckets = sensor_id, {}
+        for resolution, bucket_start in BUCKET_STARTS.items():
+            buckets.setdefault((resolution, bucket_start(data)), []).append(wartosc)
+    if buckets:
+        op.bulk_insert(measurement_rollups, _rollup_rows(current_sensor, buckets))
+
+
+def downgrade():
+    op.drop_table('measurement_rollups')
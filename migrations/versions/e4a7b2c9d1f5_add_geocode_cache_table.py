@@ -0,0 +1,30 @@
+"""Add geocode_cache table
+
+Revision ID: e4a7b2c9d1f5
+Revises: d2e9f4a1b6c3
+Create Date: 2026-10-17 13:02:31.418276
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4a7b2c9d1f5'
+down_revision = 'd2e9f4a1b6c3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('geocode_cache',
+    sa.Column('address', sa.String(length=200), nullable=False),
+    sa.Column('lat', sa.Float(), nullable=True),
+    sa.Column('lon', sa.Float(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('address')
+    )
+
+
+def downgrade():
+    op.drop_table('geocode_cache')
@@ -0,0 +1,41 @@
+"""Add natural key (gmina, powiat, wojewodztwo) to gminy
+
+Revision ID: f5b8c3d0e2a6
+Revises: e4a7b2c9d1f5
+Create Date: 2026-10-17 13:41:07.285914
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f5b8c3d0e2a6'
+down_revision = 'e4a7b2c9d1f5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # miasta wskazujące na zduplikowaną gminę przepinamy na najstarszy wiersz tej gminy
+    op.execute(
+        'UPDATE cities SET gmina_id = ('
+        '  SELECT MIN(g2.id) FROM gminy g JOIN gminy g2'
+        '    ON g2."gminaName" = g."gminaName"'
+        '   AND g2."powiatName" = g."powiatName"'
+        '   AND g2."wojewodztwoName" = g."wojewodztwoName"'
+        '  WHERE g.id = cities.gmina_id'
+        ')'
+    )
+    op.execute(
+        'DELETE FROM gminy WHERE id NOT IN '
+        '(SELECT MIN(id) FROM gminy GROUP BY "gminaName", "powiatName", "wojewodztwoName")'
+    )
+
+    with op.batch_alter_table('gminy', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_gminy_natural_key', ['gminaName', 'powiatName', 'wojewodztwoName'])
+
+
+def downgrade():
+    with op.batch_alter_table('gminy', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_gminy_natural_key', type_='unique')
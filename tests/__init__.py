@@ -25,7 +25,7 @@ def test_fetch_station_index_success(downloader):
             "Data danych źródłowych, z których policzono wartość indeksu dla wskaźnika st": "2025-08-27"
         }
     }
-    with patch("requests.get", return_value=mock_requests_get(fake_response)):
+    with patch("requests.Session.get", return_value=mock_requests_get(fake_response)):
         aqi = downloader.fetch_station_index(station_id)
         assert aqi.station_id == 123
         assert aqi.index_value == 50
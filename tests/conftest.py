@@ -0,0 +1,125 @@
+import json
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import pytest
+from app import create_app, db
+from config import Config
+
+
+class TestConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = "sqlite://"
+    CATALOG_WARM_ON_STARTUP = False
+    HTTP_CACHE_DIR = None
+
+
+@pytest.fixture
+def app():
+    app = create_app(TestConfig)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+# -----------------------------
+# Lokalny zamiennik API GIOŚ
+# -----------------------------
+FAKE_API_DELAY = 0.2
+
+FAKE_API_RESPONSES = {
+    "/station/findAll": {
+        "Lista stacji pomiarowych": [
+            {
+                "Identyfikator stacji": 1,
+                "Kod stacji": "LdLodzCzerni",
+                "Nazwa stacji": "Łódź, ul. Czernika",
+                "WGS84 φ N": "51.75",
+                "WGS84 λ E": "19.53",
+                "Identyfikator miasta": 10,
+                "Nazwa miasta": "Łódź",
+                "Gmina": "Łódź",
+                "Powiat": "Łódź",
+                "Województwo": "ŁÓDZKIE",
+                "Ulica": "ul. Czernika"
+            }
+        ]
+    },
+    "/station/sensors/1": {
+        "Lista stanowisk pomiarowych dla podanej stacji": [
+            {
+                "Identyfikator stanowiska": 11,
+                "Identyfikator stacji": 1,
+                "Wskaźnik": "pył zawieszony PM10",
+                "Wskaźnik - wzór": "PM10",
+                "Wskaźnik - kod": "PM10",
+                "Id wskaźnika": 3
+            }
+        ]
+    },
+    "/data/getData/11": {
+        "Lista danych pomiarowych": [
+            {"Kod stanowiska": "K11", "Data": "2025-08-27 12:00:00", "Wartość": 10.5},
+            {"Kod stanowiska": "K11", "Data": "2025-08-27 11:00:00", "Wartość": 12.0}
+        ]
+    },
+    "/aqindex/getIndex/1": {
+        "AqIndex": {
+            "Identyfikator stacji pomiarowej": 1,
+            "Data wykonania obliczeń indeksu": "2025-08-27 12:20:00",
+            "Wartość indeksu": 1,
+            "Nazwa kategorii indeksu": "Dobry",
+            "Data danych źródłowych, z których policzono wartość indeksu dla wskaźnika st": "2025-08-27 12:00:00"
+        }
+    },
+}
+
+
+class FakeGiosHandler(BaseHTTPRequestHandler):
+    """
+    Zwraca odpowiedzi z FAKE_API_RESPONSES, każdą opóźnioną o `delay` sekund
+    (wartość int to kod błędu HTTP zwracany zamiast odpowiedzi).
+    """
+    delay = 0
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        time.sleep(self.delay)
+        data = FAKE_API_RESPONSES.get(self.path.split("?")[0])
+        if data is None or isinstance(data, int):
+            self.send_response(data or 404)
+            self.end_headers()
+            return
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def _serve(delay):
+    handler = type("Handler", (FakeGiosHandler,), {"delay": delay})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+@pytest.fixture
+def fake_api():
+    server = _serve(0)
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def slow_fake_api():
+    server = _serve(FAKE_API_DELAY)
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,127 @@
+from datetime import datetime, timedelta
+from unittest.mock import patch
+import pytest
+from app import create_app, db
+from app.models import StationIndex
+from app.services.catalog_service import configure_catalog_cache
+from app.services.data_service import DataService
+from app.services.spatial_index import SpatialIndex
+from tests.conftest import TestConfig
+
+
+@pytest.fixture
+def client(app, fake_api):
+    configure_catalog_cache(fake_api)
+    yield app.test_client()
+    configure_catalog_cache(app.config["GIOS_API_URL"])
+
+
+def add_measurements(count):
+    start = datetime(2025, 8, 1)
+    DataService()._insert_measurements([
+        {"sensor_id": 11, "kod_stanowiska": "K11", "data": start + timedelta(hours=h), "wartosc": float(h)}
+        for h in range(count)
+    ])
+
+# -----------------------------
+# Testy katalogu stacji
+# -----------------------------
+def test_catalog_is_warmed_on_first_request_only():
+    config = type("WarmConfig", (TestConfig,), {"CATALOG_WARM_ON_STARTUP": True})
+    with patch("app.services.catalog_service.warm_catalog") as warm_catalog:
+        app = create_app(config)
+        assert warm_catalog.call_count == 0  # np. flask db upgrade / flask sync
+
+        client = app.test_client()
+        client.get("/api/stations/unknown")
+        client.get("/api/stations/unknown")
+    assert warm_catalog.call_count == 1
+
+def test_stations_with_field_selection(client):
+    response = client.get("/api/v1/stations?city=lodz&fields=id,stationName,gegrLat")
+
+    assert response.status_code == 200
+    assert response.get_json() == {
+        "data": [{"id": 1, "stationName": "Łódź, ul. Czernika", "gegrLat": 51.75}],
+        "next": None
+    }
+
+def test_stations_unknown_field_is_rejected(client):
+    response = client.get("/api/v1/stations?fields=id,foo")
+    assert response.status_code == 400
+    assert "foo" in response.get_json()["error"]
+
+def test_station_not_found(client):
+    assert client.get("/api/v1/stations/999").status_code == 404
+
+# -----------------------------
+# Testy pomiarów i AQI
+# -----------------------------
+def test_measurements_keyset_pagination(client):
+    add_measurements(5)
+
+    first = client.get("/api/v1/sensors/11/measurements?limit=2").get_json()
+    assert [m["wartosc"] for m in first["data"]] == [0.0, 1.0]
+    assert first["next"] == "2025-08-01T01:00:00"
+
+    second = client.get(f"/api/v1/sensors/11/measurements?limit=2&after={first['next']}").get_json()
+    assert [m["wartosc"] for m in second["data"]] == [2.0, 3.0]
+
+    last = client.get("/api/v1/sensors/11/measurements?limit=2&after=2025-08-01T03:00:00").get_json()
+    assert [m["wartosc"] for m in last["data"]] == [4.0]
+    assert last["next"] is None
+
+def test_measurements_etag_follows_data_version(client):
+    add_measurements(3)
+    response = client.get("/api/v1/sensors/11/measurements")
+    etag = response.headers["ETag"]
+
+    assert client.get("/api/v1/sensors/11/measurements", headers={"If-None-Match": etag}).status_code == 304
+
+    add_measurements(4)  # jeden nowy pomiar
+    response = client.get("/api/v1/sensors/11/measurements", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert len(response.get_json()["data"]) == 4
+
+def test_station_aqi_history(client):
+    for hour in (10, 11):
+        db.session.add(StationIndex(station_id=1, calculation_date=datetime(2025, 8, 27, hour), index_value=1,
+                                    index_category="Dobry", calculation_date_st="2025-08-27"))
+    db.session.commit()
+
+    response = client.get("/api/v1/stations/1/aqi?start=2025-08-27T11:00:00&fields=calculation_date")
+    assert response.get_json()["data"] == [{"calculation_date": "2025-08-27T11:00:00"}]
+
+def test_invalid_date_is_rejected(client):
+    assert client.get("/api/v1/sensors/11/measurements?start=wczoraj").status_code == 400
+
+def test_stations_nearby(client):
+    response = client.get("/api/v1/stations/nearby?lat=51.76&lon=19.46&k=5&fields=id,distance_km")
+    data = response.get_json()["data"]
+    assert [item["id"] for item in data] == [1]
+    assert data[0]["distance_km"] < 10
+
+    assert client.get("/api/v1/stations/nearby?lat=51.76&lon=19.46&radius=1").get_json()["data"] == []
+    assert client.get("/api/v1/stations/nearby?lat=51.76").status_code == 400
+
+def test_stations_nearby_k_is_validated_and_capped(client, app):
+    for k in (0, -3):
+        assert client.get(f"/api/v1/stations/nearby?lat=51.76&lon=19.46&k={k}").status_code == 400
+
+    app.config["API_MAX_PAGE_SIZE"] = 50
+    with patch.object(SpatialIndex, "nearest", return_value=[]) as nearest:
+        client.get("/api/v1/stations/nearby?lat=51.76&lon=19.46&k=100000")
+    assert nearest.call_args.args[2] == 50
+
+def test_archive_view_reads_bounded_table_and_statistics(client, fake_api, monkeypatch):
+    from app.routes import station_routes
+    monkeypatch.setattr(station_routes, "api_address", fake_api)
+    monkeypatch.setattr(station_routes.Config, "ARCHIVE_TABLE_SIZE", 5)
+    add_measurements(30)
+
+    with patch.object(DataService, "get_time_series", side_effect=AssertionError("pełna historia")):
+        response = client.get("/archive/1/11")
+
+    assert response.status_code == 200
+    assert response.data.count(b"<td>2025-08-02 0") == 5  # ostatnie 5 z 30 godzin
+
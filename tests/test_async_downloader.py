@@ -0,0 +1,40 @@
+import asyncio
+import time
+from app.services.async_downloader import AsyncDownloader
+from app.services.http_client import create_session
+from tests.conftest import FAKE_API_DELAY
+
+
+# -----------------------------
+# Testy dla AsyncDownloader
+# -----------------------------
+def test_fetches_run_concurrently(slow_fake_api):
+    async def fetch_all():
+        downloader = AsyncDownloader(slow_fake_api, session=create_session())
+        return await downloader.gather(
+            downloader.fetch_station_sensors_list(1),
+            downloader.fetch_measurement(11),
+            downloader.fetch_station_index(1)
+        )
+
+    start = time.perf_counter()
+    sensors, measurements, aqi = asyncio.run(fetch_all())
+    elapsed = time.perf_counter() - start
+
+    assert sensors[0].id_stanowiska == 11
+    assert measurements[0].wartosc == 10.5
+    assert aqi.index_value == 1
+    # trzy zapytania po FAKE_API_DELAY sekund - współbieżnie trwają ok. jednego opóźnienia
+    assert elapsed < 2 * FAKE_API_DELAY
+
+def test_concurrency_limit(slow_fake_api):
+    async def fetch_all():
+        downloader = AsyncDownloader(slow_fake_api, max_concurrency=1, session=create_session())
+        return await downloader.gather(
+            downloader.fetch_measurement(11),
+            downloader.fetch_measurement(11)
+        )
+
+    start = time.perf_counter()
+    asyncio.run(fetch_all())
+    assert time.perf_counter() - start >= 2 * FAKE_API_DELAY
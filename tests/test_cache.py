@@ -0,0 +1,71 @@
+import time
+import pytest
+from app.services.cache import TTLCache
+
+
+# -----------------------------
+# Testy dla TTLCache
+# -----------------------------
+def test_get_or_load_caches_value():
+    cache = TTLCache(ttl=60)
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return {"a": 1}
+
+    assert cache.get_or_load("k", loader) == {"a": 1}
+    assert cache.get_or_load("k", loader) == {"a": 1}
+    assert len(calls) == 1
+
+def test_empty_result_is_not_cached():
+    cache = TTLCache(ttl=60)
+    assert cache.get_or_load("k", lambda: {}) == {}
+    assert cache.get("k") is None
+
+def test_lru_eviction():
+    cache = TTLCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+def test_stale_value_served_while_refreshing():
+    cache = TTLCache(ttl=0.05, stale_ttl=60)
+    cache.set("k", "old")
+    time.sleep(0.06)
+
+    result = cache.get_or_load("k", lambda: "new")
+    assert result == "old"
+
+    deadline = time.time() + 1
+    while cache.peek("k") != "new" and time.time() < deadline:
+        time.sleep(0.01)
+    assert cache.peek("k") == "new"
+
+def test_failed_refresh_keeps_stale_value():
+    cache = TTLCache(ttl=0.01, stale_ttl=0)
+    cache.set("k", "old")
+    time.sleep(0.02)
+    assert cache.get_or_load("k", lambda: {}) == "old"
+
+def test_get_or_load_joins_load_in_progress():
+    cache = TTLCache(ttl=60)
+    calls = []
+
+    def slow_loader():
+        calls.append(1)
+        time.sleep(0.1)
+        return "catalog"
+
+    cache.refresh_in_background("k", slow_loader)  # np. rozgrzewanie przy pierwszym żądaniu
+    assert cache.get_or_load("k", slow_loader) == "catalog"
+    assert len(calls) == 1
+
+def test_get_or_load_retries_after_failed_load_in_progress():
+    cache = TTLCache(ttl=60)
+    cache.refresh_in_background("k", lambda: time.sleep(0.05) or {})
+    assert cache.get_or_load("k", lambda: "catalog") == "catalog"
@@ -0,0 +1,61 @@
+from datetime import datetime, timedelta
+import numpy as np
+import pytest
+from app.models.calculation import Calculation
+from app.models.measurement import Measurement
+from app.services.calculation_service import CalculationService
+from app.services.time_series import TimeSeries
+
+
+def make_measurements(values, start=datetime(2025, 8, 27)):
+    return [
+        Measurement(kod_stanowiska="K1", data=start + timedelta(hours=i), wartosc=v)
+        for i, v in enumerate(values)
+    ]
+
+# -----------------------------
+# Testy dla CalculationService
+# -----------------------------
+def test_calculation_model_from_measurements():
+    result = CalculationService(make_measurements([1.0, None, 3.0, 5.0])).calculation_model()
+
+    assert isinstance(result, Calculation)
+    assert result.min == 1.0
+    assert result.max == 5.0
+    assert result.srednia == 3.0
+    assert result.trend == "rosnący"
+    assert result.udzial_brakow == 0.25
+    assert result.percentyle[50] == 3.0
+    assert result.nachylenie > 0
+
+def test_trend_uses_timestamps_not_list_order():
+    # API GIOŚ zwraca pomiary od najnowszego - trend ma wynikać z czasu pomiaru
+    measurements = make_measurements([1.0, 2.0, 3.0])
+    measurements.reverse()
+    assert CalculationService(measurements).trend() == "rosnący"
+
+def test_time_series_input_matches_measurements():
+    measurements = make_measurements([4.0, None, 3.0, 1.0])
+    expected = CalculationService(measurements).calculation_model()
+    assert CalculationService(TimeSeries.from_rows(measurements)).calculation_model() == expected
+
+def test_raw_array_input():
+    result = CalculationService(np.array([5.0, 4.0, np.nan, 1.0])).calculation_model()
+    assert result.min == 1.0
+    assert result.trend == "malejący"
+
+def test_constant_and_short_series():
+    assert CalculationService([2.0, 2.0, 2.0]).trend() == "stały"
+    assert CalculationService([2.0]).trend() == "za mało danych do określenia trendu"
+
+def test_empty_and_all_missing():
+    assert CalculationService([]).calculation_model().min is None
+    result = CalculationService(make_measurements([None, None])).calculation_model()
+    assert result.min is None
+    assert result.udzial_brakow == 1.0
+    assert result.trend == "za mało danych do określenia trendu"
+
+def test_std_matches_numpy():
+    values = np.random.default_rng(0).normal(20, 5, 100_000)
+    result = CalculationService(values).calculation_model()
+    assert result.odchylenie == pytest.approx(values.std(), abs=1e-3)
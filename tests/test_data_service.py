@@ -0,0 +1,252 @@
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import event
+from app import db
+from app.models import City, Gmina, Measurement, MeasurementRollup, Station, StationIndex
+from app.models.dto import GminaData, CityData, StationData, SensorData, MeasurementData, StationIndexData
+from app.models.sensor import Sensor
+from app.services.calculation_service import CalculationService
+from app.services.data_service import DataService, check_database_support
+
+
+def make_measurement(data, wartosc):
+    return Measurement(kod_stanowiska="K11", data=data, wartosc=wartosc)
+
+def make_sensor():
+    return Sensor(id_stanowiska=11, id_stacji=1, wskaznik="PM10", wskaznik_wzor="PM10",
+                  wskaznik_kod="PM10", id_wskaznika=3)
+
+# -----------------------------
+# Testy zapisu pomiarów
+# -----------------------------
+def test_insert_measurements_ignores_duplicates(app):
+    service = DataService()
+    rows = [
+        {"sensor_id": 11, "kod_stanowiska": "K11", "data": datetime(2025, 8, 27, 12), "wartosc": 1.0},
+        {"sensor_id": 11, "kod_stanowiska": "K11", "data": datetime(2025, 8, 27, 13), "wartosc": 2.0},
+    ]
+    assert len(service._insert_measurements(rows)) == 2
+
+    rows.append({"sensor_id": 11, "kod_stanowiska": "K11", "data": datetime(2025, 8, 27, 14), "wartosc": 3.0})
+    inserted = service._insert_measurements(rows)
+    assert [r.wartosc for r in inserted] == [3.0]
+    assert Measurement.query.count() == 3
+
+def test_insert_measurements_fills_missing_values_only(app):
+    service = DataService()
+    row = {"sensor_id": 11, "kod_stanowiska": "K11", "data": datetime(2025, 8, 27, 12)}
+    service._insert_measurements([{**row, "wartosc": None}])
+
+    assert len(service._insert_measurements([{**row, "wartosc": 4.0}])) == 1
+    assert len(service._insert_measurements([{**row, "wartosc": 9.0}])) == 0  # wartości nie są nadpisywane
+    assert Measurement.query.one().wartosc == 4.0
+    stats = service.get_sensor_statistics(11)
+    assert (stats.count, stats.missing_count, stats.total) == (1, 0, 4.0)
+
+def test_fill_creates_missing_statistics_row(app):
+    # pomiar zapisany przed wprowadzeniem statystyk (baza bez wypełnionych statystyk)
+    db.session.add(Measurement(sensor_id=11, kod_stanowiska="K11", data=datetime(2025, 8, 27, 12), wartosc=None))
+    db.session.commit()
+    service = DataService()
+
+    assert len(service._insert_measurements([
+        {"sensor_id": 11, "kod_stanowiska": "K11", "data": datetime(2025, 8, 27, 12), "wartosc": 4.0}
+    ])) == 1
+    stats = service.get_sensor_statistics(11)
+    assert (stats.count, stats.missing_count, stats.total) == (1, 0, 4.0)
+
+def test_save_bulk_is_idempotent(app):
+    service = DataService()
+    measurements = {11: [make_measurement(datetime(2025, 8, 27, 12), 1.0),
+                         make_measurement(datetime(2025, 8, 27, 13), None)]}
+
+    assert service.save_bulk([], [make_sensor()], measurements, []) == 2
+    assert service.save_bulk([], [make_sensor()], measurements, []) == 0
+    assert Measurement.query.count() == 2
+    assert Sensor.query.count() == 1
+
+# -----------------------------
+# Testy odczytu zakresu pomiarów
+# -----------------------------
+def test_get_measurements_in_range(app):
+    service = DataService()
+    service._insert_measurements([
+        {"sensor_id": 11, "kod_stanowiska": "K11", "data": datetime(2025, 8, day, 12), "wartosc": float(day)}
+        for day in range(1, 11)
+    ] + [{"sensor_id": 12, "kod_stanowiska": "K12", "data": datetime(2025, 8, 5, 12), "wartosc": 99.0}])
+
+    result = service.get_measurements_in_range(11, datetime(2025, 8, 3), datetime(2025, 8, 6))
+    assert [m.wartosc for m in result] == [3.0, 4.0, 5.0]
+
+    page = service.get_measurements_in_range(11, datetime(2025, 8, 1), limit=2, offset=4)
+    assert [m.wartosc for m in page] == [5.0, 6.0]
+
+    latest = service.get_measurements_in_range(11, limit=3, newest_first=True)
+    assert [m.wartosc for m in latest] == [10.0, 9.0, 8.0]
+
+# -----------------------------
+# Testy statystyk przyrostowych
+# -----------------------------
+def test_sensor_statistics_match_full_scan(app):
+    service = DataService()
+    values = [5.0, None, 7.5, 6.0, 9.0, None, 11.0]
+    first = {11: [make_measurement(datetime(2025, 8, 27, h), v) for h, v in enumerate(values[:4])]}
+    second = {11: [make_measurement(datetime(2025, 8, 27, h + 4), v) for h, v in enumerate(values[4:])]}
+
+    service.save_bulk([], [make_sensor()], first, [])
+    service.save_bulk([], [], second, [])
+    service.save_bulk([], [], first, [])  # duplikaty nie zmieniają statystyk
+
+    stats = service.get_sensor_statistics(11)
+    assert stats.count == 5
+    assert stats.missing_count == 2
+
+    incremental = CalculationService.calculation_from_statistics(stats)
+    full = CalculationService(service.get_measurements_list_from_db(11)).calculation_model()
+    assert incremental.min == full.min
+    assert incremental.max == full.max
+    assert incremental.srednia == full.srednia
+    assert incremental.odchylenie == pytest.approx(full.odchylenie, abs=1e-3)
+    assert incremental.nachylenie == pytest.approx(full.nachylenie, rel=1e-6)
+    assert incremental.trend == full.trend
+    assert incremental.udzial_brakow == full.udzial_brakow
+
+def test_get_time_series(app):
+    service = DataService()
+    service._insert_measurements([
+        {"sensor_id": 11, "kod_stanowiska": "K11", "data": datetime(2025, 8, 27, h), "wartosc": v}
+        for h, v in ((14, 3.0), (12, 1.0), (13, None), (15, 4.0))
+    ])
+
+    series = service.get_time_series(11, datetime(2025, 8, 27, 12), datetime(2025, 8, 27, 15))
+    assert [p.data.hour for p in series] == [12, 13, 14]
+    assert [p.wartosc for p in series] == [1.0, None, 3.0]
+    assert len(service.get_time_series(99)) == 0
+
+# -----------------------------
+# Testy agregatów godzinowych / dobowych / miesięcznych
+# -----------------------------
+def test_rollups_are_maintained_incrementally(app):
+    service = DataService()
+    first = [{"sensor_id": 11, "kod_stanowiska": "K11", "data": datetime(2025, 8, 31, h), "wartosc": float(h)}
+             for h in range(20, 24)]
+    second = [{"sensor_id": 11, "kod_stanowiska": "K11", "data": datetime(2025, 9, 1, h), "wartosc": float(h)}
+              for h in range(0, 4)] + [
+             {"sensor_id": 11, "kod_stanowiska": "K11", "data": datetime(2025, 9, 1, 4), "wartosc": None}]
+    service._insert_measurements(first)
+    service._insert_measurements(second + first)  # duplikaty nie mogą zawyżyć agregatów
+
+    rollups = {(r.resolution, r.bucket): r for r in MeasurementRollup.query.all()}
+    august = rollups[("month", datetime(2025, 8, 1))]
+    assert (august.count, august.total, august.min, august.max) == (4, 86.0, 20.0, 23.0)
+    september_day = rollups[("day", datetime(2025, 9, 1))]
+    assert (september_day.count, september_day.min, september_day.max) == (4, 0.0, 3.0)
+    assert september_day.mean == 1.5
+    assert ("hour", datetime(2025, 9, 1, 4)) not in rollups
+    assert sum(1 for r in rollups if r[0] == "hour") == 8
+
+def test_check_database_support():
+    check_database_support("sqlite:///mydb.sqlite")
+    check_database_support("postgresql+psycopg2://user@localhost/air")
+    with pytest.raises(RuntimeError, match="mysql"):
+        check_database_support("mysql://user@localhost/air")
+
+def test_choose_resolution():
+    start = datetime(2025, 1, 1)
+    assert DataService.choose_resolution(start, datetime(2026, 1, 1), min_points=200) == "day"
+    assert DataService.choose_resolution(start, datetime(2025, 2, 1), min_points=200) == "hour"
+    assert DataService.choose_resolution(start, datetime(2045, 1, 1), min_points=200) == "month"
+
+def test_get_series_reads_daily_rollups_for_long_range(app):
+    service = DataService()
+    start = datetime(2025, 1, 1)
+    service._insert_measurements([
+        {"sensor_id": 11, "kod_stanowiska": "K11", "data": start + timedelta(hours=h), "wartosc": float(h % 24)}
+        for h in range(365 * 24)
+    ])
+
+    series = service.get_series(11, min_points=200)
+    assert len(series) == 365
+    assert series[0].data == start
+    assert series[0].wartosc == pytest.approx(11.5)
+    assert len(service.get_series(11, start, datetime(2025, 1, 3), min_points=200)) == 48
+
+# -----------------------------
+# Testy liczby zapytań przy odczycie stacji
+# -----------------------------
+@pytest.fixture
+def count_queries(app):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+
+def add_stations(count):
+    for i in range(1, count + 1):
+        city = City(id=i, name=f"City{i}", gmina=Gmina(id=i, gminaName=f"G{i}", powiatName=f"P{i}",
+                                                       wojewodztwoName="W"))
+        db.session.add(Station(id=i, stationCode=f"S{i}", stationName=f"Station{i}", gegrLat="52.0",
+                               gegrLon="19.0", city=city))
+        for k in range(3):
+            db.session.add(Sensor(id_stanowiska=i * 10 + k, id_stacji=i, wskaznik="PM10",
+                                  wskaznik_kod="PM10", id_wskaznika=3))
+    db.session.commit()
+    db.session.expunge_all()
+
+def test_stations_list_query_count_is_constant(app, count_queries):
+    add_stations(10)
+    count_queries.clear()
+
+    stations = DataService().get_stations_list_from_db()
+    names = [(s.city.name, s.city.gmina.powiatName) for s in stations]
+
+    assert len(names) == 10
+    assert len(count_queries) == 1
+
+def test_get_station_loads_city_gmina_and_sensors(app, count_queries):
+    add_stations(3)
+    count_queries.clear()
+
+    station = DataService().get_station(2)
+    assert station.city.gmina.gminaName == "G2"
+    assert sorted(s.id_stanowiska for s in station.sensors) == [20, 21, 22]
+    assert len(count_queries) == 2
+    assert DataService().get_station(99) is None
+
+def test_save_stations_deduplicates_gminy_and_cities(app):
+    gmina = Gmina(gminaName="Łódź", powiatName="Łódź", wojewodztwoName="łódzkie")
+    city = City(id=1, name="Łódź", gmina=gmina)
+    stations = [Station(id=i, stationCode=f"S{i}", stationName=f"Station{i}", gegrLat="51.7",
+                        gegrLon="19.4", city=city) for i in (1, 2)]
+    other = Station(id=3, stationCode="S3", stationName="Station3", gegrLat="51.8", gegrLon="19.5",
+                    city=City(id=2, name="Łódź-Widzew",
+                              gmina=Gmina(gminaName="Łódź", powiatName="Łódź", wojewodztwoName="łódzkie")))
+
+    service = DataService()
+    service.save_stations(stations)
+    service.save_stations(stations + [other])
+    db.session.commit()
+
+    assert Gmina.query.count() == 1
+    assert City.query.count() == 2
+    assert Station.query.count() == 3
+    assert {c.gmina_id for c in City.query} == {Gmina.query.one().id}
+
+def test_save_measurement_converts_downloader_dtos(app):
+    gmina = GminaData(gminaName="Łódź", powiatName="Łódź", wojewodztwoName="łódzkie")
+    station = StationData(id=1, stationCode="S1", stationName="Station1", gegrLat="51.7", gegrLon="19.4",
+                          city=CityData(id=1, name="Łódź", gmina=gmina))
+    sensor = SensorData(id_stanowiska=11, id_stacji=1, wskaznik="pył zawieszony PM10", wskaznik_wzor="PM10",
+                        wskaznik_kod="PM10", id_wskaznika=3)
+    measurements = [MeasurementData(kod_stanowiska="K11", data=datetime(2025, 8, 27, 12), wartosc=1.0)]
+    index = StationIndexData(station_id=1, calculation_date=datetime(2025, 8, 27, 12), index_value=1,
+                             index_category="Dobry", calculation_date_st="2025-08-27 12:00:00")
+
+    assert DataService().save_measurement(station, sensor, measurements, 11, index, 1) == 1
+    assert Sensor.query.one().id_stacji == 1
+    assert StationIndex.query.one().index_category == "Dobry"
+    assert Station.query.one().city.gmina.powiatName == "Łódź"
@@ -1,11 +1,13 @@
 import pytest
 from unittest.mock import patch, Mock
-from app.services.downloader import Downloader
-from app.models.station_index import StationIndex
-from app.models.measurement import Measurement
-from app.models.sensor import Sensor
-from app.models.station import Station
+from app.services.downloader import Downloader, configure_paging
+from app.models.dto import StationData, SensorData, MeasurementData, StationIndexData
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
 import requests
+from app.services.http_client import configure_session
+from datetime import datetime
 
 BASE_URL = "http://fakeapi.com"
 
@@ -37,14 +39,14 @@ def test_fetch_station_index_success(downloader):
         }
     }
 
-    with patch("requests.get", return_value=mock_requests_get(fake_response)):
+    with patch("requests.Session.get", return_value=mock_requests_get(fake_response)):
         aqi = downloader.fetch_station_index(station_id)
-        assert isinstance(aqi, StationIndex)
+        assert isinstance(aqi, StationIndexData)
         assert aqi.station_id == 123
         assert aqi.index_value == 50
 
 def test_fetch_station_index_failure(downloader):
-    with patch("requests.get") as mock_get:
+    with patch("requests.Session.get") as mock_get:
         mock_get.side_effect = requests.exceptions.RequestException("Connection error")
         result = downloader.fetch_station_index("123")
         assert result == {}
@@ -61,14 +63,14 @@ def test_fetch_measurement_success(downloader):
         ]
     }
 
-    with patch("requests.get", return_value=mock_requests_get(fake_response)):
+    with patch("requests.Session.get", return_value=mock_requests_get(fake_response)):
         measurements = downloader.fetch_measurement(station_id)
         assert len(measurements) == 2
-        assert all(isinstance(m, Measurement) for m in measurements)
+        assert all(isinstance(m, MeasurementData) for m in measurements)
         assert measurements[0].wartosc == 10
 
 def test_fetch_measurement_failure(downloader):
-    with patch("requests.get") as mock_get:
+    with patch("requests.Session.get") as mock_get:
         mock_get.side_effect = requests.exceptions.RequestException("Connection error")
         result = downloader.fetch_measurement("123")
         assert result == {}
@@ -91,14 +93,14 @@ def test_fetch_station_sensors_list_success(downloader):
         ]
     }
 
-    with patch("requests.get", return_value=mock_requests_get(fake_response)):
+    with patch("requests.Session.get", return_value=mock_requests_get(fake_response)):
         sensors = downloader.fetch_station_sensors_list(station_id)
         assert len(sensors) == 1
-        assert isinstance(sensors[0], Sensor)
+        assert isinstance(sensors[0], SensorData)
         assert sensors[0].wskaznik == "PM10"
 
 def test_fetch_station_sensors_list_failure(downloader):
-    with patch("requests.get") as mock_get:
+    with patch("requests.Session.get") as mock_get:
         mock_get.side_effect = requests.exceptions.RequestException("Connection error")
         result = downloader.fetch_station_sensors_list("1")
         assert result == {}
@@ -121,13 +123,13 @@ def test_fetch_station_sensors_dict_success(downloader):
         ]
     }
 
-    with patch("requests.get", return_value=mock_requests_get(fake_response)):
+    with patch("requests.Session.get", return_value=mock_requests_get(fake_response)):
         sensors_dict = downloader.fetch_station_sensors_dict(station_id)
         assert 1 in sensors_dict
-        assert isinstance(sensors_dict[1], Sensor)
+        assert isinstance(sensors_dict[1], SensorData)
 
 def test_fetch_station_sensors_dict_failure(downloader):
-    with patch("requests.get") as mock_get:
+    with patch("requests.Session.get") as mock_get:
         mock_get.side_effect = requests.exceptions.RequestException("Connection error")
         result = downloader.fetch_station_sensors_dict("1")
         assert result == {}
@@ -154,14 +156,29 @@ def test_fetch_stations_list_success(downloader):
         ]
     }
 
-    with patch("requests.get", return_value=mock_requests_get(fake_response)):
+    with patch("requests.Session.get", return_value=mock_requests_get(fake_response)):
         stations = downloader.fetch_stations_list()
         assert len(stations) == 1
-        assert isinstance(stations[0], Station)
+        assert isinstance(stations[0], StationData)
         assert stations[0].stationName == "Station1"
 
+def test_fetch_stations_list_shares_city_and_gmina(downloader):
+    def row(station_id, city_id):
+        return {
+            "Identyfikator stacji": station_id, "Kod stacji": f"S{station_id}", "Nazwa stacji": f"Station{station_id}",
+            "WGS84 φ N": 50.0, "WGS84 λ E": 20.0, "Identyfikator miasta": city_id, "Nazwa miasta": f"City{city_id}",
+            "Gmina": "Gmina1", "Powiat": "Powiat1", "Województwo": "Woj1", "Ulica": None
+        }
+    fake_response = {"Lista stacji pomiarowych": [row(1, 1), row(2, 1), row(3, 2)]}
+
+    with patch("requests.Session.get", return_value=mock_requests_get(fake_response)):
+        stations = downloader.fetch_stations_list()
+        assert stations[0].city is stations[1].city
+        assert stations[0].city is not stations[2].city
+        assert stations[0].city.gmina is stations[2].city.gmina
+
 def test_fetch_stations_list_failure(downloader):
-    with patch("requests.get") as mock_get:
+    with patch("requests.Session.get") as mock_get:
         mock_get.side_effect = requests.exceptions.RequestException("Connection error")
         result = downloader.fetch_stations_list()
         assert result == {}
@@ -201,13 +218,13 @@ def test_fetch_stations_list_by_city(downloader):
         ]
     }
 
-    with patch("requests.get", return_value=mock_requests_get(fake_response)):
+    with patch("requests.Session.get", return_value=mock_requests_get(fake_response)):
         stations = downloader.fetch_stations_list_by_city("City1")
         assert len(stations) == 1
         assert stations[0].city.name == "City1"
 
 def test_fetch_stations_list_by_city_failure(downloader):
-    with patch("requests.get") as mock_get:
+    with patch("requests.Session.get") as mock_get:
         mock_get.side_effect = requests.exceptions.RequestException("Connection error")
         result = downloader.fetch_stations_list_by_city("City1")
         assert result == {}
@@ -234,13 +251,154 @@ def test_fetch_stations_dict_success(downloader):
         ]
     }
 
-    with patch("requests.get", return_value=mock_requests_get(fake_response)):
+    with patch("requests.Session.get", return_value=mock_requests_get(fake_response)):
         stations_dict = downloader.fetch_stations_dict()
         assert 1 in stations_dict
-        assert isinstance(stations_dict[1], Station)
+        assert isinstance(stations_dict[1], StationData)
 
 def test_fetch_stations_dict_failure(downloader):
-    with patch("requests.get") as mock_get:
+    with patch("requests.Session.get") as mock_get:
         mock_get.side_effect = requests.exceptions.RequestException("Connection error")
         result = downloader.fetch_stations_dict()
         assert result == {}
+
+# -----------------------------
+# Tests for shared HTTP session
+# -----------------------------
+def test_downloaders_share_pooled_session():
+    first = Downloader(BASE_URL)
+    second = Downloader(BASE_URL)
+    assert first.session is second.session
+    adapter = first.session.get_adapter("https://api.gios.gov.pl")
+    assert adapter._pool_maxsize >= 1
+
+def test_request_uses_timeout(downloader):
+    fake_response = {"Lista danych pomiarowych": []}
+    with patch("requests.Session.get", return_value=mock_requests_get(fake_response)) as mock_get:
+        downloader.fetch_measurement("123")
+        assert mock_get.call_args.kwargs["timeout"] == downloader.timeout
+
+# -----------------------------
+# Tests for fetch_station_catalog
+# -----------------------------
+def test_fetch_station_catalog_indexes(downloader):
+    fake_response = {
+        "Lista stacji pomiarowych": [
+            {
+                "Identyfikator stacji": 1,
+                "Kod stacji": "LdLodzCzerni",
+                "Nazwa stacji": "Łódź, ul. Czernika",
+                "WGS84 φ N": "51.75",
+                "WGS84 λ E": "19.53",
+                "Identyfikator miasta": 10,
+                "Nazwa miasta": "Łódź",
+                "Gmina": "Łódź",
+                "Powiat": "Łódź",
+                "Województwo": "ŁÓDZKIE",
+                "Ulica": "ul. Czernika"
+            }
+        ]
+    }
+
+    with patch("requests.Session.get", return_value=mock_requests_get(fake_response)):
+        catalog = downloader.fetch_station_catalog()
+        assert len(catalog) == 1
+        assert catalog.get(1).stationCode == "LdLodzCzerni"
+        assert catalog.get_by_code("LdLodzCzerni").id == 1
+        assert [s.id for s in catalog.find_by_city("  lodz ")] == [1]
+        assert [s.id for s in catalog.find_by_wojewodztwo("łódzkie")] == [1]
+        assert catalog.find_by_city("Kraków") == []
+
+def test_fetch_station_catalog_failure(downloader):
+    with patch("requests.Session.get") as mock_get:
+        mock_get.side_effect = requests.exceptions.RequestException("Connection error")
+        catalog = downloader.fetch_station_catalog()
+        assert len(catalog) == 0
+
+def test_fetch_measurement_parses_dates(downloader):
+    fake_response = {
+        "Lista danych pomiarowych": [
+            {"Kod stanowiska": 1, "Data": "2025-08-27 13:00:00", "Wartość": 10},
+        ]
+    }
+
+    with patch("requests.Session.get", return_value=mock_requests_get(fake_response)):
+        measurements = downloader.fetch_measurement("123")
+        assert measurements[0].data == datetime(2025, 8, 27, 13)
+
+# -----------------------------
+# Tests for paging
+# -----------------------------
+def paged_measurements(total_pages, delay=0):
+    def get(url, **kwargs):
+        time.sleep(delay)
+        page = int(parse_qs(urlsplit(url).query)["page"][0])
+        return mock_requests_get({
+            "Lista danych pomiarowych": [
+                {"Kod stanowiska": "K1", "Data": f"2025-08-{27 - page:02d} 12:00:00", "Wartość": float(page)}
+            ],
+            "totalPages": total_pages
+        })
+    return get
+
+def test_fetch_measurement_reads_all_pages_in_order(downloader):
+    with patch("requests.Session.get", side_effect=paged_measurements(4)) as mock_get:
+        measurements = downloader.fetch_measurement("123")
+
+    assert [m.wartosc for m in measurements] == [0.0, 1.0, 2.0, 3.0]
+    assert mock_get.call_count == 4
+    assert all("size=500" in call.args[0] for call in mock_get.call_args_list)
+
+def test_remaining_pages_are_fetched_concurrently():
+    downloader = Downloader(BASE_URL)
+    configure_paging(max_workers=8)
+    try:
+        with patch("requests.Session.get", side_effect=paged_measurements(6, delay=0.2)):
+            start = time.perf_counter()
+            measurements = downloader.fetch_measurement("123")
+            elapsed = time.perf_counter() - start
+    finally:
+        configure_paging()
+
+    assert len(measurements) == 6
+    assert elapsed < 0.2 * 6 * 0.6  # pierwsza strona + reszta równolegle, zamiast 6 zapytań po kolei
+
+def test_every_page_request_is_metered():
+    acquire = Mock()
+    downloader = Downloader(BASE_URL, acquire=acquire)
+    with patch("requests.Session.get", side_effect=paged_measurements(5)) as mock_get:
+        downloader.fetch_measurement("123")
+
+    assert acquire.call_count == mock_get.call_count == 5
+
+def test_page_requests_share_process_wide_limit():
+    active, peak = 0, 0
+    lock = threading.Lock()
+    get_page = paged_measurements(9)
+
+    def get(url, **kwargs):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+        return get_page(url)
+
+    configure_session(pool_size=2)
+    configure_paging(max_workers=8)
+    try:
+        with patch("requests.Session.get", side_effect=get):
+            threads = [threading.Thread(target=Downloader(BASE_URL).fetch_measurement, args=("1",))
+                       for _ in range(3)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+    finally:
+        configure_paging()
+        configure_session()
+
+    assert peak <= 2
+
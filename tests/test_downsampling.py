@@ -0,0 +1,23 @@
+import numpy as np
+from app.services.downsampling import lttb_indices
+
+# -----------------------------
+# Testy LTTB
+# -----------------------------
+def test_lttb_keeps_endpoints_and_budget():
+    x = np.arange(10_000, dtype=np.float64)
+    y = np.sin(x / 100)
+    indices = lttb_indices(x, y, 500)
+
+    assert len(indices) == 500
+    assert indices[0] == 0 and indices[-1] == 9_999
+    assert np.all(np.diff(indices) > 0)
+
+def test_lttb_keeps_peaks():
+    y = np.full(5_000, 10.0)
+    y[1234] = 300.0  # krótki epizod smogowy
+    indices = lttb_indices(np.arange(5_000), y, 100)
+    assert 1234 in indices
+
+def test_lttb_returns_all_points_within_budget():
+    assert list(lttb_indices([0, 1, 2], [1, 2, 3], 10)) == [0, 1, 2]
@@ -0,0 +1,80 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+import pytest
+from app import db
+from app.models import City, Gmina, Sensor, Station
+from app.services.data_service import DataService
+from app.services.export_service import EXPORT_COLUMNS, ExportService
+
+
+@pytest.fixture
+def archive(app):
+    gmina = Gmina(id=1, gminaName="Łódź", powiatName="Łódź", wojewodztwoName="ŁÓDZKIE")
+    city = City(id=10, name="Łódź", gmina=gmina)
+    db.session.add(Station(id=1, stationCode="LdLodzCzerni", stationName="Łódź, ul. Czernika",
+                           gegrLat="51.75", gegrLon="19.53", city=city))
+    for sensor_id in (11, 12):
+        db.session.add(Sensor(id_stanowiska=sensor_id, id_stacji=1, wskaznik="PM10", wskaznik_kod="PM10",
+                              id_wskaznika=3))
+    db.session.commit()
+
+    start = datetime(2025, 8, 1)
+    DataService()._insert_measurements([
+        {"sensor_id": sensor_id, "kod_stanowiska": f"K{sensor_id}", "data": start + timedelta(hours=h),
+         "wartosc": float(h)}
+        for sensor_id in (11, 12) for h in range(25)
+    ] + [{"sensor_id": 99, "kod_stanowiska": "K99", "data": start, "wartosc": None}])
+    return app
+
+# -----------------------------
+# Testy eksportu
+# -----------------------------
+def test_csv_export_is_streamed_in_chunks(archive):
+    chunks = list(ExportService(chunk_size=10).export("csv", sensor_id=11))
+
+    assert len(chunks) > 3
+    rows = list(csv.reader(io.StringIO("".join(chunks))))
+    assert tuple(rows[0]) == EXPORT_COLUMNS
+    assert len(rows) == 26
+    assert rows[1] == ["11", "1", "PM10", "K11", "2025-08-01T00:00:00", "0.0"]
+
+def test_ndjson_export_filters_by_region_and_range(archive):
+    output = "".join(ExportService().export(
+        "ndjson", wojewodztwo="łódzkie", start=datetime(2025, 8, 1, 23), end=datetime(2025, 8, 2, 1)
+    ))
+    rows = [json.loads(line) for line in output.splitlines()]
+
+    assert [(r["sensor_id"], r["data"]) for r in rows] == [
+        (11, "2025-08-01T23:00:00"), (11, "2025-08-02T00:00:00"),
+        (12, "2025-08-01T23:00:00"), (12, "2025-08-02T00:00:00"),
+    ]
+
+def test_parquet_export(archive):
+    pq = pytest.importorskip("pyarrow.parquet")
+    data = b"".join(ExportService(chunk_size=20).export("parquet", station_id=1))
+
+    table = pq.read_table(io.BytesIO(data))
+    assert table.num_rows == 50
+    assert table.column_names == list(EXPORT_COLUMNS)
+
+def test_export_endpoint_and_cli(archive, tmp_path):
+    response = archive.test_client().get("/api/v1/export?format=ndjson&sensor_id=99")
+    assert response.mimetype == "application/x-ndjson"
+    assert json.loads(response.data)["wartosc"] is None
+
+    output = tmp_path / "export.csv"
+    result = archive.test_cli_runner().invoke(args=["export", "--station", "1", "-o", str(output)])
+    assert result.exit_code == 0, result.output
+    assert len(output.read_text(encoding="utf-8").splitlines()) == 51
+
+def test_parquet_export_cli(archive, tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    output = tmp_path / "export.parquet"
+
+    result = archive.test_cli_runner().invoke(args=["export", "--format", "parquet", "--station", "1",
+                                                    "-o", str(output)])
+    assert result.exit_code == 0, result.output
+    assert pq.read_table(str(output)).num_rows == 50
+
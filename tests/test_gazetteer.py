@@ -0,0 +1,72 @@
+from unittest.mock import Mock
+import pytest
+import requests
+from app import db
+from app.models import City, Gmina, Station
+from app.services.gazetteer import Gazetteer, GazetteerGeocoder, Place, invalidate_gazetteer
+from app.services.geocoding import FallbackGeocoder, StaticGeocoder
+
+
+def make_station(station_id, name, city, lat, lon):
+    return Station(id=station_id, stationCode=f"S{station_id}", stationName=name,
+                   gegrLat=lat, gegrLon=lon, city=city)
+
+
+@pytest.fixture
+def stations():
+    lodz = City(id=10, name="Łódź", gmina=Gmina(id=1, gminaName="Łódź", powiatName="Łódź",
+                                                  wojewodztwoName="ŁÓDZKIE"))
+    krakow = City(id=20, name="Kraków", gmina=Gmina(id=2, gminaName="Kraków", powiatName="Kraków",
+                                                      wojewodztwoName="MAŁOPOLSKIE"))
+    return [
+        make_station(1, "Łódź, ul. Czernika", lodz, "51.70", "19.50"),
+        make_station(2, "Łódź, al. Rudzka", lodz, "51.80", "19.40"),
+        make_station(3, "Kraków, al. Krasińskiego", krakow, "50.06", "19.93"),
+    ]
+
+
+@pytest.fixture
+def archive(app, stations):
+    db.session.add_all(stations)
+    db.session.commit()
+    invalidate_gazetteer()
+    yield app
+    invalidate_gazetteer()
+
+# -----------------------------
+# Testy dla Gazetteer
+# -----------------------------
+def test_complete_folds_diacritics_and_ranks_cities_first(stations):
+    gazetteer = Gazetteer.from_stations(stations)
+
+    places = gazetteer.complete("LOD")
+    assert [(p.kind, p.name) for p in places][:3] == [("city", "Łódź"), ("gmina", "Łódź"), ("powiat", "Łódź")]
+    assert places[0].station_count == 2
+    assert places[0].coords == pytest.approx((51.75, 19.45))
+    assert {p.name for p in places if p.kind == "station"} == {"Łódź, ul. Czernika", "Łódź, al. Rudzka"}
+
+def test_complete_matches_inner_words(stations):
+    gazetteer = Gazetteer.from_stations(stations)
+    assert [p.name for p in gazetteer.complete("krasin")] == ["Kraków, al. Krasińskiego"]
+    assert gazetteer.complete("xyz") == []
+
+def test_exact_match_comes_first():
+    gazetteer = Gazetteer([Place("Rudna Wielka", "city", 1, 1, 10), Place("Ruda", "city", 2, 2, 1)])
+    assert gazetteer.lookup("ruda").name == "Ruda"
+
+# -----------------------------
+# Testy geokodowania bez sieci i podpowiedzi
+# -----------------------------
+def test_gazetteer_geocoder_as_fallback(archive):
+    failing = Mock()
+    failing.geocode.side_effect = requests.exceptions.ConnectionError("offline")
+
+    geocoder = FallbackGeocoder(failing, GazetteerGeocoder())
+    assert geocoder.geocode("Kraków, ul. Floriańska 1") == pytest.approx((50.06, 19.93))
+    assert FallbackGeocoder(StaticGeocoder({}), GazetteerGeocoder()).geocode("Atlantyda") is None
+
+def test_autocomplete_endpoint(archive):
+    response = archive.test_client().get("/api/v1/places/autocomplete?q=krak&kind=city")
+    assert response.get_json()["data"] == [{"name": "Kraków", "kind": "city", "lat": 50.06, "lon": 19.93}]
+
+    assert archive.test_client().get("/api/v1/places/autocomplete?q=krak&kind=wies").status_code == 400
@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta
+from unittest.mock import patch, Mock
+import pytest
+import requests
+from app import db
+from app.models import GeocodeCacheEntry
+from app.services.geocoding import CachedGeocoder, Geocoder, NominatimGeocoder, StaticGeocoder
+from app.models.gmina import Gmina
+from app.services.maps_service import StationMapWithRadius
+
+
+@pytest.fixture
+def static_geocoder():
+    return StaticGeocoder({"Łódź": (51.7592, 19.4560)})
+
+# -----------------------------
+# Testy dla NominatimGeocoder
+# -----------------------------
+@patch("requests.get")
+def test_nominatim_uses_timeout(mock_get):
+    mock_get.return_value = Mock(status_code=200)
+    mock_get.return_value.json.return_value = [{"lat": "52.1", "lon": "19.1"}]
+
+    assert NominatimGeocoder(timeout=2).geocode("Warsaw") == (52.1, 19.1)
+    assert mock_get.call_args.kwargs["timeout"] == 2
+
+# -----------------------------
+# Testy dla CachedGeocoder
+# -----------------------------
+def test_cached_geocoder_normalizes_and_persists(app, static_geocoder):
+    geocoder = CachedGeocoder(static_geocoder)
+
+    assert geocoder.geocode("Łódź") == (51.7592, 19.4560)
+    assert geocoder.geocode("  LODZ ") == (51.7592, 19.4560)
+    assert static_geocoder.calls == 1
+
+    # nowy proces (pusty cache w pamięci) korzysta z wpisu w bazie
+    assert CachedGeocoder(static_geocoder).geocode("lodz") == (51.7592, 19.4560)
+    assert static_geocoder.calls == 1
+    assert db.session.get(GeocodeCacheEntry, "lodz").coords == (51.7592, 19.4560)
+
+def test_cached_geocoder_negative_caching_and_expiry(app, static_geocoder):
+    geocoder = CachedGeocoder(static_geocoder, negative_ttl=3600)
+
+    assert geocoder.geocode("Atlantyda") is None
+    assert geocoder.geocode("atlantyda") is None
+    assert static_geocoder.calls == 1
+
+    # przeterminowany wynik negatywny -> ponowne zapytanie
+    db.session.get(GeocodeCacheEntry, "atlantyda").created_at = datetime.now() - timedelta(hours=2)
+    db.session.commit()
+    assert CachedGeocoder(static_geocoder, negative_ttl=3600).geocode("Atlantyda") is None
+    assert static_geocoder.calls == 2
+
+def test_cached_geocoder_overwrites_entry_stored_concurrently(app, static_geocoder):
+    # wpis zapisany przez inny proces po odczycie z bazy (brak błędu klucza głównego)
+    with patch.object(db.session, "get", return_value=None):
+        db.session.add(GeocodeCacheEntry(address="lodz", lat=None, lon=None, created_at=datetime.now()))
+        db.session.commit()
+        assert CachedGeocoder(static_geocoder).geocode("Łódź") == (51.7592, 19.4560)
+
+    db.session.expire_all()
+    assert db.session.get(GeocodeCacheEntry, "lodz").coords == (51.7592, 19.4560)
+
+def test_cached_geocoder_leaves_session_state_alone(app, static_geocoder):
+    gmina = Gmina(gminaName="Łódź", powiatName="Łódź", wojewodztwoName="łódzkie")
+    db.session.add(gmina)
+
+    CachedGeocoder(static_geocoder).geocode("Łódź")
+    db.session.rollback()
+
+    assert Gmina.query.count() == 0
+    assert GeocodeCacheEntry.query.count() == 1
+
+def test_geocoder_is_abstract():
+    with pytest.raises(TypeError):
+        Geocoder()
+
+def test_cached_geocoder_does_not_cache_errors(app):
+    failing = Mock()
+    failing.geocode.side_effect = requests.exceptions.ConnectTimeout("timeout")
+
+    with pytest.raises(requests.exceptions.RequestException):
+        CachedGeocoder(failing).geocode("Łódź")
+    assert GeocodeCacheEntry.query.count() == 0
+
+def test_station_map_with_radius_handles_geocoder_errors():
+    failing = Mock()
+    failing.geocode.side_effect = requests.exceptions.ConnectTimeout("timeout")
+
+    smwr = StationMapWithRadius([], location="Łódź", radius=10, geocoder=failing)
+    assert smwr.sort_list_by_location_and_radius() == []
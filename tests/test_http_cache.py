@@ -0,0 +1,139 @@
+import json
+import os
+import threading
+from unittest.mock import Mock, patch
+from urllib.parse import parse_qs, urlsplit
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import pytest
+from app.services.downloader import Downloader
+from app.services.http_cache import HttpCache
+from app.services.http_client import create_session
+
+MEASUREMENTS = {"Lista danych pomiarowych": [
+    {"Kod stanowiska": "K11", "Data": "2025-08-27 12:00:00", "Wartość": 10.5}
+]}
+
+
+class EtagHandler(BaseHTTPRequestHandler):
+    """Zwraca MEASUREMENTS z nagłówkiem ETag; przy zgodnym If-None-Match odpowiada 304."""
+    requests = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.requests.append((self.path, self.headers.get("If-None-Match")))
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = json.dumps(MEASUREMENTS).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", '"v1"')
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def etag_api():
+    handler = type("Handler", (EtagHandler,), {"requests": []})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", handler.requests
+    server.shutdown()
+    server.server_close()
+
+# -----------------------------
+# Testy dla HttpCache
+# -----------------------------
+def test_fresh_response_is_served_from_disk(tmp_path, etag_api):
+    url, requests_log = etag_api
+    cache = HttpCache(str(tmp_path), max_age={"data/getData": 3600})
+
+    for _ in range(3):
+        measurements = Downloader(url, session=create_session(), cache=cache).fetch_measurement("11")
+        assert measurements[0].wartosc == 10.5
+    assert len(requests_log) == 1
+
+def test_stale_response_is_revalidated_with_etag(tmp_path, etag_api):
+    url, requests_log = etag_api
+    cache = HttpCache(str(tmp_path), max_age={})
+
+    first = Downloader(url, session=create_session(), cache=cache).fetch_measurement("11")
+    second = Downloader(url, session=create_session(), cache=cache).fetch_measurement("11")
+
+    assert first == second
+    path = "/data/getData/11?page=0&size=500"
+    assert requests_log == [(path, None), (path, '"v1"')]
+
+def test_cache_is_shared_between_instances(tmp_path):
+    HttpCache(str(tmp_path)).set("http://api/data/getData/1", b"[1]", etag='"a"')
+    entry = HttpCache(str(tmp_path)).get("http://api/data/getData/1")
+
+    assert entry.json() == [1]
+    assert entry.validators() == {"If-None-Match": '"a"'}
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+def test_eviction_keeps_size_bounded(tmp_path):
+    cache = HttpCache(str(tmp_path), max_bytes=3000)
+    for i in range(10):
+        cache.set(f"http://api/data/getData/{i}", b"x" * 1000)
+        os.utime(cache._path(f"http://api/data/getData/{i}"), (i, i))
+
+    assert cache.size() <= 3000
+    assert cache.get("http://api/data/getData/9") is not None
+    assert cache.get("http://api/data/getData/0") is None
+
+def test_set_does_not_rescan_directory_below_limit(tmp_path):
+    cache = HttpCache(str(tmp_path), max_bytes=10_000)
+    with patch("os.scandir", wraps=os.scandir) as scandir:
+        for i in range(5):
+            cache.set(f"http://api/data/getData/{i}", b"x" * 1000)
+
+    assert scandir.call_count == 1  # jedno przeliczenie przy pierwszym zapisie
+    assert cache._size == cache.size()
+
+def test_max_age_per_endpoint_family(tmp_path):
+    cache = HttpCache(str(tmp_path), max_age={"station/": 10, "station/findAll": 600})
+    assert cache.max_age_for("http://api/station/findAll") == 600
+    assert cache.max_age_for("http://api/station/sensors/1") == 10
+    assert cache.max_age_for("http://api/data/getData/1") == 0
+
+def paged_api(version):
+    def get(url, **kwargs):
+        page = int(parse_qs(urlsplit(url).query)["page"][0])
+        response = Mock(status_code=200, headers={})
+        payload = {"Lista danych pomiarowych": [
+            {"Kod stanowiska": "K1", "Data": f"2025-08-27 {12 - page:02d}:00:00", "Wartość": version}
+        ], "totalPages": 3}
+        response.json.return_value = payload
+        response.content = json.dumps(payload).encode("utf-8")
+        return response
+    return get
+
+def test_all_pages_come_from_one_snapshot(tmp_path):
+    cache = HttpCache(str(tmp_path), max_age={"data/getData": 3600})
+    with patch("requests.Session.get", side_effect=paged_api(1.0)):
+        Downloader("http://api", cache=cache).fetch_measurement("1")
+
+    # pierwsza strona się zestarzała, dalsze są jeszcze świeże
+    os.utime(cache._path("http://api/data/getData/1?page=0&size=500"), (0, 0))
+    with patch("requests.Session.get", side_effect=paged_api(2.0)) as mock_get:
+        measurements = Downloader("http://api", cache=cache).fetch_measurement("1")
+
+    assert mock_get.call_count == 3
+    assert [m.wartosc for m in measurements] == [2.0, 2.0, 2.0]
+
+def test_fresh_pages_are_all_served_from_cache(tmp_path):
+    cache = HttpCache(str(tmp_path), max_age={"data/getData": 3600})
+    with patch("requests.Session.get", side_effect=paged_api(1.0)):
+        Downloader("http://api", cache=cache).fetch_measurement("1")
+
+    with patch("requests.Session.get", side_effect=paged_api(2.0)) as mock_get:
+        measurements = Downloader("http://api", cache=cache).fetch_measurement("1")
+
+    assert mock_get.call_count == 0
+    assert [m.wartosc for m in measurements] == [1.0, 1.0, 1.0]
+
@@ -1,5 +1,6 @@
 import pytest
 from unittest.mock import patch, Mock
+from app.services import maps_service
 from app.services.maps_service import StationMap, StationMapWithRadius
 from app.models.station import Station
 from app.models.city import City
@@ -103,3 +104,23 @@ def test_create_map(monkeypatch, stations_list):
     assert isinstance(m, folium.Map)
     markers = [child for child in m._children.values() if isinstance(child, folium.map.Marker)]
     assert len(markers) == len(stations_list)
+
+# -----------------------------
+# Testy cache HTML map
+# -----------------------------
+def test_render_html_is_cached(stations_list):
+    maps_service._map_html_cache.clear()
+    with patch.object(StationMap, "create_default_map", autospec=True,
+                      side_effect=StationMap.create_default_map) as create:
+        first = StationMap(stations_list).render_html()
+        second = StationMap(list(stations_list)).render_html()
+
+    assert first == second
+    assert create.call_count == 1
+
+def test_render_html_key_depends_on_stations_and_parameters(stations_list, sample_station):
+    key = StationMap(stations_list).cache_key()
+    assert StationMap(stations_list, zoom_start=8).cache_key() != key
+
+    sample_station.stationName = "Station2"
+    assert StationMap(stations_list).cache_key() != key
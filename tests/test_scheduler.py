@@ -0,0 +1,127 @@
+import threading
+from datetime import datetime
+import pytest
+from sqlalchemy.exc import OperationalError
+from app.models import Measurement, MeasurementRollup, Sensor, SensorStatistics, Station, StationIndex
+from app.services.http_client import create_session
+from app.services.rate_limiter import TokenBucket
+from app.services.scheduler import PollingScheduler
+from tests.conftest import FAKE_API_RESPONSES
+
+
+def make_scheduler(base_url, **kwargs):
+    return PollingScheduler(base_url, rate_limiter=TokenBucket(rate=1000, capacity=100),
+                            session=create_session(), **kwargs)
+
+# -----------------------------
+# Testy dla PollingScheduler
+# -----------------------------
+def test_poll_tracks_station_sensors_and_writes_only_new_data(app, fake_api, monkeypatch):
+    scheduler = make_scheduler(fake_api, station_ids=[1])
+
+    summary = scheduler.poll_once()
+    assert scheduler.targets == {11: 1}
+    assert (summary.sensors, summary.updated_sensors, summary.measurements) == (1, 1, 2)
+    assert Station.query.count() == 1 and Sensor.query.count() == 1
+    assert StationIndex.query.count() == 1
+
+    # brak nowych danych - nic nie jest zapisywane
+    summary = scheduler.poll_once()
+    assert (summary.updated_sensors, summary.measurements, summary.station_indexes) == (0, 0, 0)
+
+    # nowy pomiar (i starszy, już zapisany) - zapisywany jest tylko nowszy od znacznika
+    data = {"Lista danych pomiarowych": [
+        {"Kod stanowiska": "K11", "Data": "2025-08-27 13:00:00", "Wartość": 9.0},
+        *FAKE_API_RESPONSES["/data/getData/11"]["Lista danych pomiarowych"],
+    ]}
+    monkeypatch.setitem(FAKE_API_RESPONSES, "/data/getData/11", data)
+    summary = scheduler.poll_once()
+    assert (summary.updated_sensors, summary.measurements) == (1, 1)
+    assert Measurement.query.count() == 3
+
+def test_poll_fills_values_published_after_null(app, fake_api, monkeypatch):
+    def publish(*items):
+        monkeypatch.setitem(FAKE_API_RESPONSES, "/data/getData/11", {"Lista danych pomiarowych": [
+            {"Kod stanowiska": "K11", "Data": data, "Wartość": wartosc} for data, wartosc in items
+        ]})
+
+    scheduler = make_scheduler(fake_api, station_ids=[1])
+    publish(("2025-08-27 11:00:00", None), ("2025-08-27 10:00:00", 5.0))
+    assert scheduler.poll_once().measurements == 2
+
+    # GIOŚ uzupełnia wartość później - musi trafić do archiwum, statystyk i agregatów
+    publish(("2025-08-27 12:00:00", None), ("2025-08-27 11:00:00", 7.0), ("2025-08-27 10:00:00", 5.0))
+    summary = scheduler.poll_once()
+    assert summary.measurements == 2
+
+    assert Measurement.query.filter_by(data=datetime(2025, 8, 27, 11)).one().wartosc == 7.0
+    stats = SensorStatistics.query.one()
+    assert (stats.count, stats.missing_count, stats.max) == (2, 1, 7.0)
+    assert stats.last_valid_data == datetime(2025, 8, 27, 11)
+    day = MeasurementRollup.query.filter_by(resolution="day").one()
+    assert (day.count, day.total) == (2, 12.0)
+
+    # wartości już zapisane nie są wysyłane ponownie
+    assert scheduler.poll_once().measurements == 0
+
+def test_poll_counts_upstream_errors(app, fake_api, monkeypatch):
+    scheduler = make_scheduler(fake_api, station_ids=[1])
+    scheduler.resolve_targets()
+    monkeypatch.delitem(FAKE_API_RESPONSES, "/data/getData/11")
+
+    summary = scheduler.poll_once()
+    assert (summary.errors, summary.measurements) == (1, 0)
+
+def test_run_survives_failed_cycle(app, fake_api, monkeypatch):
+    scheduler = make_scheduler(fake_api, station_ids=[1], interval=0.01)
+    scheduler.resolve_targets()
+    save_bulk = scheduler.data_service.save_bulk
+    calls = []
+
+    def flaky_save_bulk(*args):
+        calls.append(args)
+        if len(calls) == 1:
+            raise OperationalError("INSERT", {}, Exception("database is locked"))
+        return save_bulk(*args)
+
+    monkeypatch.setattr(scheduler.data_service, "save_bulk", flaky_save_bulk)
+    summaries = []
+    scheduler.run(cycles=2, on_cycle=summaries.append)
+
+    assert len(calls) == 2
+    assert [s.measurements for s in summaries] == [2]
+    assert Measurement.query.count() == 2
+
+def test_poll_skips_sensors_missing_from_database(app, fake_api):
+    scheduler = make_scheduler(fake_api, sensor_ids=[11])
+    assert scheduler.resolve_targets() == {}
+
+    make_scheduler(fake_api, station_ids=[1]).resolve_targets()
+    assert make_scheduler(fake_api, sensor_ids=[11]).resolve_targets() == {11: 1}
+
+def test_next_delay_jitter_bounds(app):
+    scheduler = PollingScheduler("http://localhost", interval=100, jitter=0.2)
+    delays = [scheduler.next_delay() for _ in range(200)]
+    assert all(80 <= d <= 120 for d in delays)
+    assert len(set(delays)) > 1
+    with pytest.raises(ValueError):
+        PollingScheduler("http://localhost", jitter=1.5)
+
+def test_run_stops_after_cycles_and_on_event(app, fake_api):
+    scheduler = make_scheduler(fake_api, station_ids=[1], interval=0.01)
+    summaries = []
+    scheduler.run(cycles=2, on_cycle=summaries.append)
+    assert len(summaries) == 2
+
+    scheduler.interval = 3600
+    stop = threading.Event()
+    scheduler.run(stop_event=stop, on_cycle=lambda summary: stop.set())
+
+def test_poll_command(app, fake_api):
+    app.config["GIOS_API_URL"] = fake_api
+    result = app.test_cli_runner().invoke(args=["poll", "--station", "1", "--once", "--rate", "1000"])
+    assert result.exit_code == 0, result.output
+    assert "nowe pomiary 2" in result.output
+
+    result = app.test_cli_runner().invoke(args=["poll", "--once"])
+    assert result.exit_code != 0
@@ -0,0 +1,53 @@
+import pytest
+from app.models.station import Station
+from app.services.spatial_index import SpatialIndex
+from app.services.maps_service import StationMapWithRadius
+
+
+def make_station(station_id, lat, lon):
+    return Station(id=station_id, stationCode=f"S{station_id}", stationName=f"Station{station_id}",
+                   gegrLat=lat, gegrLon=lon)
+
+
+@pytest.fixture
+def stations():
+    return [
+        make_station(1, "52.2297", "21.0122"),  # Warszawa
+        make_station(2, "51.7592", "19.4560"),  # Łódź
+        make_station(3, "50.0647", "19.9450"),  # Kraków
+        make_station(4, "52.4064", "16.9252"),  # Poznań
+        make_station(5, "", ""),                # brak współrzędnych
+    ]
+
+# -----------------------------
+# Testy dla SpatialIndex
+# -----------------------------
+def test_distances_match_scalar_haversine(stations):
+    index = SpatialIndex(stations)
+    scalar = StationMapWithRadius([], location=None, radius=None).haversine
+
+    assert len(index) == 4
+    expected = [scalar(float(s.gegrLat), float(s.gegrLon), 52.0, 19.0) for s in index.stations]
+    assert index.distances(52.0, 19.0) == pytest.approx(expected)
+
+def test_within_radius_is_sorted_by_distance(stations):
+    found = SpatialIndex(stations).within_radius(52.2297, 21.0122, 260)
+
+    assert [s.id for s, _ in found] == [1, 2, 3]
+    assert found[0][1] == pytest.approx(0)
+    assert found[1][1] == pytest.approx(119, abs=1)
+
+def test_nearest(stations):
+    index = SpatialIndex(stations)
+    assert [s.id for s, _ in index.nearest(51.76, 19.46, 2)] == [2, 1]
+    assert [s.id for s, _ in index.nearest(51.76, 19.46, 10)] == [2, 1, 4, 3]
+    assert index.nearest(51.76, 19.46, 0) == []
+
+def test_filter_stations_by_radius_sorts_by_distance(stations):
+    smwr = StationMapWithRadius(stations, location="Łódź", radius=190)
+    smwr.lat, smwr.lon = 51.7592, 19.4560
+
+    assert [s.id for s in smwr.filter_stations_by_radius()] == [2, 1, 4]
+
+def test_sort_list_without_location_returns_empty_list(stations):
+    assert StationMapWithRadius(stations, location="", radius=10).sort_list_by_location_and_radius() == []
@@ -0,0 +1,60 @@
+import time
+from app.models import Station, Sensor, Measurement, StationIndex
+from app.services.http_client import create_session
+from app.services.rate_limiter import TokenBucket
+from app.services.sync_service import SyncService
+from tests.conftest import FAKE_API_RESPONSES
+
+
+# -----------------------------
+# Testy dla TokenBucket
+# -----------------------------
+def test_token_bucket_burst_then_wait():
+    bucket = TokenBucket(rate=20, capacity=2)
+    assert bucket.try_acquire()
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+
+    start = time.perf_counter()
+    bucket.acquire()
+    assert time.perf_counter() - start >= 0.03
+
+# -----------------------------
+# Testy dla SyncService
+# -----------------------------
+def test_sync_saves_everything_once(app, fake_api):
+    service = SyncService(fake_api, rate_limiter=TokenBucket(rate=1000, capacity=100), session=create_session())
+    progress = []
+
+    summary = service.run(progress=progress.append)
+
+    assert summary.stations == 1
+    assert summary.measurements == 2
+    assert summary.errors == 0
+    assert len(progress) == 1
+    assert Station.query.count() == 1
+    assert Sensor.query.count() == 1
+    assert Measurement.query.filter_by(sensor_id=11).count() == 2
+    assert StationIndex.query.count() == 1
+
+    # ponowna synchronizacja nie duplikuje danych
+    summary = service.run()
+    assert summary.measurements == 0
+    assert Measurement.query.count() == 2
+    assert StationIndex.query.count() == 1
+
+def test_sync_counts_failed_station(app, fake_api, monkeypatch):
+    monkeypatch.setitem(FAKE_API_RESPONSES, "/data/getData/11", 500)
+    service = SyncService(fake_api, rate_limiter=TokenBucket(rate=1000, capacity=100), session=create_session())
+
+    summary = service.run()
+
+    assert summary.errors == 1
+    assert summary.stations == 0
+    assert Station.query.count() == 0
+
+def test_sync_command(app, fake_api):
+    app.config["GIOS_API_URL"] = fake_api
+    result = app.test_cli_runner().invoke(args=["sync", "--rate", "1000"])
+    assert result.exit_code == 0, result.output
+    assert "nowe pomiary 2" in result.output
@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta
+import numpy as np
+from app.models import Measurement
+from app.services.time_series import TimeSeries
+
+
+def make_rows(values, start=datetime(2025, 1, 1)):
+    return [(start + timedelta(hours=i), v) for i, v in enumerate(values)]
+
+# -----------------------------
+# Testy TimeSeries
+# -----------------------------
+def test_from_rows_builds_typed_columns():
+    series = TimeSeries.from_rows(make_rows([1.0, None, 3.0]))
+
+    assert series.timestamps.dtype == np.int64
+    assert series.values.dtype == np.float64
+    assert list(series.mask) == [True, False, True]
+    assert series.timestamps[1] - series.timestamps[0] == 3600
+    assert series.nbytes == 3 * 17
+
+def test_from_measurements_and_iteration():
+    start = datetime(2025, 8, 27, 12)
+    measurements = [Measurement(kod_stanowiska="K1", data=start, wartosc=2.5),
+                    Measurement(kod_stanowiska="K1", data=start + timedelta(hours=1), wartosc=None)]
+    points = list(TimeSeries.from_rows(measurements))
+
+    assert points[0].data == start and points[0].wartosc == 2.5
+    assert points[1].wartosc is None
+    assert len(TimeSeries.from_rows([])) == 0
+
+def test_to_chart_points_uses_gios_date_format():
+    points = TimeSeries.from_rows(make_rows([1.0, None])).to_chart_points()
+    assert points == [{"data": "2025-01-01 00:00:00", "wartosc": 1.0},
+                      {"data": "2025-01-01 01:00:00", "wartosc": None}]
+
+def test_downsample_skips_missing_values_and_keeps_order():
+    values = [float(v) if v % 7 else None for v in range(5_000)]
+    rows = make_rows(values)
+    rows.reverse()  # jak w API GIOŚ - najnowsze pierwsze
+
+    series = TimeSeries.from_rows(rows).downsample(200)
+    dates = [p.data for p in series]
+
+    assert len(series) == 200
+    assert all(p.wartosc is not None for p in series)
+    assert dates == sorted(dates, reverse=True)
+    assert dates[0] == rows[0][0] and dates[-1] == rows[-2][0]  # skrajne punkty z wartością
+    assert TimeSeries.from_rows(rows[:50]).downsample(200).nbytes == 50 * 17
+
+def test_downsample_keeps_peaks():
+    values = [10.0] * 5_000
+    values[1234] = 300.0  # krótki epizod smogowy
+    series = TimeSeries.from_rows(make_rows(values)).downsample(100)
+    assert 300.0 in series.values